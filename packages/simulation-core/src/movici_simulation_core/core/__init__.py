@@ -1,4 +1,4 @@
-from .arrays import TrackedArray, TrackedCSRArray, matrix_to_csr
+from .arrays import TrackedArray, TrackedCSRArray, matrix_to_csr, set_tracking_block_size
 from .attribute import (
     INIT,
     OPT,
@@ -70,6 +70,7 @@ __all__ = [
     "TimelineInfo",
     "get_timeline_info",
     "set_timeline_info",
+    "set_tracking_block_size",
     "get_global_schema",
     "attribute_plugin_from_dict",
     "attributes_from_dict",
@@ -13,26 +13,46 @@ from movici_simulation_core.csr import (
     rows_contain,
     rows_equal,
     rows_intersect,
+    select_kernel,
     slice_csr_array,
     update_csr_array,
+    update_csr_array_in_buffer,
+    update_csr_array_inplace,
 )
 from movici_simulation_core.utils.unicode import equal_str_dtypes
 
 
 class TrackedArray(np.ndarray):
+    """A numpy array that tracks which of its values have changed since the last ``reset``. By
+    default, the full array is copied the first time it is indexed after a reset, and ``changed``
+    compares the whole array to that copy. When ``block_size`` is set, the array is divided in
+    blocks of ``block_size`` entries (along the first axis) and only the previous values of the
+    blocks that are indexed are kept. ``changed`` and ``diff`` then only compare those blocks,
+    which saves memory and time for large arrays of which only a small part changes at a time
+
+    :param block_size: the number of entries per tracked block, or ``0`` to track the full array.
+        Defaults to ``TrackedArray.default_block_size`` (see ``set_tracking_block_size``)
+    """
+
+    default_block_size: t.ClassVar[int] = 0
     _curr: t.Optional[np.ndarray] = None
+    _blocks: t.Optional[t.Dict[int, np.ndarray]] = None
     _changed: t.Optional[np.ndarray] = None
     rtol: float
     atol: float
     equal_nan: bool
+    block_size: int
 
-    def __new__(cls, input_array, rtol=1e-05, atol=1e-08, equal_nan=False):
+    def __new__(cls, input_array, rtol=1e-05, atol=1e-08, equal_nan=False, block_size=None):
         arr: TrackedArray = np.asarray(input_array).view(cls)
         arr.rtol = rtol
         arr.atol = atol
         arr.equal_nan = equal_nan
-        if isinstance(input_array, TrackedArray):
+        if block_size is not None:
+            arr.block_size = block_size
+        if isinstance(input_array, TrackedArray) and arr.block_size == input_array.block_size:
             arr._curr = input_array._curr
+            arr._blocks = input_array._blocks
         return arr
 
     def __array_finalize__(self, obj):
@@ -44,45 +64,162 @@ class TrackedArray(np.ndarray):
             self.atol = getattr(obj, "atol", 1e-05)
             self.rtol = getattr(obj, "rtol", 1e-08)
             self.equal_nan = getattr(obj, "equal_nan", False)
+            self.block_size = getattr(obj, "block_size", TrackedArray.default_block_size)
         self.reset()
 
     def __getitem__(self, item) -> TrackedArray:
-        self._start_tracking()
+        if self._returns_view(item):
+            self._start_tracking(item)
         return super().__getitem__(item)
 
     def __setitem__(self, key, value):
-        self._start_tracking()
+        self._start_tracking(key)
         super().__setitem__(key, value)
 
-    def _start_tracking(self):
+    def _returns_view(self, key) -> bool:
+        """Whether indexing with ``key`` returns a view on the array's data, through which the
+        array may be modified without ``__setitem__``. Advanced indexing (with an array or list)
+        returns a copy and indexing a single element returns a scalar, so there is no need to
+        track changes for these reads
+        """
+        keys = key if isinstance(key, tuple) else (key,)
+        if any(isinstance(k, list) or (isinstance(k, np.ndarray) and k.ndim) for k in keys):
+            return False
+        return not (len(keys) == self.ndim and all(isinstance(k, (int, np.integer)) for k in keys))
+
+    def readonly(self) -> np.ndarray:
+        """Return a read-only view on the array's data as a regular ``np.ndarray``. Reading from
+        this view never starts change tracking
+        """
+        rv = self.view(np.ndarray)
+        rv.flags.writeable = False
+        return rv
+
+    def _start_tracking(self, key=Ellipsis):
         self._changed = None
-        if self._curr is None:
-            self._curr = np.array(self)
+        if not self.block_size:
+            if self._curr is None:
+                self._curr = np.array(self)
+            return
+        if self._blocks is None:
+            self._blocks = {}
+        raw = self.view(np.ndarray)
+        for block in self._get_blocks(key):
+            if block not in self._blocks:
+                self._blocks[block] = raw[self._block_slice(block)].copy()
+
+    def _get_blocks(self, key) -> t.Iterable[int]:
+        """Return the blocks that contain the entries (along the first axis) that ``key`` indexes.
+        When this cannot be determined from ``key``, all blocks are returned
+        """
+        length = len(self) if self.ndim else 0
+        if isinstance(key, tuple):
+            key = key[0] if key else Ellipsis
+        if isinstance(key, (int, np.integer)):
+            return (int(key) % length // self.block_size,) if length else ()
+        if isinstance(key, slice):
+            start, stop, step = key.indices(length)
+            if step == 1:
+                if start >= stop:
+                    return ()
+                return range(start // self.block_size, (stop - 1) // self.block_size + 1)
+            return np.unique(np.arange(start, stop, step) // self.block_size)
+        if isinstance(key, (list, np.ndarray)):
+            key = np.asarray(key)
+            if key.dtype == bool:
+                key = np.flatnonzero(key.reshape(key.shape[0], -1).any(axis=1)) if key.ndim else []
+            elif np.issubdtype(key.dtype, np.integer):
+                key = key.ravel() % length if length else []
+            else:
+                return range(self._block_count())
+            return np.unique(np.asarray(key, dtype=int) // self.block_size)
+        return range(self._block_count())
+
+    def _block_count(self):
+        return -(-len(self) // self.block_size) if self.ndim else 0
+
+    def _block_slice(self, block: int):
+        return slice(block * self.block_size, (block + 1) * self.block_size)
+
+    def _compare(self, curr: np.ndarray, prev: np.ndarray):
+        if np.issubdtype(self.dtype, np.floating):
+            return ~np.isclose(
+                curr, prev, rtol=self.rtol, atol=self.atol, equal_nan=self.equal_nan
+            )
+        return prev != curr
 
     @property
     def changed(self):
         if self._changed is not None:
             return self._changed
 
-        if self._curr is None:
-            rv = np.zeros_like(self.data, dtype=bool)
+        if self._blocks is not None:
+            rv = np.zeros(self.shape, dtype=bool)
+            raw = self.view(np.ndarray)
+            for block, prev in self._blocks.items():
+                slice_ = self._block_slice(block)
+                rv[slice_] = self._compare(raw[slice_], prev)
 
-        elif np.issubdtype(self.dtype, np.floating):
-            rv = ~np.isclose(
-                self, self._curr, rtol=self.rtol, atol=self.atol, equal_nan=self.equal_nan
-            )
+        elif self._curr is None:
+            rv = np.zeros_like(self.data, dtype=bool)
         else:
-            rv = self._curr != self
+            rv = self._compare(self, self._curr)
         self._changed = rv
         return rv
 
     def reset(self):
         self._curr = None
+        self._blocks = None
         self._changed = None
 
     def diff(self) -> t.Tuple[np.ndarray, np.ndarray]:
-        self._start_tracking()
-        return self._curr[self.changed], self[self.changed]
+        if not self.block_size:
+            self._start_tracking()
+            return self._curr[self.changed], self[self.changed]
+
+        changed = self.changed
+        prev = [
+            values[changed[self._block_slice(block)]]
+            for block, values in sorted((self._blocks or {}).items())
+        ]
+        return np.concatenate(prev or [np.empty(0, dtype=self.dtype)]), self[changed]
+
+    def copy_tracking(self, other: TrackedArray):
+        """Take over the tracked (previous) values of ``other`` for the first ``len(other)``
+        entries of this array, eg. after ``other`` has been copied into a larger array
+        """
+        if other._curr is not None:
+            self._set_previous(0, other._curr)
+            return
+        if other._blocks is None:
+            return
+
+        # the entries of ``other`` outside of its tracked blocks have not changed
+        length = len(other)
+        if not self.block_size:
+            self._set_previous(0, other.view(np.ndarray))
+        elif self._blocks is not None:
+            for block in self._get_blocks(slice(0, length)):
+                if (block + 1) * self.block_size <= length:
+                    self._blocks.pop(block, None)
+                else:
+                    start = block * self.block_size
+                    self._set_previous(start, other.view(np.ndarray)[start:length])
+        for block, values in other._blocks.items():
+            self._set_previous(block * other.block_size, values)
+
+    def _set_previous(self, start: int, values: np.ndarray):
+        stop = start + len(values)
+        self._start_tracking(slice(start, stop))
+        if not self.block_size:
+            self._curr[start:stop] = values
+            return
+        for block in self._get_blocks(slice(start, stop)):
+            block_start = block * self.block_size
+            lower, upper = max(start, block_start), min(stop, block_start + self.block_size)
+            self._blocks[block][lower - block_start : upper - block_start] = values[
+                lower - start : upper - start
+            ]
 
     def astype(self, dtype, order="K", casting="unsafe", subok=True, copy=True):
         """"""
@@ -91,14 +228,35 @@ class TrackedArray(np.ndarray):
             rv._curr = self._curr.astype(
                 dtype, order=order, casting=casting, subok=subok, copy=copy
             )
+        if self._blocks is not None:
+            rv._blocks = {
+                block: values.astype(dtype, order=order, casting=casting, copy=copy)
+                for block, values in self._blocks.items()
+            }
         return rv
 
 
+def set_tracking_block_size(block_size: t.Optional[int]):
+    """Set the default ``block_size`` of ``TrackedArray``-s that are created after this call. A
+    ``block_size`` of ``0`` or ``None`` tracks changes over the full array
+    """
+    TrackedArray.default_block_size = block_size or 0
+
+
 class TrackedCSRArray:
+    """A csr array that tracks which of its rows have changed since the last ``reset``. Updates
+    that keep the length of every updated row are written in place. Otherwise, the rows are
+    written in a buffer that has spare capacity (``growth_factor`` times the required size), so
+    that subsequent updates that change row lengths can be applied without a new allocation as
+    long as the data fits. ``data`` is then a view on the start of this buffer
+    """
+
     data: np.ndarray
     row_ptr: np.ndarray
     changed: np.ndarray
     size: int
+    growth_factor: t.ClassVar[float] = 1.25
+    _buffer: t.Optional[np.ndarray] = None
 
     def __init__(self, data, row_ptr, rtol=1e-05, atol=1e-08, equal_nan=False):
         self.data = np.asarray(data)
@@ -125,18 +283,71 @@ class TrackedCSRArray:
             updates = updates.astype(self.data.dtype)
 
         changes = np.zeros((self.row_ptr.size - 1,), dtype=bool)
+        indices = np.asarray(indices)
+        compare = self.get_comparator()
+
+        if not (
+            self.data.flags.writeable
+            and update_csr_array_inplace(
+                data=self.data,
+                row_ptr=self.row_ptr,
+                upd_data=updates.data,
+                upd_row_ptr=updates.row_ptr,
+                upd_indices=indices,
+                changes=changes,
+                compare=compare,
+            )
+        ):
+            self._update_in_buffer(updates, indices, changes, compare)
+
+        self.changed += changes
 
-        self.data, self.row_ptr = update_csr_array(
-            data=self.data,
+    def _update_in_buffer(self, updates: TrackedCSRArray, indices: np.ndarray, changes, compare):
+        row_lengths = np.diff(self.row_ptr)
+        row_lengths[indices] = np.diff(updates.row_ptr)
+        new_size = int(row_lengths.sum())
+
+        if not self._has_buffer_capacity(new_size):
+            if len(self.data) * self.growth_factor < new_size:
+                # the data array grows more than the spare capacity that we would allocate, it is
+                # cheaper to copy the data directly into a new array of the exact size
+                self.data, self.row_ptr = update_csr_array(
+                    data=self.data,
+                    row_ptr=self.row_ptr,
+                    upd_data=updates.data,
+                    upd_row_ptr=updates.row_ptr,
+                    upd_indices=indices,
+                    changes=changes,
+                    compare=compare,
+                )
+                self._buffer = None
+                return
+            capacity = max(int(new_size * self.growth_factor), len(self.data))
+            buffer = np.empty((capacity, *self.data.shape[1:]), dtype=self.data.dtype)
+            buffer[: len(self.data)] = self.data
+            self._buffer = buffer
+
+        self.row_ptr = update_csr_array_in_buffer(
+            buffer=self._buffer,
             row_ptr=self.row_ptr,
             upd_data=updates.data,
             upd_row_ptr=updates.row_ptr,
-            upd_indices=np.asarray(indices),
+            upd_indices=indices,
             changes=changes,
-            compare=self.get_comparator(),
+            compare=compare,
         )
+        self.data = self._buffer[:new_size]
 
-        self.changed += changes
+    def _has_buffer_capacity(self, size: int):
+        """Whether ``data`` is (still) stored at the start of the buffer, and whether the buffer
+        can hold ``size`` entries
+        """
+        return (
+            self._buffer is not None
+            and self.data.base is self._buffer
+            and self.data.ctypes.data == self._buffer.ctypes.data
+            and len(self._buffer) >= size
+        )
 
     def get_row(self, index):
         return get_row(self.data, self.row_ptr, index)
@@ -145,7 +356,7 @@ class TrackedCSRArray:
         indices = np.asarray(indices)
         if indices.dtype.type in [bool, np.bool_]:
             indices = np.flatnonzero(indices)
-        slice_data, slice_row_ptr = slice_csr_array(
+        slice_data, slice_row_ptr = select_kernel(slice_csr_array, self.data, self.row_ptr)(
             self.data, self.row_ptr, np.asarray(indices, dtype=int)
         )
         return TrackedCSRArray(slice_data, slice_row_ptr)
@@ -162,7 +373,7 @@ class TrackedCSRArray:
         """return a boolean array where the rows of `csr` equal the `row` argument
         :param row: a numpy.array
         """
-        return rows_equal(
+        return select_kernel(rows_equal, self.data, self.row_ptr)(
             self.data,
             self.row_ptr,
             row.astype(self.data.dtype),
@@ -172,7 +383,7 @@ class TrackedCSRArray:
     def rows_contain(self, val, equal_nan=None):
         """return a boolean array where the rows of `csr` contain the `val` argument"""
         comparator = self.get_comparator(to_scalar=not np.iterable(val), equal_nan=equal_nan)
-        return rows_contain(
+        return select_kernel(rows_contain, self.data, self.row_ptr)(
             self.data,
             self.row_ptr,
             np.asarray(val, dtype=self.data.dtype),
@@ -181,7 +392,7 @@ class TrackedCSRArray:
 
     def rows_intersect(self, vals, equal_nan=None):
         """return a boolean array where the rows of `csr` contain any of the `vals` arguments"""
-        return rows_intersect(
+        return select_kernel(rows_intersect, self.data, self.row_ptr)(
             self.data, self.row_ptr, vals, self.get_comparator(to_scalar=True, equal_nan=equal_nan)
         )
 
@@ -246,16 +457,24 @@ class TrackedCSRArray:
     def as_matrix(self):
         if self.size == 0:
             return np.ndarray((0, 0))
-        if self.size == 1:
-            return self.data.copy()[np.newaxis, :]
+        return self.matrix_view().copy()
+
+    def matrix_view(self):
+        """Return a 2D view on the csr-array's data without copying it. All rows must have an
+        equal length. Writing to the view modifies the csr-array in place but does not track
+        changes
+        """
+        if self.size == 0:
+            return self.data.reshape((0, 0))
 
         row_length = self.row_ptr[1] - self.row_ptr[0]
         if not np.all(np.diff(self.row_ptr) == row_length):
             raise ValueError(
                 "Can only convert CSR array to matrix when all rows have an equal length"
             )
-
-        return self.data.copy().reshape((self.size, row_length))
+        if not self.data.flags.c_contiguous:
+            self.data = np.ascontiguousarray(self.data)
+        return self.data.reshape((self.size, row_length))
 
     def update_from_matrix(self, matrix: np.ndarray):
         """Update the csr-array from a 2D matrix. The matrix number of rows must match the
@@ -9,7 +9,7 @@ import typing as t
 import numpy as np
 
 import movici_simulation_core
-from movici_simulation_core.csr import generate_update, remove_undefined_csr
+from movici_simulation_core.csr import generate_update, remove_undefined_csr, select_kernel
 from movici_simulation_core.types import CSRAttributeData, NumpyAttributeData, UniformAttributeData
 from movici_simulation_core.utils.unicode import determine_new_unicode_dtype
 
@@ -286,6 +286,14 @@ class UniformAttribute(Attribute):
         value = ensure_uniform_data(value)
         self._data = value
 
+    @property
+    def values(self) -> np.ndarray:
+        """A read-only view on the attribute's data (see ``TrackedArray.readonly``). Use this for
+        reading input attributes, since reading from ``array`` may start change tracking
+        """
+        self.has_data_or_raise()
+        return self.array.readonly()
+
     def slice(self, item):
         return self.array[item]
 
@@ -334,8 +342,7 @@ class UniformAttribute(Attribute):
             self.data_type, new_size, self.rtol, self.atol, override_dtype=self._data.dtype
         )
         new_arr[:curr_size] = self._data
-        if self._data._curr is not None:
-            new_arr._curr[:curr_size] = self._data._curr
+        new_arr.copy_tracking(self._data)
         self._data = new_arr
 
     def is_undefined(self):
@@ -518,7 +525,7 @@ class CSRAttribute(Attribute):
             arr, row_ptr = data.data, data.row_ptr
         else:
             mask = np.array(mask, dtype=bool)
-            arr, row_ptr = generate_update(
+            arr, row_ptr = select_kernel(generate_update, self.csr.data, self.csr.row_ptr)(
                 self.csr.data,
                 self.csr.row_ptr,
                 mask=mask,
@@ -0,0 +1,81 @@
+"""Compression codecs for (large) numpy arrays in update data. ``zlib`` is always available,
+``lz4`` and ``zstd`` require the ``lz4`` and ``zstandard`` packages respectively. Additional codecs
+can be added using ``register_codec``
+"""
+
+import typing as t
+import zlib
+
+codecs: t.Dict[str, t.Type["CompressionCodec"]] = {}
+
+
+def register_codec(cls: t.Type["CompressionCodec"]):
+    codecs[cls.name] = cls
+    return cls
+
+
+def get_codec(name: str) -> "CompressionCodec":
+    try:
+        codec = codecs[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown compression codec '{name}', must be one of {list(codecs.keys())}"
+        ) from None
+    return codec()
+
+
+class CompressionCodec:
+    name: t.ClassVar[str]
+
+    def compress(self, data) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, data) -> bytes:
+        raise NotImplementedError
+
+
+@register_codec
+class ZlibCodec(CompressionCodec):
+    name = "zlib"
+
+    def __init__(self, level=1):
+        self.level = level
+
+    def compress(self, data) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data) -> bytes:
+        return zlib.decompress(data)
+
+
+@register_codec
+class LZ4Codec(CompressionCodec):
+    name = "lz4"
+
+    def __init__(self):
+        import lz4.frame
+
+        self.lz4 = lz4.frame
+
+    def compress(self, data) -> bytes:
+        return self.lz4.compress(data)
+
+    def decompress(self, data) -> bytes:
+        return self.lz4.decompress(data)
+
+
+@register_codec
+class ZstdCodec(CompressionCodec):
+    name = "zstd"
+
+    def __init__(self):
+        import zstandard
+
+        self.compressor = zstandard.ZstdCompressor()
+        self.decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data) -> bytes:
+        return self.compressor.compress(data)
+
+    def decompress(self, data) -> bytes:
+        return self.decompressor.decompress(data)
@@ -23,21 +23,50 @@ class IndexParams:
 # only have to find the block wherein the id resides. This operation is O(log(n)) (binary search)
 # where n is the number of contiguous blocks. After we have found the right block, we can calculate
 # idx = id - begin + offset.
+#
+# When the ids are scattered (eg. [3,10,11,25,40]), nearly every id forms its own block and a
+# lookup becomes a binary search over all ids. When the number of blocks exceeds a fraction
+# (HASH_INDEX_BLOCK_RATIO) of the number of ids, the Index switches to a hash table instead.
+# Small indices (less than HASH_INDEX_MIN_SIZE ids) always use blocks. The hash table is an open
+# addressing table (linear probing) that stores the position of every id in the id array, with a
+# capacity of at least twice the number of ids. A lookup is O(1).
 
 IdSequence = npt.NDArray[np.int32] | list[int]
 
+HASH_INDEX_BLOCK_RATIO = 0.25
+HASH_INDEX_MIN_SIZE = 64
+_FIBONACCI_MULTIPLIER = np.uint64(11400714819323198485)
+
+
+@dataclasses.dataclass(frozen=True)
+class HashIndexParams:
+    table: np.ndarray
+    shift: int
+
+    def capacity(self):
+        return len(self.table) // 2
+
 
 class Index:
+    params: t.Union[IndexParams, HashIndexParams]
+
     def __init__(self, ids: IdSequence | None = None, raise_on_invalid=False):
-        self.ids = np.array([], dtype=int)
+        # self.ids is a view on the start of self._ids, which has spare capacity for new ids
+        self._ids = np.array([], dtype=int)
+        self.ids = self._ids
         self.params = build_index(self.ids)
         self.raise_on_invalid = raise_on_invalid
         if ids is not None and len(ids):
             self.add_ids(ids)
 
     def block_count(self):
+        if self.is_hashed():
+            return build_index(self.ids).block_count()
         return self.params.block_count()
 
+    def is_hashed(self):
+        return isinstance(self.params, HashIndexParams)
+
     def set_ids(self, ids: IdSequence):
         if len(self.ids):
             if not np.array_equal(self.ids, ids):
@@ -45,20 +74,49 @@ class Index:
         self.add_ids(ids)
 
     def add_ids(self, ids: IdSequence) -> None:
+        """Append new ids to the index. Only the new ids are checked and indexed, so that adding
+        ids takes (amortized) time in the order of the number of new ids, with the exception of
+        switching to a hash table once the ids have become too scattered
+        """
         if ids is None or not len(ids):
             return
-        self.ids = self.ensure_unique(ids)
-        self.params = build_index(self.ids)
+        ids = self.ensure_unique(ids)
+        start = len(self.ids)
+        self._append_ids(ids)
+
+        if self.is_hashed():
+            self.params = extend_hash_index(self.params, self.ids, start)
+            return
+
+        params = extend_index(self.params, self.ids, start)
+        max_blocks = HASH_INDEX_BLOCK_RATIO * len(self.ids)
+        if len(self.ids) >= HASH_INDEX_MIN_SIZE and params.block_count() > max_blocks:
+            params = build_hash_index(self.ids)
+        self.params = params
 
     def ensure_unique(self, ids: IdSequence):
+        """Check that ``ids`` are unique, both among themselves and compared to the ids that are
+        already in the index. Returns ``ids`` as an integer array
+        """
         ids = np.asarray(ids, dtype=int)
-        candidates = np.concatenate((self.ids, ids)) if self.ids is not None else ids
-        uniqs, counts = np.unique(candidates, return_counts=True)
-        if np.any(counts != 1):
+        uniqs, counts = np.unique(ids, return_counts=True)
+        duplicates = uniqs[counts != 1]
+        if len(self.ids):
+            duplicates = np.union1d(duplicates, ids[self.query_indices(ids) != -1])
+        if len(duplicates):
             raise ValueError(
-                "Duplicate entries detected: " + ", ".join(str(i) for i in uniqs[counts != 1])
+                "Duplicate entries detected: " + ", ".join(str(i) for i in duplicates)
             )
-        return candidates
+        return ids
+
+    def _append_ids(self, ids: np.ndarray):
+        size = len(self.ids) + len(ids)
+        if size > len(self._ids):
+            buffer = np.empty((max(size, 2 * len(self._ids)),), dtype=int)
+            buffer[: len(self.ids)] = self.ids
+            self._ids = buffer
+        self._ids[len(self.ids) : size] = ids
+        self.ids = self._ids[:size]
 
     def __len__(self) -> int:
         return len(self.ids)
@@ -76,12 +134,16 @@ class Index:
         return rv
 
     def query_idx(self, item: int):
+        if self.is_hashed():
+            return hash_query_idx(self.params.table, self.params.shift, self.ids, int(item))
         return query_idx(
             self.params.block_from, self.params.block_to, self.params.block_offset, item
         )
 
     def query_indices(self, item: npt.ArrayLike):
         item = np.asarray(item, dtype=int)
+        if self.is_hashed():
+            return hash_query_indices(self.params.table, self.params.shift, self.ids, item)
         return query_indices(
             self.params.block_from, self.params.block_to, self.params.block_offset, item
         )
@@ -140,3 +202,88 @@ def build_index(ids: IdSequence):
     return IndexParams(
         block_first_values[as_sorted], block_last_values[as_sorted], block_offsets[as_sorted]
     )
+
+
+def extend_index(params: IndexParams, ids: np.ndarray, start: int):
+    """extends the indexing parameters of ``ids[:start]`` with the new ids ``ids[start:]``. The
+    result is equal to ``build_index(ids)``, but only the new ids are scanned for blocks.
+    """
+    if start == 0:
+        return build_index(ids)
+    new_params = build_index(ids[start:])
+    block_from = new_params.block_from
+    block_to = new_params.block_to
+    block_offset = new_params.block_offset + start
+
+    block_to_old = params.block_to
+    if ids[start] == ids[start - 1] + 1:
+        # the first new block continues the last block of the existing ids
+        first, last = np.argmin(block_offset), np.argmax(params.block_offset)
+        block_to_old = block_to_old.copy()
+        block_to_old[last] = block_to[first]
+        keep = np.arange(len(block_from)) != first
+        block_from, block_to, block_offset = block_from[keep], block_to[keep], block_offset[keep]
+
+    block_from = np.concatenate((params.block_from, block_from))
+    as_sorted = np.argsort(block_from)
+    return IndexParams(
+        block_from[as_sorted],
+        np.concatenate((block_to_old, block_to))[as_sorted],
+        np.concatenate((params.block_offset, block_offset))[as_sorted],
+    )
+
+
+def build_hash_index(ids: np.ndarray, capacity: int = 0):
+    """builds a hash table for an ids array that can hold at least ``capacity`` ids"""
+    capacity = max(capacity, len(ids), 4)
+    bits = int(np.ceil(np.log2(2 * capacity)))
+    table = np.full((2**bits,), fill_value=-1, dtype=np.int64)
+    hash_insert(table, 64 - bits, ids, 0)
+    return HashIndexParams(table, 64 - bits)
+
+
+def extend_hash_index(params: HashIndexParams, ids: np.ndarray, start: int):
+    """adds the new ids ``ids[start:]`` to the hash table of ``ids[:start]``. When the hash table
+    is full, a new hash table is built with (at least) double the capacity
+    """
+    if len(ids) > params.capacity():
+        return build_hash_index(ids, capacity=2 * params.capacity())
+    hash_insert(params.table, params.shift, ids, start)
+    return params
+
+
+@numba.njit
+def hash_slot(ident, shift) -> int:
+    return np.int64((np.uint64(ident) * _FIBONACCI_MULTIPLIER) >> np.uint64(shift))
+
+
+@numba.njit
+def hash_insert(table, shift, ids, start):
+    """insert the positions of ``ids[start:]`` into the hash table. The ids must not yet be in
+    the table
+    """
+    mask = len(table) - 1
+    for pos in range(start, len(ids)):
+        slot = hash_slot(ids[pos], shift)
+        while table[slot] != -1:
+            slot = (slot + 1) & mask
+        table[slot] = pos
+
+
+@numba.njit
+def hash_query_indices(table, shift, ids, query) -> npt.NDArray[np.int64]:
+    result = np.empty_like(query, dtype=np.int64)
+    for i, ident in enumerate(query):
+        result[i] = hash_query_idx(table, shift, ids, ident)
+    return result
+
+
+@numba.njit
+def hash_query_idx(table, shift, ids, ident) -> int:
+    mask = len(table) - 1
+    slot = hash_slot(ident, shift)
+    while table[slot] != -1:
+        if ids[table[slot]] == ident:
+            return table[slot]
+        slot = (slot + 1) & mask
+    return -1
@@ -1,38 +1,382 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+import os
+import tempfile
+import typing as t
+from pathlib import Path
+
 import msgpack
 import numpy as np
 
 from ..types import InternalSerializationStrategy
+from .compression import CompressionCodec, get_codec
+
+if t.TYPE_CHECKING:
+    from ..settings import Settings
+
+DEFAULT_COMPRESSION_THRESHOLD = 64 * 1024
+SHARED_BUFFER_ALIGNMENT = 64
+
+
+@dataclasses.dataclass(frozen=True)
+class CompressedArray:
+    """A numpy array that is (still) compressed. It is returned when decoding compressed data
+    with ``copy=False``, so that data that is only stored and sent on (such as in the
+    ``UpdateDataService``) is not decompressed and compressed again. It is re-encoded as is.
+    """
+
+    dtype: str
+    shape: t.Tuple[int, ...]
+    codec: str
+    data: t.Any = dataclasses.field(repr=False)
+
+    def decompress(self) -> np.ndarray:
+        raw = get_codec(self.codec).decompress(self.data)
+        return np.ndarray(shape=self.shape, dtype=self.dtype, buffer=raw).copy()
+
+
+@dataclasses.dataclass(frozen=True)
+class SharedArray:
+    """A reference to a numpy array that is stored in a file that is shared between the processes
+    of a simulation on a single host. It is returned when decoding shared data with
+    ``copy=False`` and re-encoded as a reference, so that the data itself is written only once.
+    Uncompressed data is loaded as a read-only memory map of the file, so that the processes that
+    read it share the (page cached) data instead of each reading a private copy
+    """
+
+    dtype: str
+    shape: t.Tuple[int, ...]
+    path: str
+    offset: int
+    nbytes: int
+    codec: t.Optional[str] = None
+
+    def load(self) -> np.ndarray:
+        if self.codec is not None:
+            with open(self.path, "rb") as file:
+                file.seek(self.offset)
+                data = file.read(self.nbytes)
+            return CompressedArray(self.dtype, self.shape, self.codec, data).decompress()
+        if self.nbytes == 0:
+            # empty files and ranges cannot be memory mapped
+            rv = np.empty(self.shape, dtype=self.dtype)
+            rv.flags.writeable = False
+            return rv
+        return np.memmap(
+            self.path, dtype=self.dtype, mode="r", offset=self.offset, shape=self.shape
+        )
+
+
+class _SharedBufferWriter:
+    """Writes buffers into a single, newly created, file in ``directory``"""
+
+    def __init__(self, directory: t.Union[str, Path]):
+        self.directory = directory
+        self.path: t.Optional[str] = None
+        self.file: t.Optional[t.BinaryIO] = None
+        self.offset = 0
+
+    def write(self, buffer) -> t.Tuple[str, int]:
+        if self.file is None:
+            fd, self.path = tempfile.mkstemp(prefix="update-", suffix=".bin", dir=self.directory)
+            self.file = os.fdopen(fd, "wb")
+        if padding := -self.offset % SHARED_BUFFER_ALIGNMENT:
+            self.file.write(bytes(padding))
+            self.offset += padding
+        offset = self.offset
+        self.offset += self.file.write(buffer)
+        return self.path, offset
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
 
 
 class UpdateDataFormat(InternalSerializationStrategy):
+    """Serializes update data using msgpack. Numpy arrays are either encoded inline (``dumps``) or
+    out-of-band (``dumps_multipart``), in which case the raw array data is not copied into the
+    msgpack payload but returned as separate buffers, one for every array. These buffers can be
+    sent as ZMQ multipart frames without copying them.
+
+    When decoding, arrays are copied by default. When decoding with ``copy=False`` (or using
+    ``loads_readonly``), arrays are read-only views on the received buffers instead, and
+    compressed arrays are returned as ``CompressedArray``
+
+    When a ``shared_memory_dir`` is given, ``dumps_multipart`` does not return the array data
+    as separate buffers, but writes it to a file in that directory (see ``SharedArray``). The
+    resulting data only contains references to this file, which are valid for every process on
+    the same host. The files are not removed automatically (see ``get_shared_files``). Shared
+    arrays are always decoded as read-only memory maps of these files, also when ``copy=True``
+
+    :param compression: name of the compression codec (see ``core.compression``) to compress
+        arrays with, or ``None`` to disable compression. Compressed data can always be decoded,
+        regardless of this setting
+    :param compression_threshold: only compress arrays of at least this many bytes
+    :param shared_memory_dir: directory to write shared array data to, or ``None`` to send
+        array data as out-of-band buffers
+    """
+
     CURRENT_VERSION = 1
+    OUT_OF_BAND_VERSION = 2
+    SHARED_VERSION = 3
+
+    def __init__(
+        self,
+        compression: t.Optional[str] = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        shared_memory_dir: t.Union[str, Path, None] = None,
+    ):
+        self.codec: t.Optional[CompressionCodec] = (
+            get_codec(compression) if compression is not None else None
+        )
+        self.compression_threshold = compression_threshold
+        self.shared_memory_dir = shared_memory_dir
+
+    def with_settings(self, settings: Settings):
+        return type(self)(
+            compression=settings.update_compression,
+            compression_threshold=settings.update_compression_threshold,
+            shared_memory_dir=settings.update_shared_memory_dir,
+        )
 
-    def loads(self, raw_bytes: bytes):
-        return msgpack.unpackb(raw_bytes, object_hook=self.decode_numpy_array)
+    def loads(self, raw_bytes: bytes, copy=True):
+        return msgpack.unpackb(
+            raw_bytes, object_hook=functools.partial(self.decode_numpy_array, copy=copy)
+        )
+
+    def loads_readonly(self, raw_bytes: bytes):
+        return self.loads(raw_bytes, copy=False)
 
     def dumps(self, data: dict):
-        return msgpack.packb(data, default=self.encode_numpy_array)
+        return msgpack.packb(
+            data,
+            default=functools.partial(
+                self.encode_numpy_array,
+                codec=self.codec,
+                compression_threshold=self.compression_threshold,
+            ),
+        )
+
+    def loads_multipart(self, frames: t.Sequence[t.Any], copy=True):
+        """Decode data that was encoded using ``dumps_multipart``. ``frames`` may be any objects
+        that support the buffer protocol, such as ``bytes`` or ``zmq.Frame.buffer``
+        """
+        header, *buffers = frames
+        return msgpack.unpackb(
+            header,
+            object_hook=functools.partial(self.decode_numpy_array, buffers=buffers, copy=copy),
+        )
+
+    def dumps_multipart(self, data: dict) -> t.List[t.Any]:
+        """Encode data into a msgpack header followed by the raw (out-of-band) buffers of every
+        numpy array in the data. When shared memory is enabled, the array data is written to
+        a shared file instead and only the header is returned
+        """
+        if self.shared_memory_dir is not None:
+            writer = _SharedBufferWriter(self.shared_memory_dir)
+            try:
+                return [
+                    msgpack.packb(
+                        data,
+                        default=functools.partial(
+                            self.encode_numpy_array_shared,
+                            writer=writer,
+                            codec=self.codec,
+                            compression_threshold=self.compression_threshold,
+                        ),
+                    )
+                ]
+            finally:
+                writer.close()
+
+        buffers = []
+        header = msgpack.packb(
+            data,
+            default=functools.partial(
+                self.encode_numpy_array_out_of_band,
+                buffers=buffers,
+                codec=self.codec,
+                compression_threshold=self.compression_threshold,
+            ),
+        )
+        return [header, *buffers]
 
     @classmethod
-    def decode_numpy_array(cls, obj):
+    def decode_numpy_array(cls, obj, buffers: t.Sequence[t.Any] = (), copy=True):
         ver = obj.get("__np_encode_version__", None)
         if ver is None:
             return obj
-        if ver == 1:
-            return np.ndarray(shape=obj["shape"], dtype=obj["dtype"], buffer=obj["data"]).copy()
-        raise TypeError("Unsupported Numpy encoding version")
+        if ver == cls.SHARED_VERSION:
+            shared = SharedArray(
+                obj["dtype"],
+                tuple(obj["shape"]),
+                obj["path"],
+                obj["offset"],
+                obj["nbytes"],
+                obj.get("codec"),
+            )
+            return shared.load() if copy else shared
+        if ver == cls.CURRENT_VERSION:
+            buffer = obj["data"]
+        elif ver == cls.OUT_OF_BAND_VERSION:
+            buffer = buffers[obj["buffer"]]
+        else:
+            raise TypeError("Unsupported Numpy encoding version")
+
+        if (codec := obj.get("codec")) is not None:
+            compressed = CompressedArray(obj["dtype"], tuple(obj["shape"]), codec, buffer)
+            return compressed.decompress() if copy else compressed
+
+        rv = np.ndarray(shape=obj["shape"], dtype=obj["dtype"], buffer=buffer)
+        if copy:
+            return rv.copy()
+        rv.flags.writeable = False
+        return rv
 
     @classmethod
-    def encode_numpy_array(cls, obj):
-        if isinstance(obj, np.ndarray):
+    def encode_numpy_array(
+        cls,
+        obj,
+        codec: t.Optional[CompressionCodec] = None,
+        compression_threshold=DEFAULT_COMPRESSION_THRESHOLD,
+    ):
+        if isinstance(obj, SharedArray):
+            return cls._encode_shared_array(obj)
+        if isinstance(obj, (np.ndarray, CompressedArray)):
+            rv, buffer = cls._encode_array(obj, codec, compression_threshold)
+            return {"__np_encode_version__": cls.CURRENT_VERSION, **rv, "data": buffer}
+        return obj
+
+    @classmethod
+    def encode_numpy_array_out_of_band(
+        cls,
+        obj,
+        buffers: t.List[t.Any],
+        codec: t.Optional[CompressionCodec] = None,
+        compression_threshold=DEFAULT_COMPRESSION_THRESHOLD,
+    ):
+        if isinstance(obj, SharedArray):
+            return cls._encode_shared_array(obj)
+        if isinstance(obj, (np.ndarray, CompressedArray)):
+            rv, buffer = cls._encode_array(obj, codec, compression_threshold)
+            buffers.append(buffer)
             return {
-                "__np_encode_version__": cls.CURRENT_VERSION,
-                "dtype": obj.dtype.str,
-                "shape": obj.shape,
-                "data": obj.data,
+                "__np_encode_version__": cls.OUT_OF_BAND_VERSION,
+                **rv,
+                "buffer": len(buffers) - 1,
             }
         return obj
 
+    @classmethod
+    def encode_numpy_array_shared(
+        cls,
+        obj,
+        writer: _SharedBufferWriter,
+        codec: t.Optional[CompressionCodec] = None,
+        compression_threshold=DEFAULT_COMPRESSION_THRESHOLD,
+    ):
+        if isinstance(obj, SharedArray):
+            return cls._encode_shared_array(obj)
+        if isinstance(obj, (np.ndarray, CompressedArray)):
+            rv, buffer = cls._encode_array(obj, codec, compression_threshold)
+            path, offset = writer.write(buffer)
+            return {
+                "__np_encode_version__": cls.SHARED_VERSION,
+                **rv,
+                "path": path,
+                "offset": offset,
+                "nbytes": memoryview(buffer).nbytes,
+            }
+        return obj
+
+    @classmethod
+    def _encode_shared_array(cls, obj: SharedArray):
+        rv = {
+            "__np_encode_version__": cls.SHARED_VERSION,
+            "dtype": obj.dtype,
+            "shape": obj.shape,
+            "path": obj.path,
+            "offset": obj.offset,
+            "nbytes": obj.nbytes,
+        }
+        if obj.codec is not None:
+            rv["codec"] = obj.codec
+        return rv
+
+    @staticmethod
+    def _encode_array(
+        obj: t.Union[np.ndarray, CompressedArray],
+        codec: t.Optional[CompressionCodec],
+        compression_threshold: int,
+    ) -> t.Tuple[dict, t.Any]:
+        if isinstance(obj, CompressedArray):
+            return {"dtype": obj.dtype, "shape": obj.shape, "codec": obj.codec}, obj.data
+
+        obj = np.ascontiguousarray(obj)
+        rv = {"dtype": obj.dtype.str, "shape": obj.shape}
+        if codec is not None and obj.nbytes >= compression_threshold:
+            compressed = codec.compress(obj.data)
+            if len(compressed) < obj.nbytes:
+                return {**rv, "codec": codec.name}, compressed
+        return rv, obj.data
+
+
+def get_shared_files(data) -> t.Set[str]:
+    """Return the paths of all files that are referenced by ``SharedArray`` objects in data"""
+    if isinstance(data, SharedArray):
+        return {data.path}
+    if isinstance(data, dict):
+        data = data.values()
+    elif not isinstance(data, (list, tuple)):
+        return set()
+    return set().union(*(get_shared_files(item) for item in data))
+
+
+def estimate_nbytes(data) -> int:
+    """Estimate the number of bytes of (array) data that ``data`` holds in memory"""
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, CompressedArray):
+        return memoryview(data.data).nbytes
+    if isinstance(data, dict):
+        data = data.values()
+    elif not isinstance(data, (list, tuple)):
+        return 0
+    return sum(estimate_nbytes(item) for item in data)
+
+
+def estimate_frames_nbytes(frames: t.Sequence[t.Any], data) -> int:
+    """Estimate the number of bytes that serialized ``frames`` hold in memory in addition to the
+    ``data`` they were serialized from. Out-of-band frames are often views on the arrays in
+    ``data`` and do not count
+    """
+    owners = {id(_buffer_owner(arr)) for arr in _iter_buffers(data)}
+    return sum(
+        memoryview(frame).nbytes for frame in frames if id(_buffer_owner(frame)) not in owners
+    )
+
+
+def _iter_buffers(data):
+    if isinstance(data, np.ndarray):
+        yield data
+    elif isinstance(data, CompressedArray):
+        yield data.data
+    elif isinstance(data, (dict, list, tuple)):
+        for item in data.values() if isinstance(data, dict) else data:
+            yield from _iter_buffers(item)
+
+
+def _buffer_owner(obj):
+    while True:
+        if isinstance(obj, memoryview):
+            obj = obj.obj
+        elif isinstance(obj, np.ndarray) and obj.base is not None:
+            obj = obj.base
+        else:
+            return obj
+
 
 def load_update(raw_bytes: bytes):
     return UpdateDataFormat().loads(raw_bytes)
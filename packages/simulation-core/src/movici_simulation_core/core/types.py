@@ -146,7 +146,9 @@ class InitDataHandler(t.Protocol):
 
 
 class UpdateDataClientBase(t.Protocol[T]):
-    def get(self, address: str, key: str, mask: t.Optional[dict]) -> T: ...
+    def get(
+        self, address: str, key: str, mask: t.Optional[dict], fetch_count: t.Optional[int] = None
+    ) -> T: ...
     def put(self, data: T) -> t.Tuple[str, str]: ...
     def clear(self): ...
     def close(self): ...
@@ -1,4 +1,5 @@
 import functools
+import threading
 import typing as t
 
 import numba
@@ -8,6 +9,70 @@ from numba.core.types import number_domain
 # required for proper np.isclose support in numpy
 from .core import numba_extensions  # noqa F401
 
+# csr arrays with at least this number of rows are processed by the parallel variant of a kernel
+PARALLEL_ROW_THRESHOLD = 100_000
+
+_num_threads: t.Optional[int] = None
+_threadsafe_layer: t.Optional[bool] = None
+_threading_layer_lock = threading.Lock()
+
+
+def set_csr_num_threads(num_threads: t.Optional[int]):
+    """Cap the number of threads that the parallel csr kernels use. ``0`` or ``None`` uses all
+    threads available to numba, ``1`` disables the parallel kernels altogether. numba keeps the
+    number of threads per calling thread, so this must be called from every thread that runs
+    models. numba starts its threading layer on the first parallel call, so processes that fork
+    worker processes after processing large csr arrays may want to disable the parallel kernels
+    """
+    global _num_threads
+    _num_threads = num_threads or None
+    if _num_threads is not None and _num_threads > 1:
+        numba.set_num_threads(min(_num_threads, numba.config.NUMBA_NUM_THREADS))
+
+
+def select_kernel(kernel, data, row_ptr):
+    """Select the parallel variant of a csr ``kernel`` (such as ``rows_equal``) for a large
+    numeric csr array, or ``kernel`` itself otherwise. The kernels themselves remain regular numba
+    functions, so that they can also be called from other numba functions
+    """
+    if (
+        _num_threads == 1
+        or len(row_ptr) - 1 < PARALLEL_ROW_THRESHOLD
+        # unicode arrays are not supported in numba's parallel loops
+        or np.asarray(data).dtype.kind not in "biuf"
+        or not _is_threadsafe_threading_layer()
+    ):
+        return kernel
+    return _PARALLEL_KERNELS.get(kernel, kernel)
+
+
+def _is_threadsafe_threading_layer():
+    """The ``workqueue`` threading layer (numba's fallback when tbb and omp are not available)
+    aborts the process when parallel kernels are called from multiple threads at once, which
+    happens when models run concurrently in the same process
+    """
+    global _threadsafe_layer
+    if _threadsafe_layer is not None:
+        return _threadsafe_layer
+    with _threading_layer_lock:
+        if _threadsafe_layer is None:
+            try:
+                layer = numba.threading_layer()
+            except ValueError:
+                # the threading layer is only chosen on the first parallel call
+                _start_threading_layer(1)
+                layer = numba.threading_layer()
+            _threadsafe_layer = layer != "workqueue"
+    return _threadsafe_layer
+
+
+@numba.njit(cache=True, parallel=True)
+def _start_threading_layer(n):
+    rv = np.zeros((n,), dtype=np.int64)
+    for i in numba.prange(n):
+        rv[i] = i
+    return rv
+
 
 @functools.lru_cache(None)
 def float_compare(rtol=1e-5, atol=1e-8, equal_nan=True):
@@ -39,6 +104,16 @@ def compare_array(a, b):
     return a == b
 
 
+@numba.njit(cache=True, parallel=True)
+def _rows_equal_parallel(data, row_ptr, row, compare):
+    n_rows = row_ptr.size - 1
+    rv = np.zeros((n_rows,), dtype=np.bool_)
+    for i in numba.prange(n_rows):
+        data_row = get_row(data, row_ptr, i)
+        rv[i] = (data_row.shape == row.shape) and np.all(compare(data_row, row))
+    return rv
+
+
 @numba.njit(cache=True)
 def rows_equal(data, row_ptr, row, compare):
     n_rows = row_ptr.size - 1
@@ -49,6 +124,15 @@ def rows_equal(data, row_ptr, row, compare):
     return rv
 
 
+@numba.njit(cache=True, parallel=True)
+def _rows_contain_parallel(data, row_ptr, val, compare):
+    n_rows = row_ptr.size - 1
+    rv = np.zeros((n_rows,), dtype=np.bool_)
+    for i in numba.prange(n_rows):
+        rv[i] = np.any(compare(get_row(data, row_ptr, i), val))
+    return rv
+
+
 @numba.njit(cache=True)
 def rows_contain(data, row_ptr, val, compare):
     n_rows = row_ptr.size - 1
@@ -58,6 +142,19 @@ def rows_contain(data, row_ptr, val, compare):
     return rv
 
 
+@numba.njit(cache=True, parallel=True)
+def _rows_intersect_parallel(data, row_ptr, vals, compare):
+    n_rows = row_ptr.size - 1
+    rv = np.zeros((n_rows,), dtype=np.bool_)
+    for i in numba.prange(n_rows):
+        data_row = get_row(data, row_ptr, i)
+        for item in vals:
+            if np.any(compare(data_row, item)):
+                rv[i] = True
+                break
+    return rv
+
+
 @numba.njit(cache=True)
 def rows_intersect(data, row_ptr, vals, compare):
     n_rows = row_ptr.size - 1
@@ -71,11 +168,24 @@ def rows_intersect(data, row_ptr, vals, compare):
     return rv
 
 
+@numba.njit(cache=True)
+def _row_wise_sum_parallel(data, row_ptr):
+    return reduce_rows_parallel(data, row_ptr, np.sum)
+
+
 @numba.njit(cache=True)
 def row_wise_sum(data, row_ptr):
     return reduce_rows(data, row_ptr, np.sum)
 
 
+@numba.njit()
+def _row_wise_max_parallel(data, row_ptr, empty_row=None):
+    if empty_row is None:
+        return reduce_rows_parallel(data, row_ptr, np.max)
+
+    return reduce_rows_with_substitute_parallel(data, row_ptr, _substituted_max, empty_row)
+
+
 @numba.njit()
 def row_wise_max(data, row_ptr, empty_row=None):
     if empty_row is None:
@@ -84,6 +194,14 @@ def row_wise_max(data, row_ptr, empty_row=None):
     return reduce_rows_with_substitute(data, row_ptr, _substituted_max, empty_row)
 
 
+@numba.njit()
+def _row_wise_min_parallel(data, row_ptr, empty_row=None):
+    if empty_row is None:
+        return reduce_rows_parallel(data, row_ptr, np.min)
+
+    return reduce_rows_with_substitute_parallel(data, row_ptr, _substituted_min, empty_row)
+
+
 @numba.njit()
 def row_wise_min(data, row_ptr, empty_row=None):
     if empty_row is None:
@@ -114,6 +232,28 @@ def reduce_rows(data, row_ptr, func):
     return rv
 
 
+# cannot cache this function because numba complains about not being able to pickle a closure
+@numba.njit(parallel=True)
+def reduce_rows_with_substitute_parallel(data, row_ptr, func, substitute):
+    n_rows = row_ptr.size - 1
+    rv = np.zeros((n_rows,), dtype=data.dtype)
+    for i in numba.prange(n_rows):
+        data_row = get_row(data, row_ptr, i)
+        rv[i] = func(data_row, substitute)
+    return rv
+
+
+# cannot cache this function because numba complains about not being able to pickle a closure
+@numba.njit(parallel=True)
+def reduce_rows_parallel(data, row_ptr, func):
+    n_rows = row_ptr.size - 1
+    rv = np.zeros((n_rows,), dtype=data.dtype)
+    for i in numba.prange(n_rows):
+        data_row = get_row(data, row_ptr, i)
+        rv[i] = func(data_row)
+    return rv
+
+
 @numba.njit(cache=True)
 def _substituted_max(data, empty_row):
     if len(data) == 0:
@@ -190,6 +330,91 @@ def update_csr_array(
     return new_data, new_row_ptr
 
 
+@numba.njit(cache=True)
+def update_csr_array_inplace(
+    data,
+    row_ptr,
+    upd_data,
+    upd_row_ptr,
+    upd_indices,
+    compare,
+    changes=None,
+):
+    """Update a csr array (`data` and `row_ptr`) in place, without allocating a new csr array,
+    when every updated row keeps its length. Changes are tracked in the same pass (see
+    `update_csr_array`). Returns whether the update was applied: when any of the updated rows
+    has a different length, `data` is left untouched and `False` is returned
+    """
+    for upd_idx, pos in enumerate(upd_indices):
+        if row_ptr[pos + 1] - row_ptr[pos] != upd_row_ptr[upd_idx + 1] - upd_row_ptr[upd_idx]:
+            return False
+
+    for upd_idx, pos in enumerate(upd_indices):
+        old_row = get_row(data, row_ptr, pos)
+        new_row = get_row(upd_data, upd_row_ptr, upd_idx)
+        if changes is not None:
+            changes[pos] = not np.all(compare(old_row, new_row))
+        set_row(data, row_ptr, pos, new_row)
+    return True
+
+
+@numba.njit(cache=True)
+def update_csr_array_in_buffer(
+    buffer,
+    row_ptr,
+    upd_data,
+    upd_row_ptr,
+    upd_indices,
+    compare,
+    changes=None,
+):
+    """Update a csr array of which the `data` is stored at the start of `buffer`, also when the
+    length of updated rows changes. The other rows are moved within `buffer`, which must be large
+    enough to hold the updated data. Returns the new `row_ptr`; the updated data is stored in
+    `buffer[:new_row_ptr[-1]]`. Changes are tracked as in `update_csr_array`
+    """
+    n_rows = row_ptr.size - 1
+    row_lengths = np.diff(row_ptr)
+    row_lengths[upd_indices] = np.diff(upd_row_ptr)
+    new_row_ptr = np.empty_like(row_ptr)
+    new_row_ptr[0] = 0
+    new_row_ptr[1:] = np.cumsum(row_lengths)
+
+    updated = np.zeros((n_rows,), dtype=np.bool_)
+    for upd_idx, pos in enumerate(upd_indices):
+        updated[pos] = True
+        if changes is not None:
+            old_row = get_row(buffer, row_ptr, pos)
+            new_row = get_row(upd_data, upd_row_ptr, upd_idx)
+            is_equal = (old_row.shape == new_row.shape) and np.all(compare(old_row, new_row))
+            changes[pos] = not is_equal
+
+    # Consecutive rows that are not updated are moved together. Moving a run of rows to the left
+    # (front to back) can only overwrite data of runs that have already been moved, and the same
+    # holds for moving a run to the right (back to front) after all other runs have been moved
+    runs = []
+    start = 0
+    for i in range(n_rows + 1):
+        if i == n_rows or updated[i]:
+            if i > start:
+                runs.append((row_ptr[start], row_ptr[i], new_row_ptr[start]))
+            start = i + 1
+
+    for src_start, src_end, dest in runs:
+        if dest < src_start:
+            for k in range(src_end - src_start):
+                buffer[dest + k] = buffer[src_start + k]
+    for j in range(len(runs) - 1, -1, -1):
+        src_start, src_end, dest = runs[j]
+        if dest > src_start:
+            for k in range(src_end - src_start - 1, -1, -1):
+                buffer[dest + k] = buffer[src_start + k]
+
+    for upd_idx, pos in enumerate(upd_indices):
+        set_row(buffer, new_row_ptr, pos, get_row(upd_data, upd_row_ptr, upd_idx))
+    return new_row_ptr
+
+
 @numba.njit(cache=True)
 def remove_undefined_csr(
     data: np.ndarray,
@@ -234,6 +459,18 @@ def set_row(data, row_ptr, index, new_row):
     data[row_ptr[index] : row_ptr[index + 1], ...] = new_row
 
 
+@numba.njit(cache=True, parallel=True)
+def _slice_csr_array_parallel(data, row_ptr, indices):
+    slice_data, slice_row_ptr = get_new_csr_array(
+        row_lengths=np.diff(row_ptr)[indices],
+        dtype=data.dtype,
+        secondary_shape=data.shape[1:],
+    )
+    for slice_idx in numba.prange(len(indices)):
+        set_row(slice_data, slice_row_ptr, slice_idx, get_row(data, row_ptr, indices[slice_idx]))
+    return slice_data, slice_row_ptr
+
+
 @numba.njit(cache=True)
 def slice_csr_array(data, row_ptr, indices):
     slice_data, slice_row_ptr = get_new_csr_array(
@@ -253,6 +490,28 @@ def get_new_csr_array(row_lengths, dtype, secondary_shape):
     return data, row_ptr
 
 
+@numba.njit(cache=True, parallel=True)
+def _generate_update_parallel(data, row_ptr, mask, changed, undefined):
+    undefined_indices = mask & ~changed
+    secondary_shape = data.shape[1:]
+    row_lengths = np.diff(row_ptr)
+    row_lengths[undefined_indices] = 1
+    upd_data, upd_row_ptr = get_new_csr_array(
+        row_lengths=row_lengths[mask],
+        dtype=data.dtype,
+        secondary_shape=secondary_shape,
+    )
+    data_indices = np.flatnonzero(mask)
+    for upd_idx in numba.prange(len(data_indices)):
+        data_idx = data_indices[upd_idx]
+        if changed[data_idx]:
+            set_row(upd_data, upd_row_ptr, upd_idx, get_row(data, row_ptr, data_idx))
+        else:
+            set_row(upd_data, upd_row_ptr, upd_idx, undefined)
+
+    return upd_data, upd_row_ptr
+
+
 @numba.njit(cache=True)
 def generate_update(data, row_ptr, mask, changed, undefined):
     undefined_indices = mask & ~changed
@@ -272,3 +531,15 @@ def generate_update(data, row_ptr, mask, changed, undefined):
         set_row(upd_data, upd_row_ptr, upd_idx, val)
 
     return upd_data, upd_row_ptr
+
+
+_PARALLEL_KERNELS = {
+    rows_equal: _rows_equal_parallel,
+    rows_contain: _rows_contain_parallel,
+    rows_intersect: _rows_intersect_parallel,
+    row_wise_sum: _row_wise_sum_parallel,
+    row_wise_max: _row_wise_max_parallel,
+    row_wise_min: _row_wise_min_parallel,
+    slice_csr_array: _slice_csr_array_parallel,
+    generate_update: _generate_update_parallel,
+}
@@ -8,6 +8,9 @@ from pathlib import Path
 
 @dataclasses.dataclass
 class Message:
+    #: Whether the message can be constructed from (zero-copy) buffers instead of bytes
+    supports_buffers: t.ClassVar[bool] = False
+
     @classmethod
     def from_bytes(cls, raw_message: MultipartMessage) -> Message:
         dict_ = json.loads(raw_message[0])
@@ -47,6 +50,8 @@ class UpdateMessage(Message, BaseUpdateMessage):
     key: t.Optional[str] = None
     address: t.Optional[str] = None
     origin: t.Optional[str] = None
+    #: The number of models that will fetch the update data, if known
+    fetch_count: t.Optional[int] = dataclasses.field(default=None, compare=False)
 
 
 @dataclasses.dataclass
@@ -100,6 +105,8 @@ class ResultMessage(Message, BaseUpdateMessage):
     address: t.Optional[str] = None
     next_time: t.Optional[int] = None
     origin: t.Optional[str] = None
+    #: Timing and throughput metrics of the update, see ``ModelConnector.metrics``
+    metrics: t.Optional[dict] = dataclasses.field(default=None, compare=False)
 
 
 @dataclasses.dataclass
@@ -130,24 +137,41 @@ class QuitMessage(Message):
 class GetDataMessage(Message):
     key: str
     mask: t.Optional[dict] = None
+    fetch_count: t.Optional[int] = None
+
+
+class BaseDataMessage:
+    """Mixin for messages that carry serialized update data. The data can either be a single
+    buffer or a sequence of buffers that are sent as separate multipart frames. In the latter
+    case, large buffers (such as raw numpy array data) can be sent and received without copying
+    """
+
+    data: DataFrames
+    size: int
+    supports_buffers = True
+
+    def __post_init__(self):
+        self.data = from_frames(as_frames(self.data))
+        self.size = sum(memoryview(frame).nbytes for frame in self.frames)
+
+    @property
+    def frames(self) -> t.List[Buffer]:
+        return as_frames(self.data)
 
 
 @dataclasses.dataclass
-class PutDataMessage(Message):
+class PutDataMessage(BaseDataMessage, Message):
     key: str
-    data: bytes = dataclasses.field(repr=False)
+    data: DataFrames = dataclasses.field(repr=False)
     size: int = dataclasses.field(init=False)
 
-    def __post_init__(self):
-        self.size = len(self.data)
-
     @classmethod
     def from_bytes(cls, raw_message: MultipartMessage) -> Message:
-        key, data = raw_message
-        return PutDataMessage(key.decode(), data)
+        key, *frames = raw_message
+        return PutDataMessage(key.decode(), frames)
 
     def to_bytes(self) -> MultipartMessage:
-        return [self.key.encode(), self.data]
+        return [self.key.encode(), *self.frames]
 
 
 @dataclasses.dataclass
@@ -156,19 +180,16 @@ class ClearDataMessage(Message):
 
 
 @dataclasses.dataclass
-class DataMessage(Message):
-    data: bytes = dataclasses.field(repr=False)
+class DataMessage(BaseDataMessage, Message):
+    data: DataFrames = dataclasses.field(repr=False)
     size: int = dataclasses.field(init=False)
 
-    def __post_init__(self):
-        self.size = len(self.data)
-
     @classmethod
     def from_bytes(cls, raw_message: MultipartMessage) -> Message:
-        return DataMessage(raw_message[0])
+        return DataMessage(list(raw_message))
 
     def to_bytes(self) -> MultipartMessage:
-        return [self.data]
+        return self.frames
 
 
 @dataclasses.dataclass
@@ -195,8 +216,10 @@ MESSAGE_TYPES = {
 MESSAGE_IDENTIFIERS = {v: k for k, v in MESSAGE_TYPES.items()}
 
 
-def load_message(msg_type: bytes, *payload: bytes) -> Message:
+def load_message(msg_type: bytes, *payload: Buffer) -> Message:
     cls = MESSAGE_TYPES[msg_type]
+    if not cls.supports_buffers:
+        payload = [bytes(frame) for frame in payload]
     return cls.from_bytes(payload)
 
 
@@ -204,5 +227,21 @@ def dump_message(message: Message) -> TypedMultipartMessage:
     return [MESSAGE_IDENTIFIERS[type(message)], *message.to_bytes()]
 
 
-TypedMultipartMessage = MultipartMessage = t.Sequence[bytes]
+def as_frames(data: DataFrames) -> t.List[Buffer]:
+    """Convert (serialized) data into a list of frames"""
+    if isinstance(data, (list, tuple)):
+        return list(data)
+    return [data]
+
+
+def from_frames(frames: t.Sequence[Buffer]) -> DataFrames:
+    """Convert a list of frames into (serialized) data. A single frame is unpacked"""
+    if len(frames) == 1:
+        return frames[0]
+    return list(frames)
+
+
+Buffer = t.Union[bytes, memoryview]
+DataFrames = t.Union[Buffer, t.List[Buffer]]
+TypedMultipartMessage = MultipartMessage = t.Sequence[Buffer]
 ModelMessage = t.Tuple[str, Message]
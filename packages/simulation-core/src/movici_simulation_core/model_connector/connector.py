@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import dataclasses
 import itertools
+import time
 import typing as t
 from functools import singledispatchmethod
 
 from movici_simulation_core.core import InitDataHandler
+from movici_simulation_core.core.serialization import estimate_nbytes
+from movici_simulation_core.postprocessing.results import merge_updates
 
 from ..core.types import ModelAdapterBase, UpdateDataClientBase
 from ..exceptions import StreamDone
@@ -22,6 +25,8 @@ from ..messages import (
     ResultMessage,
     UpdateMessage,
     UpdateSeriesMessage,
+    as_frames,
+    from_frames,
 )
 from ..networking.client import RequestClient, Sockets
 from ..networking.stream import Stream
@@ -76,7 +81,14 @@ class ModelConnector(t.Generic[T]):
     init_data: InitDataHandler
     serialization: InternalSerializationStrategy[T]
     name: t.Optional[str] = None
+    #: Merge the update data of an ``UpdateSeriesMessage`` into a single update before handing
+    #: it to the model, see ``coalesce_update_series``
+    coalesce_updates: bool = False
     data_mask: DataMask = dataclasses.field(init=False, default_factory=dict)
+    #: The number of bytes of update data received (``bytes_in``) and sent (``bytes_out``) and
+    #: the time spent (de)serializing update data (``serialization_time``) during the current
+    #: update. These are sent to the orchestrator with every ``ResultMessage``
+    metrics: dict = dataclasses.field(init=False, default_factory=dict)
 
     def initialize(self) -> RegistrationMessage:
         self.data_mask = self.model.initialize(self.init_data)
@@ -87,28 +99,55 @@ class ModelConnector(t.Generic[T]):
         self.model.new_time(message)
 
     def update(self, update: UpdateMessage) -> ResultMessage:
+        self.reset_metrics()
         data = self._get_update_data(update)
         result_data, next_time = self.model.update(update, data=data)
         return self._process_result(result_data, next_time)
 
     def update_series(self, update: UpdateSeriesMessage) -> ResultMessage:
+        self.reset_metrics()
         data_series = (self._get_update_data(upd) for upd in update.updates)
+        if self.coalesce_updates:
+            update, data_series = coalesce_update_series(update, data_series)
         result_data, next_time = self.model.update_series(update, data=data_series)
         return self._process_result(result_data, next_time)
 
     def _get_update_data(self, update: UpdateMessage) -> UpdateData:
         if update.has_data and update.address is not None and update.key is not None:
             raw_data = self.updates.get(
-                address=update.address, key=update.key, mask=self.data_mask.get("sub")
+                address=update.address,
+                key=update.key,
+                mask=self.data_mask.get("sub"),
+                fetch_count=update.fetch_count,
             )
-            return self.serialization.loads(raw_data) if raw_data is not None else None
+            if raw_data is None:
+                return None
+            self.metrics["bytes_in"] += data_size(raw_data)
+            started_at = time.perf_counter()
+            data = self.serialization.loads_multipart(as_frames(raw_data))
+            self.metrics["serialization_time"] += time.perf_counter() - started_at
+            return data
 
         return None
 
     def _process_result(self, data: UpdateData, next_time: t.Optional[int]) -> ResultMessage:
-        result_data = self.serialization.dumps(data) if data is not None else None
+        result_data = None
+        if data is not None:
+            started_at = time.perf_counter()
+            result_data = from_frames(self.serialization.dumps_multipart(data))
+            self.metrics["serialization_time"] += time.perf_counter() - started_at
+            self.metrics["bytes_out"] += data_size(result_data)
         address, key = self._send_update_data(result_data)
-        return ResultMessage(key=key, address=address, next_time=next_time, origin=self.name)
+        return ResultMessage(
+            key=key,
+            address=address,
+            next_time=next_time,
+            origin=self.name,
+            metrics=dict(self.metrics),
+        )
+
+    def reset_metrics(self):
+        self.metrics = {"bytes_in": 0, "bytes_out": 0, "serialization_time": 0.0}
 
     def _send_update_data(
         self, result: t.Optional[T]
@@ -122,6 +161,50 @@ class ModelConnector(t.Generic[T]):
         self.updates.close()
 
 
+def coalesce_update_series(
+    message: UpdateSeriesMessage, data_series: t.Iterable[UpdateData]
+) -> t.Tuple[UpdateSeriesMessage, t.List[UpdateData]]:
+    """Merge all update data in a series into a single update, where the last write of every
+    entity's attribute wins. The merged update takes the place (and ``UpdateMessage``) of the last
+    update with data. Updates without data (``None``) trigger a model calculation by themselves
+    and are kept as they are
+    """
+    series = list(zip(message.updates, data_series))
+    with_data = [i for i, (_, data) in enumerate(series) if data is not None]
+    if len(with_data) < 2:
+        return message, [data for _, data in series]
+
+    merged = merge_updates(
+        *({k: v for k, v in series[i][1].items() if k != "general"} for i in with_data)
+    )
+    general = {}
+    for i in with_data:
+        for key, val in (series[i][1].get("general") or {}).items():
+            if isinstance(val, dict):
+                general.setdefault(key, {}).update(val)
+            else:
+                general[key] = val
+    if general:
+        merged["general"] = general
+
+    coalesced = [
+        (upd, merged if i == with_data[-1] else data)
+        for i, (upd, data) in enumerate(series)
+        if data is None or i == with_data[-1]
+    ]
+    return UpdateSeriesMessage([upd for upd, _ in coalesced]), [data for _, data in coalesced]
+
+
+def data_size(data) -> int:
+    """Return the size in bytes of serialized update data. When the data is not serialized into
+    buffers (such as when running in-process), the size of its (array) data is estimated
+    """
+    frames = as_frames(data)
+    if all(isinstance(frame, (bytes, bytearray, memoryview)) for frame in frames):
+        return sum(memoryview(frame).nbytes for frame in frames)
+    return estimate_nbytes(data)
+
+
 class UpdateDataClient(UpdateDataClientBase[bytes]):
     home_address: str
     counter: t.Iterator[str]
@@ -132,8 +215,12 @@ class UpdateDataClient(UpdateDataClientBase[bytes]):
         self.home_address = home_address
         self.reset_counter()
 
-    def get(self, address: str, key: str, mask: t.Optional[dict]) -> bytes:
-        resp = self.client.request(address, GetDataMessage(key, mask), valid_responses=DataMessage)
+    def get(
+        self, address: str, key: str, mask: t.Optional[dict], fetch_count: t.Optional[int] = None
+    ) -> bytes:
+        resp = self.client.request(
+            address, GetDataMessage(key, mask, fetch_count), valid_responses=DataMessage
+        )
         return resp.data
 
     def put(self, data: bytes) -> t.Tuple[str, str]:
@@ -1,9 +1,11 @@
 import typing as t
 
+import numba
 import numpy as np
 from movici_geo_query.geo_query import QueryResult
 
 from movici_simulation_core.core import UniformAttribute
+from movici_simulation_core.csr import select_kernel, slice_csr_array
 
 SECONDS_PER_MINUTE = 60
 SECONDS_PER_HOUR = SECONDS_PER_MINUTE * 60
@@ -11,6 +13,7 @@ SECONDS_PER_DAY = SECONDS_PER_HOUR * 24
 
 
 functions: t.Dict[str, t.Tuple[t.Callable, bool]] = dict()
+kernels: t.Dict[str, t.Callable] = dict()
 
 
 def aggregation_function(name: str, time_history: bool = False):
@@ -21,6 +24,18 @@ def aggregation_function(name: str, time_history: bool = False):
     return wrapper
 
 
+def aggregation_kernel(name: str):
+    """Register a kernel that calculates an aggregation function for all targets at once. The
+    source entities of every target are given as a csr structure of ``indices`` and ``row_ptr``
+    """
+
+    def wrapper(func):
+        kernels[name] = func
+        return func
+
+    return wrapper
+
+
 @aggregation_function("min")
 def func_min(source, special, **_) -> np.ndarray:
     if len(source) == 0:
@@ -68,7 +83,143 @@ def func_integral_days(previous_source, weights, dt, previous_target, **_) -> np
     return func_integral(previous_source, weights, dt, previous_target, scale=SECONDS_PER_DAY)
 
 
+@aggregation_kernel("min")
+def kernel_min(source, finite, indices, row_ptr, special, **_) -> np.ndarray:
+    return segment_min(source, finite, indices, row_ptr, special)
+
+
+@aggregation_kernel("max")
+def kernel_max(source, finite, indices, row_ptr, special, **_) -> np.ndarray:
+    return segment_max(source, finite, indices, row_ptr, special)
+
+
+@aggregation_kernel("average")
+def kernel_avg(source, weights, finite, indices, row_ptr, special, **_) -> np.ndarray:
+    return segment_average(source, weights, finite, indices, row_ptr, special)
+
+
+@aggregation_kernel("sum")
+def kernel_sum(source, weights, finite, indices, row_ptr, **_) -> np.ndarray:
+    return segment_sum(source, weights, finite, indices, row_ptr)
+
+
+@aggregation_kernel("integral_seconds")
+@aggregation_kernel("integral")
+def kernel_integral(
+    previous_source, weights, finite, indices, row_ptr, dt, previous_target, scale=1, **_
+) -> np.ndarray:
+    return previous_target + dt / scale * segment_sum(
+        previous_source, weights, finite, indices, row_ptr
+    )
+
+
+@aggregation_kernel("integral_minutes")
+def kernel_integral_minutes(**kwargs) -> np.ndarray:
+    return kernel_integral(**kwargs, scale=SECONDS_PER_MINUTE)
+
+
+@aggregation_kernel("integral_hours")
+def kernel_integral_hours(**kwargs) -> np.ndarray:
+    return kernel_integral(**kwargs, scale=SECONDS_PER_HOUR)
+
+
+@aggregation_kernel("integral_days")
+def kernel_integral_days(**kwargs) -> np.ndarray:
+    return kernel_integral(**kwargs, scale=SECONDS_PER_DAY)
+
+
+@numba.njit(cache=True)
+def segment_min(values, finite, indices, row_ptr, special):
+    n_rows = row_ptr.size - 1
+    rv = np.full((n_rows,), special, dtype=np.float64)
+    for i in range(n_rows):
+        found = False
+        for pos in range(row_ptr[i], row_ptr[i + 1]):
+            idx = indices[pos]
+            if finite[idx] and (not found or values[idx] < rv[i]):
+                rv[i] = values[idx]
+                found = True
+    return rv
+
+
+@numba.njit(cache=True)
+def segment_max(values, finite, indices, row_ptr, special):
+    n_rows = row_ptr.size - 1
+    rv = np.full((n_rows,), special, dtype=np.float64)
+    for i in range(n_rows):
+        found = False
+        for pos in range(row_ptr[i], row_ptr[i + 1]):
+            idx = indices[pos]
+            if finite[idx] and (not found or values[idx] > rv[i]):
+                rv[i] = values[idx]
+                found = True
+    return rv
+
+
+@numba.njit(cache=True)
+def segment_sum(values, weights, finite, indices, row_ptr):
+    n_rows = row_ptr.size - 1
+    rv = np.zeros((n_rows,), dtype=np.float64)
+    for i in range(n_rows):
+        for pos in range(row_ptr[i], row_ptr[i + 1]):
+            idx = indices[pos]
+            if finite[idx]:
+                rv[i] += weights[idx] * values[idx]
+    return rv
+
+
+@numba.njit(cache=True)
+def segment_average(values, weights, finite, indices, row_ptr, special):
+    n_rows = row_ptr.size - 1
+    rv = np.full((n_rows,), special, dtype=np.float64)
+    for i in range(n_rows):
+        total = 0.0
+        count = 0
+        for pos in range(row_ptr[i], row_ptr[i + 1]):
+            idx = indices[pos]
+            if finite[idx]:
+                total += weights[idx] * values[idx]
+                count += 1
+        if count:
+            rv[i] = total / count
+    return rv
+
+
+def mapping_as_csr(mapping: QueryResult) -> t.Tuple[np.ndarray, np.ndarray]:
+    """Convert a ``QueryResult`` into a csr structure of (``indices``, ``row_ptr``) so that every
+    row contains the unique and sorted source indices for a single target
+    """
+    indices = np.asarray(mapping.indices, dtype=np.int64)
+    if mapping.row_ptr is None:
+        return indices, np.arange(len(indices) + 1, dtype=np.int64)
+
+    row_ptr = np.asarray(mapping.row_ptr, dtype=np.int64)
+    rows = np.repeat(np.arange(len(row_ptr) - 1), np.diff(row_ptr))
+    order = np.lexsort((indices, rows))
+    rows, indices = rows[order], indices[order]
+    unique = np.ones(len(indices), dtype=bool)
+    unique[1:] = (rows[1:] != rows[:-1]) | (indices[1:] != indices[:-1])
+    row_lengths = np.bincount(rows[unique], minlength=len(row_ptr) - 1)
+    return indices[unique], np.concatenate(([0], np.cumsum(row_lengths)))
+
+
+def reverse_mapping(
+    indices: np.ndarray, row_ptr: np.ndarray, n_sources: int
+) -> t.Tuple[np.ndarray, np.ndarray]:
+    """Transpose a csr mapping of targets to sources into a csr mapping of sources to targets"""
+    rows = np.repeat(np.arange(len(row_ptr) - 1, dtype=np.int64), np.diff(row_ptr))
+    order = np.argsort(indices, kind="stable")
+    source_lengths = np.bincount(indices, minlength=n_sources)
+    return rows[order], np.concatenate(([0], np.cumsum(source_lengths)))
+
+
 class AttributeAggregator:
+    """Aggregates a source attribute into a target attribute based on a mapping from every target
+    to its source entities. Aggregation functions that do not depend on time history are
+    recalculated only for targets that have at least one changed source entity since the previous
+    calculation
+    """
+
     def __init__(
         self,
         source: UniformAttribute,
@@ -82,7 +233,15 @@ class AttributeAggregator:
         self.source = source
         self.target = target
         self.function, self.time_history = functions[func]
-        self.mapping = mapping
+        self.kernel = kernels[func]
+        self.mapping = None
+        self.indices: t.Optional[np.ndarray] = None
+        self.row_ptr: t.Optional[np.ndarray] = None
+        self.reverse_indices: t.Optional[np.ndarray] = None
+        self.reverse_row_ptr: t.Optional[np.ndarray] = None
+        self.calculated = False
+        if mapping is not None:
+            self.add_mapping(mapping)
         self.default_special_value = default_special_value
         self.weights = weights
         self.previous_source = previous_source
@@ -90,9 +249,13 @@ class AttributeAggregator:
 
     def add_mapping(self, mapping: QueryResult):
         self.mapping = mapping
+        self.indices, self.row_ptr = mapping_as_csr(mapping)
+        self.reverse_indices = self.reverse_row_ptr = None
+        self.calculated = False
 
     def set_weights(self, weights: np.ndarray):
         self.weights = weights
+        self.calculated = False
 
     def initialize(self):
         if self.initialized:
@@ -115,22 +278,41 @@ class AttributeAggregator:
         if self.weights is None:
             self.weights = np.ones(len(self.source))
 
-        finite = ~(self.source.is_special() | self.source.is_undefined())
+        if self.time_history or not self.calculated:
+            self.target[:] = self._calculate_rows(self.indices, self.row_ptr, dt=dt)
+        elif len(targets := self.get_affected_targets(self.source.changed)):
+            slice_rows = select_kernel(slice_csr_array, self.indices, self.row_ptr)
+            indices, row_ptr = slice_rows(self.indices, self.row_ptr, targets)
+            self.target[targets] = self._calculate_rows(indices, row_ptr, dt=dt)
 
-        for target_idx, source_indices in enumerate(self.mapping.iterate()):
-            to_count = np.zeros(len(self.source), dtype=bool)
-            to_count[source_indices] = True
-            to_count &= finite
-            self.target[target_idx] = self.function(
-                source=self.source[to_count],
-                previous_source=self.previous_source[to_count],
-                weights=self.weights[to_count],
-                dt=dt,
-                previous_target=self.target[target_idx],
-                special=self.target.options.special,
-            )
+        self.calculated = True
         self.previous_source = self.source.array.copy()
 
+    def _calculate_rows(self, indices: np.ndarray, row_ptr: np.ndarray, dt=None):
+        finite = ~(self.source.is_special() | self.source.is_undefined())
+        return self.kernel(
+            source=self.source.array,
+            previous_source=self.previous_source,
+            weights=self.weights,
+            finite=finite,
+            indices=indices,
+            row_ptr=row_ptr,
+            dt=dt,
+            previous_target=self.target.array,
+            special=self.target.options.special,
+        )
+
+    def get_affected_targets(self, changed: np.ndarray) -> np.ndarray:
+        """Return the (sorted) indices of all targets that have at least one changed source"""
+        if self.reverse_indices is None:
+            self.reverse_indices, self.reverse_row_ptr = reverse_mapping(
+                self.indices, self.row_ptr, len(changed)
+            )
+        targets, _ = slice_csr_array(
+            self.reverse_indices, self.reverse_row_ptr, np.flatnonzero(changed)
+        )
+        return np.unique(targets)
+
     @staticmethod
     def ensure_special_value(attr, special_value):
         if attr.options.special is None:
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import collections
 import dataclasses
+import logging
+import multiprocessing
 import typing as t
+from concurrent import futures
+from multiprocessing.shared_memory import SharedMemory
 
 import numpy as np
 import numpy.typing as npt
@@ -31,6 +36,14 @@ class Network:
 
     If a regular node needs to be used as an entry/exit point, it must be connected to a virtual
     node, using a virtual link.
+
+    Calculated shortest paths are kept in a :class:`ShortestPathCache`. By default this cache is
+    unbounded, but a memory budget (in bytes) can be given as ``cache_size``.
+
+    Shortest paths for multiple source nodes can be calculated in parallel by supplying
+    ``workers``. The source nodes are then divided over a pool of worker processes. The results are
+    identical to calculating them serially. Call :meth:`close` to shut down the worker processes
+    when the ``Network`` is no longer needed.
     """
 
     # To prevent flow through (non source/non target) virtual nodes, the virtual links
@@ -65,6 +78,11 @@ class Network:
     graph: Graph
     source_node_idx = None
 
+    # Upper bound for the number of elements (sources x nodes) in a single batch of shortest path
+    # results. Sources are solved in batches that stay within this bound, so that memory usage
+    # stays limited when calculating shortest paths for many sources on a large network
+    MAX_BATCH_ELEMENTS = 2**24
+
     _cost_factor: t.Optional[np.ndarray] = None
 
     def __init__(
@@ -74,7 +92,10 @@ class Network:
         virtual_nodes: PointEntity,
         virtual_links: LinkEntity,
         cost_factor: t.Optional[np.ndarray] = None,
+        workers: int = 1,
+        cache_size: t.Optional[int] = None,
     ):
+        self._cache = ShortestPathCache(max_bytes=cache_size)
         self.all_node_index = Index(raise_on_invalid=True)
         self.virtual_node_index = Index(raise_on_invalid=False)
 
@@ -89,21 +110,31 @@ class Network:
         self.process_virtual_links(virtual_links)
 
         self.graph = self._build_graph()
+        self.graph.workers = workers
+        self.graph.set_terminal_nodes(
+            self.all_node_index[self.virtual_node_ids], self.MIN_COST_FACTOR
+        )
         self.initialize_cost_factor()
 
         if cost_factor is not None:
             self.update_cost_factor(cost_factor)
 
-        self._cache = {}
-
     @property
     def cost_factor(self):
         return self._cost_factor
 
+    @property
+    def cache(self) -> ShortestPathCache:
+        return self._cache
+
     @cost_factor.setter
     def cost_factor(self, val):
         self.update_cost_factor(val)
 
+    def close(self):
+        """Shut down any worker processes used for calculating shortest paths"""
+        self.graph.close()
+
     def process_transport_links(self, transport_links: TransportSegmentEntity):
         # Transport links may be bidirectional. The graph we create is unidirectional, so for
         # every bidirectional link we must create a forward- and a reverse direction edge in the
@@ -203,6 +234,9 @@ class Network:
         factor array is equal to the position of entities in the ``"transport_link"`` array used
         to construct this ``Network``
 
+        Cached shortest paths are only discarded when they may be affected by the new cost factor,
+        so that only those shortest paths are recalculated when a few links change.
+
         :param cost_factor: An `np.ndarray` with the new cost factors
         """
         if len(cost_factor) != self.tl_count:
@@ -216,24 +250,30 @@ class Network:
         # ``process_transport_links`` we have created copies for bidirectional links (the graph
         # requires unidirectional links) and in `process_virtual_links` we have added virtual
         # links to the graph that we need to account for when updating graph's cost factor
-        self.graph.update_cost_factor(
+        changed_edges = self.graph.update_cost_factor(
             np.concatenate((cost_factor[self.tl_mapping], self.vl_cost_factor))
         )
         self._cost_factor = cost_factor
-        self._cache = {}
+        self._invalidate_cache(changed_edges)
+
+    def _invalidate_cache(self, changed_edges: np.ndarray):
+        if not len(changed_edges):
+            return
+        for source_node_id, (dist, prev) in list(self._cache.items()):
+            if self.graph.is_tree_affected(dist, prev, changed_edges):
+                del self._cache[source_node_id]
 
     def all_shortest_paths(self, virtual_node_ids: npt.ArrayLike | None = None):
         """Compute the shortest path distance between all virtual nodes"""
         if virtual_node_ids is None:
             virtual_node_ids = self.virtual_node_ids
+        virtual_node_ids = np.asarray(virtual_node_ids)
         node_indices = self.all_node_index[virtual_node_ids]
 
-        return np.vstack(
-            [
-                self.get_shortest_path(ident)[0][node_indices]
-                for ident in np.asarray(virtual_node_ids)
-            ]
-        )
+        result = np.empty((len(virtual_node_ids), len(virtual_node_ids)), dtype=np.float64)
+        for batch, (dist, _) in self.iter_shortest_paths(virtual_node_ids):
+            result[batch] = dist[:, node_indices]
+        return result
 
     def get_shortest_path(self, source_node_id: int) -> tuple[np.ndarray, np.ndarray]:
         """
@@ -243,20 +283,70 @@ class Network:
         :returns a (dist, prev) tuple
 
         """
-        try:
-            return self._cache[int(source_node_id)]
-        except KeyError:
-            pass
+        dist, prev = self.get_shortest_paths([source_node_id])
+        return dist[0], prev[0]
+
+    def get_shortest_paths(self, source_node_ids: npt.ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the shortest paths from multiple source nodes. This is the batched equivalent
+        of :meth:`get_shortest_path` and returns the result for all source nodes at once.
 
+        :param source_node_ids: an array (or array-like) of virtual node ids
+        :returns a (dist, prev) tuple of 2d arrays, with a row for every source node
+        """
+        source_node_ids = np.asarray(source_node_ids)
+        dist = np.empty((len(source_node_ids), self.graph.node_count), dtype=np.float64)
+        prev = np.empty((len(source_node_ids), self.graph.node_count), dtype=np.int32)
+        for batch, (batch_dist, batch_prev) in self.iter_shortest_paths(source_node_ids):
+            dist[batch] = batch_dist
+            prev[batch] = batch_prev
+        return dist, prev
+
+    def iter_shortest_paths(
+        self, source_node_ids: npt.ArrayLike
+    ) -> t.Iterator[tuple[slice, tuple[np.ndarray, np.ndarray]]]:
+        """Calculate the shortest paths from multiple source nodes in batches. Shortest paths that
+        are not yet cached are calculated together in a single call per batch, without changing
+        the graph's cost factor for every source node.
+
+        :param source_node_ids: an array (or array-like) of virtual node ids
+        :returns an iterator of ``(batch, (dist, prev))`` tuples, where ``batch`` is a ``slice``
+            of ``source_node_ids`` and ``dist`` and ``prev`` are 2d arrays with a row for every
+            source node in the batch
+        """
         if self.cost_factor is None:
             raise ValueError("Please first set a cost_factor using Network.update_cost_factor")
 
-        self.set_source_node(source_node_id)
-
-        result = self.graph.shortest_path(self.all_node_index[source_node_id])
+        source_node_ids = np.asarray(source_node_ids, dtype=np.int64).reshape(-1)
+        invalid = self.virtual_node_index[source_node_ids] == -1
+        if np.any(invalid):
+            raise ValueError(
+                f"Node {source_node_ids[np.argmax(invalid)]} is not a valid Virtual Node"
+            )
 
-        self._cache[int(source_node_id)] = result
-        return result
+        batch_size = max(1, self.MAX_BATCH_ELEMENTS // max(1, self.graph.node_count))
+        for begin in range(0, len(source_node_ids), batch_size):
+            batch = slice(begin, begin + batch_size)
+            yield batch, self._get_shortest_paths_batch(source_node_ids[batch])
+
+    def _get_shortest_paths_batch(self, source_node_ids: np.ndarray):
+        dist = np.empty((len(source_node_ids), self.graph.node_count), dtype=np.float64)
+        prev = np.empty((len(source_node_ids), self.graph.node_count), dtype=np.int32)
+        missing = []
+        for row, ident in enumerate(source_node_ids):
+            if (cached := self._cache.get(int(ident))) is None:
+                missing.append(row)
+            else:
+                dist[row], prev[row] = cached
+
+        if missing:
+            missing = np.asarray(missing)
+            missing_ids = source_node_ids[missing]
+            dist[missing], prev[missing] = self.graph.terminal_shortest_paths(
+                self.all_node_index[missing_ids]
+            )
+            for row, ident in zip(missing, missing_ids):
+                self._cache[int(ident)] = (dist[row].copy(), prev[row].copy())
+        return dist, prev
 
     def set_source_node(self, source_node_id: int):
         """Set the current source node for a shortest path calculation, this must be a virtual node
@@ -287,19 +377,19 @@ class Network:
         values = self._get_mapped_quantity(values)
         if virtual_node_ids is None:
             virtual_node_ids = self.virtual_node_ids
-        node_indices = self.virtual_node_index[virtual_node_ids]
-
-        return np.vstack(
-            [
-                self.shortest_path_sum(
-                    ident,
-                    values=values,
-                    no_path_found=no_path_found,
-                    values_are_mapped=True,
-                )[node_indices]
-                for ident in virtual_node_ids
-            ]
-        )
+        virtual_node_ids = np.asarray(virtual_node_ids)
+        node_indices = self.all_node_index[virtual_node_ids]
+
+        result = np.empty((len(virtual_node_ids), len(virtual_node_ids)), dtype=np.float64)
+        for batch, (_, prev) in self.iter_shortest_paths(virtual_node_ids):
+            result[batch] = self.graph.all_shortest_paths_sum(
+                predecessors=prev,
+                source_indices=node_indices[batch],
+                target_indices=node_indices,
+                values=values,
+                no_path_found=no_path_found,
+            )
+        return result
 
     def shortest_path_sum(self, source_node_id, values, no_path_found=-1, values_are_mapped=False):
         """Calculate the sum of a quantity that is defined for every link on the shortest path from
@@ -318,14 +408,13 @@ class Network:
             values = self._get_mapped_quantity(values)
 
         _, prev = self.get_shortest_path(source_node_id)
-        source_idx = self.all_node_index[source_node_id]
-        return self.graph.shortest_path_sum(
-            predecessors=prev,
-            source_idx=source_idx,
+        return self.graph.all_shortest_paths_sum(
+            predecessors=prev[np.newaxis, :],
+            source_indices=self.all_node_index[[source_node_id]],
             target_indices=self.all_node_index[self.virtual_node_ids],
             values=values,
             no_path_found=no_path_found,
-        )
+        )[0]
 
     def all_shortest_paths_weighted_average(
         self, values, virtual_node_ids=None, weights=None, no_path_found=-1
@@ -354,20 +443,20 @@ class Network:
 
         if virtual_node_ids is None:
             virtual_node_ids = self.virtual_node_ids
-        node_indices = self.virtual_node_index[virtual_node_ids]
-
-        return np.vstack(
-            [
-                self.shortest_path_weighted_average(
-                    ident,
-                    values=values,
-                    weights=weights,
-                    no_path_found=no_path_found,
-                    values_are_mapped=True,
-                )[node_indices]
-                for ident in virtual_node_ids
-            ]
-        )
+        virtual_node_ids = np.asarray(virtual_node_ids)
+        node_indices = self.all_node_index[virtual_node_ids]
+
+        result = np.empty((len(virtual_node_ids), len(virtual_node_ids)), dtype=np.float64)
+        for batch, (_, prev) in self.iter_shortest_paths(virtual_node_ids):
+            result[batch] = self.graph.all_shortest_paths_weighted_average(
+                predecessors=prev,
+                source_indices=node_indices[batch],
+                target_indices=node_indices,
+                values=values,
+                weights=weights,
+                no_path_found=no_path_found,
+            )
+        return result
 
     def shortest_path_weighted_average(
         self, source_node_id, values, weights=None, no_path_found=-1, values_are_mapped=False
@@ -390,15 +479,14 @@ class Network:
             if weights is not None:
                 weights = self._get_mapped_quantity(weights)
         _, prev = self.get_shortest_path(source_node_id)
-        source_idx = self.all_node_index[source_node_id]
-        return self.graph.shortest_path_weighted_average(
-            predecessors=prev,
-            source_idx=source_idx,
+        return self.graph.all_shortest_paths_weighted_average(
+            predecessors=prev[np.newaxis, :],
+            source_indices=self.all_node_index[[source_node_id]],
             target_indices=self.all_node_index[self.virtual_node_ids],
             weights=weights,
             values=values,
             no_path_found=no_path_found,
-        )
+        )[0]
 
     def _get_mapped_quantity(self, values):
         return np.concatenate(
@@ -454,6 +542,82 @@ class Network:
         return t.cast(NetworkEntities, rv)
 
 
+class ShortestPathCache:
+    """A least recently used (LRU) cache for shortest path ``(dist, prev)`` tuples by source node
+    id. When a memory budget is given, the least recently used entries are evicted whenever the
+    total size of the cached arrays exceeds the budget. Cache hits, misses and evictions are
+    counted so that the budget can be tuned against recalculation.
+
+    :param max_bytes: the memory budget in bytes, or ``None`` for an unbounded cache
+    """
+
+    def __init__(self, max_bytes: t.Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: collections.OrderedDict[int, tuple[np.ndarray, np.ndarray]] = (
+            collections.OrderedDict()
+        )
+
+    def get(self, key: int) -> t.Optional[tuple[np.ndarray, np.ndarray]]:
+        """Get a cached entry and mark it as most recently used, or return ``None`` if the key is
+        not in the cache
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: int, value: tuple[np.ndarray, np.ndarray]):
+        if key in self._entries:
+            del self[key]
+        size = _nbytes(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = value
+        self.nbytes += size
+        while self.max_bytes is not None and self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= _nbytes(evicted)
+            self.evictions += 1
+
+    def __getitem__(self, key: int) -> tuple[np.ndarray, np.ndarray]:
+        return self._entries[key]
+
+    def __delitem__(self, key: int):
+        self.nbytes -= _nbytes(self._entries.pop(key))
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def items(self):
+        return self._entries.items()
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def log_statistics(self, logger: logging.Logger, level=logging.DEBUG):
+        logger.log(
+            level,
+            f"Shortest path cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.evictions} evictions, {len(self)} entries ({self.nbytes} bytes)",
+        )
+
+
+def _nbytes(value: tuple[np.ndarray, ...]):
+    return sum(arr.nbytes for arr in value)
+
+
 @dataclasses.dataclass
 class Graph:
     """Internal class that acts as an interface to :func:`scipy.sparse.csr_matrix` and
@@ -471,6 +635,17 @@ class Graph:
     :param indptr: sparse matrix index pointer array (see ``scipy.sparse.csr_matrix``)
     :param cost_factor_indices: a mapping between position of a link in the transport link entity
         group and their position in the sparse matrix
+
+    Nodes can be marked as terminal nodes using :meth:`set_terminal_nodes`. Terminal nodes can
+    only be the start or the end of a path, never an intermediate node. This makes it possible to
+    calculate shortest paths from many terminal nodes in a single call (see
+    :meth:`terminal_shortest_paths`). In the underlying sparse matrix every terminal node is split
+    into a sink node, that has only the incoming edges of the terminal node, and a source node,
+    that has only its outgoing edges.
+
+    When ``workers`` is larger than 1, the source nodes in :meth:`terminal_shortest_paths` are
+    divided over a pool of worker processes and the rows in the ``all_shortest_paths_*``
+    reductions are divided over ``workers`` threads.
     """
 
     indices: np.ndarray
@@ -478,6 +653,15 @@ class Graph:
     cost_factor_indices: np.ndarray
     node_count: int = dataclasses.field(init=False)
     cost_factor: np.ndarray = dataclasses.field(init=False)
+    terminal_indices: t.Optional[np.ndarray] = dataclasses.field(init=False, default=None)
+    terminal_cost_factor: float = dataclasses.field(init=False, default=1.0)
+    workers: int = dataclasses.field(init=False, default=1)
+    _terminal_graph: t.Optional[tuple[csr_matrix, np.ndarray]] = dataclasses.field(
+        init=False, default=None, repr=False
+    )
+    _pool: t.Optional[_ShortestPathPool] = dataclasses.field(init=False, default=None, repr=False)
+    edge_sources: np.ndarray = dataclasses.field(init=False, repr=False)
+    _is_terminal: np.ndarray = dataclasses.field(init=False, repr=False)
 
     @staticmethod
     def from_network_data(node_idx: Index, from_node_id, to_node_id):
@@ -494,14 +678,61 @@ class Graph:
     def __post_init__(self):
         self.node_count = len(self.indptr) - 1
         self.cost_factor = np.ones_like(self.cost_factor_indices, dtype=np.float64)
+        self.edge_sources = np.repeat(np.arange(self.node_count), np.diff(self.indptr))
+        self._is_terminal = np.zeros((self.node_count,), dtype=bool)
 
-    def update_cost_factor(self, cost_factor: np.ndarray):
+    def update_cost_factor(self, cost_factor: np.ndarray) -> np.ndarray:
         """Set the cost factor of the graph.
 
         :param cost_factor: a :class:`np.ndarray` containing the cost factor of the links as they
             were provided to the :meth:`Graph.from_network_data` constructor.
+        :returns: the indices of the edges in the graph of which the cost factor has changed
+        """
+        cost_factor = cost_factor[self.cost_factor_indices]
+        changed_edges = np.flatnonzero(cost_factor != self.cost_factor)
+        self.cost_factor = cost_factor
+        self._terminal_graph = None
+        return changed_edges
+
+    def is_tree_affected(self, dist: np.ndarray, prev: np.ndarray, changed_edges: np.ndarray):
+        """Check whether a shortest path tree, as calculated by :meth:`terminal_shortest_paths`,
+        may be different after the cost factor of some edges has changed. This is the case when
+        a changed edge is part of the tree, or when a changed edge provides a path to its target
+        node that is at least as short as the path in the tree. Changes to the outgoing edges of
+        terminal nodes never affect a tree
+
+        :param dist: the distance array of the tree, calculated with the previous cost factor
+        :param prev: the predecessors array of the tree
+        :param changed_edges: the indices of the changed edges, as returned by
+            :meth:`update_cost_factor`
+        """
+        return _is_tree_affected(
+            dist,
+            prev,
+            self.edge_sources,
+            self.indices,
+            self.cost_factor,
+            self._is_terminal,
+            np.asarray(changed_edges, dtype=np.int64),
+        )
+
+    def set_terminal_nodes(self, node_indices: np.ndarray, outgoing_cost_factor: float):
+        """Mark nodes as terminal nodes. When calculating shortest paths using
+        :meth:`terminal_shortest_paths` the outgoing edges of a terminal node can only be used
+        when that node is the source node, and they then get ``outgoing_cost_factor`` as their
+        cost factor.
+
+        :param node_indices: the indices of the terminal nodes in the graph
+        :param outgoing_cost_factor: the cost factor of the outgoing edges of a terminal node when
+            it is the source node
         """
-        self.cost_factor = cost_factor[self.cost_factor_indices]
+        self.terminal_indices = np.asarray(node_indices, dtype=np.int64)
+        self.terminal_cost_factor = outgoing_cost_factor
+        self._is_terminal = np.zeros((self.node_count,), dtype=bool)
+        self._is_terminal[self.terminal_indices] = True
+        self._terminal_graph = None
+        # the worker processes hold the structure of the terminal graph, which has now changed
+        self.close()
 
     def set_node_outgoing_cost_factor(self, node_idx, value):
         """Set the outgoing cost factor for all edges of a single node. Useful for
@@ -518,6 +749,144 @@ class Graph:
             indices=indices,
         )
 
+    def terminal_shortest_paths(self, source_indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the shortest paths from multiple terminal nodes in a single call. The cost
+        factor of the outgoing edges of the terminal nodes, as set by
+        :meth:`set_node_outgoing_cost_factor`, is ignored. See also :meth:`set_terminal_nodes`.
+
+        :param source_indices: the indices of the source nodes in the graph. These must all be
+            terminal nodes
+        :returns a (dist, prev) tuple of 2d arrays, with a row for every source node. These have
+            the same meaning as the result of :meth:`shortest_path` for a single source node
+        """
+        if self.terminal_indices is None:
+            raise ValueError("Please first set the terminal nodes using Graph.set_terminal_nodes")
+        source_indices = np.asarray(source_indices, dtype=np.int64)
+        terminal_positions = np.full((self.node_count,), -1, dtype=np.int64)
+        terminal_positions[self.terminal_indices] = np.arange(len(self.terminal_indices))
+        if np.any(terminal_positions[source_indices] == -1):
+            raise ValueError("Source nodes must be terminal nodes")
+
+        matrix, _ = self._get_terminal_graph()
+        indices = self.node_count + terminal_positions[source_indices]
+        if self.workers > 1 and len(indices) > 1:
+            dist, prev = self._get_pool(matrix).solve(matrix.data, indices)
+        else:
+            dist, prev = _solve_shortest_paths(matrix, indices, self.node_count)
+
+        # The split off source nodes are located beyond the original nodes, these must be mapped
+        # back to their original node index. The source node itself only exists in the matrix as a
+        # split off source node
+        from_source = prev >= self.node_count
+        prev[from_source] = self.terminal_indices[prev[from_source] - self.node_count]
+        rows = np.arange(len(source_indices))
+        dist[rows, source_indices] = 0
+        prev[rows, source_indices] = -9999
+        return dist, prev
+
+    def _get_pool(self, matrix: csr_matrix) -> _ShortestPathPool:
+        if self._pool is None:
+            self._pool = _ShortestPathPool(matrix, self.node_count, self.workers)
+        return self._pool
+
+    def close(self):
+        """Shut down the worker processes, if any"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def _get_terminal_graph(self) -> tuple[csr_matrix, np.ndarray]:
+        if self._terminal_graph is None:
+            indptr, indices, data = _split_terminal_nodes(
+                self.indptr,
+                self.indices,
+                self.cost_factor,
+                self.terminal_indices,
+                self.terminal_cost_factor,
+            )
+            cost_factor = self.cost_factor.copy()
+            for idx in self.terminal_indices:
+                cost_factor[self.indptr[idx] : self.indptr[idx + 1]] = self.terminal_cost_factor
+            size = len(indptr) - 1
+            matrix = csr_matrix((data, indices, indptr), shape=(size, size))
+            self._terminal_graph = (matrix, cost_factor)
+        return self._terminal_graph
+
+    def all_shortest_paths_sum(
+        self, predecessors, source_indices, target_indices, values, no_path_found=-1
+    ):
+        """Calculate the sum of a quantity along the shortest paths for multiple source nodes
+        as calculated by :meth:`terminal_shortest_paths`
+
+        :param predecessors: a 2d predecessors array with a row for every source node
+        :param source_indices: the indices of the source nodes in the graph
+        :param target_indices: the indices of the target nodes in the graph
+        :param values: the quantity for every edge in the graph
+        :param no_path_found: a fill value for when no path exists between source and target
+        :returns a 2d array with a row for every source and a column for every target
+        """
+        _, cost_factor = self._get_terminal_graph()
+        return self._reduce_rows(
+            _all_shortest_paths_sum,
+            predecessors,
+            np.asarray(source_indices, dtype=np.int64),
+            np.asarray(target_indices, dtype=np.int64),
+            self.indptr,
+            self.indices,
+            cost_factor,
+            values,
+            no_path_found,
+        )
+
+    def all_shortest_paths_weighted_average(
+        self,
+        predecessors,
+        source_indices,
+        target_indices,
+        values,
+        weights=None,
+        no_path_found=-1,
+    ):
+        """Calculate the weighted average of a quantity along the shortest paths for multiple
+        source nodes as calculated by :meth:`terminal_shortest_paths`. See also
+        :meth:`all_shortest_paths_sum`
+
+        :param weights: (optional) the weight for every edge in the graph. By default, the cost
+            factor is used as weights
+        """
+        _, cost_factor = self._get_terminal_graph()
+        return self._reduce_rows(
+            _all_shortest_paths_weighted_average,
+            predecessors,
+            np.asarray(source_indices, dtype=np.int64),
+            np.asarray(target_indices, dtype=np.int64),
+            self.indptr,
+            self.indices,
+            cost_factor,
+            weights if weights is not None else cost_factor,
+            values,
+            no_path_found,
+        )
+
+    def _reduce_rows(self, kernel, predecessors, source_indices, *args):
+        """Run a reduction kernel over the rows of a 2d predecessors array. When using multiple
+        workers, the rows are divided over a number of threads. The kernels release the GIL, so
+        that they can run concurrently
+        """
+        chunk_count = min(self.workers, len(source_indices))
+        if chunk_count <= 1:
+            return kernel(predecessors, source_indices, *args)
+
+        with futures.ThreadPoolExecutor(max_workers=chunk_count) as executor:
+            results = executor.map(
+                lambda chunk: kernel(*chunk, *args),
+                zip(
+                    np.array_split(predecessors, chunk_count),
+                    np.array_split(source_indices, chunk_count),
+                ),
+            )
+            return np.concatenate(list(results))
+
     def shortest_path_sum(
         self, predecessors, source_idx, target_indices, values, no_path_found=-1
     ):
@@ -567,6 +936,145 @@ class Graph:
         return self.indices[self.indptr[source_index] : self.indptr[source_index + 1]]
 
 
+def _solve_shortest_paths(matrix: csr_matrix, indices: np.ndarray, node_count: int):
+    """Calculate the shortest paths in a graph with split terminal nodes for a number of source
+    nodes and only return the results for the first ``node_count`` (ie. the original) nodes. This
+    is a module level function so that it can be run in a worker process
+    """
+    dist, prev = shortest_path(matrix, directed=True, return_predecessors=True, indices=indices)
+    return (
+        np.ascontiguousarray(dist[:, :node_count]),
+        np.ascontiguousarray(prev[:, :node_count]),
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class _SharedArraySpec:
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+def _create_shared_array(shape: tuple[int, ...], dtype) -> tuple[SharedMemory, np.ndarray]:
+    dtype = np.dtype(dtype)
+    shm = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _attach_shared_array(spec: _SharedArraySpec) -> tuple[SharedMemory, np.ndarray]:
+    shm = SharedMemory(name=spec.name)
+    return shm, np.ndarray(spec.shape, dtype=spec.dtype, buffer=shm.buf)
+
+
+def _spec(shm: SharedMemory, arr: np.ndarray):
+    return _SharedArraySpec(shm.name, arr.shape, arr.dtype.str)
+
+
+class _ShortestPathPool:
+    """A pool of worker processes that calculate shortest paths in a (terminal) graph. The graph
+    is placed in shared memory and given to the workers once when they start. Before every
+    calculation only the edge data (cost factors) are updated in shared memory. The workers write
+    their results into shared output arrays, so that only source indices are sent to the workers.
+
+    The worker processes are spawned rather than forked, since the (model) process that creates
+    the pool may already run other threads (eg. for zmq or numba)
+    """
+
+    def __init__(self, matrix: csr_matrix, node_count: int, workers: int):
+        self.node_count = node_count
+        self.workers = workers
+        self._shared: list[SharedMemory] = []
+        specs = []
+        for arr in (matrix.indptr, matrix.indices, matrix.data):
+            shm, shared = _create_shared_array(arr.shape, arr.dtype)
+            shared[:] = arr
+            self._shared.append(shm)
+            specs.append(_spec(shm, shared))
+        # the edge data is the only part of the graph that changes between calculations
+        self._data = shared
+        self._executor = futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_shortest_path_worker,
+            initargs=(*specs, matrix.shape),
+        )
+
+    def solve(self, data: np.ndarray, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the shortest paths for the source ``indices`` with edge data ``data``. See
+        :func:`_solve_shortest_paths`
+        """
+        if len(data) != len(self._data):
+            raise ValueError("The structure of the graph has changed")
+        self._data[:] = data
+        shape = (len(indices), self.node_count)
+        dist_shm, dist = _create_shared_array(shape, np.float64)
+        prev_shm, prev = _create_shared_array(shape, np.int32)
+        try:
+            rows = np.array_split(np.arange(len(indices)), min(self.workers, len(indices)))
+            for future in [
+                self._executor.submit(
+                    _solve_shortest_paths_shared,
+                    indices[chunk],
+                    chunk[0] if len(chunk) else 0,
+                    self.node_count,
+                    _spec(dist_shm, dist),
+                    _spec(prev_shm, prev),
+                )
+                for chunk in rows
+            ]:
+                future.result()
+            return dist.copy(), prev.copy()
+        finally:
+            del dist, prev
+            for shm in (dist_shm, prev_shm):
+                shm.close()
+                shm.unlink()
+
+    def close(self):
+        self._executor.shutdown()
+        del self._data
+        for shm in self._shared:
+            shm.close()
+            shm.unlink()
+        self._shared.clear()
+
+
+# the shared memory and terminal graph of a shortest path worker process
+_worker_shared: list[SharedMemory] = []
+_worker_matrix: t.Optional[csr_matrix] = None
+
+
+def _init_shortest_path_worker(indptr_spec, indices_spec, data_spec, shape):
+    global _worker_matrix
+    arrays = []
+    for spec in (indptr_spec, indices_spec, data_spec):
+        shm, arr = _attach_shared_array(spec)
+        _worker_shared.append(shm)
+        arrays.append(arr)
+    indptr, indices, data = arrays
+    _worker_matrix = csr_matrix((data, indices, indptr), shape=shape)
+    # make sure the matrix uses the shared data, which is updated before every calculation
+    _worker_matrix.data = data
+
+
+def _solve_shortest_paths_shared(
+    indices: np.ndarray,
+    row_offset: int,
+    node_count: int,
+    dist_spec: _SharedArraySpec,
+    prev_spec: _SharedArraySpec,
+):
+    if not len(indices):
+        return
+    dist, prev = _solve_shortest_paths(_worker_matrix, indices, node_count)
+    rows = slice(row_offset, row_offset + len(indices))
+    for spec, result in ((dist_spec, dist), (prev_spec, prev)):
+        shm, out = _attach_shared_array(spec)
+        out[rows] = result
+        del out
+        shm.close()
+
+
 @njit(cache=True)
 def _build_graph(node_ids, from_node_id, to_node_id):
     """Build a Graph from the transport (and virtual) link from_node_id and to_node_id data.
@@ -598,6 +1106,121 @@ def _build_graph(node_ids, from_node_id, to_node_id):
     return indptr, indices, edge_indices
 
 
+@njit(cache=True)
+def _split_terminal_nodes(indptr, indices, cost_factor, terminal_indices, terminal_cost_factor):
+    """Create the csr data for a graph in which every terminal node is split into a sink node and a
+    source node. Sink nodes keep the index of the original terminal node and only have incoming
+    edges. Source nodes are appended after the original nodes (in the order of
+    ``terminal_indices``) and only have outgoing edges, with ``terminal_cost_factor`` as their
+    cost factor
+    """
+    node_count = len(indptr) - 1
+    is_terminal = np.zeros((node_count,), dtype=np.bool_)
+    is_terminal[terminal_indices] = True
+
+    new_indptr = np.empty((node_count + len(terminal_indices) + 1,), dtype=np.int64)
+    new_indices = np.empty_like(indices)
+    new_data = np.empty((len(indices),), dtype=np.float64)
+
+    new_indptr[0] = 0
+    for idx in range(node_count):
+        begin, end = indptr[idx], indptr[idx + 1]
+        if is_terminal[idx]:
+            end = begin
+        new_begin = new_indptr[idx]
+        new_end = new_begin + end - begin
+        new_indices[new_begin:new_end] = indices[begin:end]
+        new_data[new_begin:new_end] = cost_factor[begin:end]
+        new_indptr[idx + 1] = new_end
+
+    for pos, idx in enumerate(terminal_indices):
+        begin, end = indptr[idx], indptr[idx + 1]
+        new_begin = new_indptr[node_count + pos]
+        new_end = new_begin + end - begin
+        new_indices[new_begin:new_end] = indices[begin:end]
+        new_data[new_begin:new_end] = terminal_cost_factor
+        new_indptr[node_count + pos + 1] = new_end
+
+    return new_indptr, new_indices, new_data
+
+
+@njit(cache=True)
+def _is_tree_affected(dist, prev, edge_sources, edge_targets, cost_factor, is_terminal, edges):
+    """Check whether any of the ``edges`` is part of, or provides a path that is at least as short
+    as a path in a shortest path tree
+    """
+    for edge in edges:
+        source = edge_sources[edge]
+        target = edge_targets[edge]
+        if is_terminal[source]:
+            continue
+        if prev[target] == source:
+            return True
+        if dist[source] != np.inf and dist[source] + cost_factor[edge] <= dist[target]:
+            return True
+    return False
+
+
+@njit(cache=True, nogil=True)
+def _all_shortest_paths_weighted_average(
+    predecessors,
+    source_indices,
+    target_indices,
+    indptr,
+    indices,
+    cost_factor,
+    weights,
+    values,
+    no_path_found=-1,
+):
+    """calculate the weighted average of a quantity along the shortest path for every source
+    (row) in a 2d predecessors array
+    """
+    result = np.empty((len(source_indices), len(target_indices)), dtype=np.float64)
+    for row in range(len(source_indices)):
+        result[row] = _shortest_path_weighted_average(
+            predecessors[row],
+            source_indices[row],
+            target_indices,
+            indptr,
+            indices,
+            cost_factor,
+            weights,
+            values,
+            no_path_found,
+        )
+    return result
+
+
+@njit(cache=True, nogil=True)
+def _all_shortest_paths_sum(
+    predecessors,
+    source_indices,
+    target_indices,
+    indptr,
+    indices,
+    cost_factor,
+    values,
+    no_path_found=-1,
+):
+    """calculate the sum of a quantity along the shortest path for every source (row) in a 2d
+    predecessors array
+    """
+    result = np.empty((len(source_indices), len(target_indices)), dtype=np.float64)
+    for row in range(len(source_indices)):
+        result[row] = _shortest_path_sum(
+            predecessors[row],
+            source_indices[row],
+            target_indices,
+            indptr,
+            indices,
+            cost_factor,
+            values,
+            no_path_found,
+        )
+    return result
+
+
 @njit(cache=True)
 def _shortest_path_weighted_average(
     predecessors,
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import typing as t
+
+import numpy as np
+
+from movici_simulation_core.core.arrays import TrackedCSRArray, matrix_to_csr
+
+
+class ODMatrix:
+    """A square origin-destination matrix that is stored in a ``TrackedCSRArray`` where every
+    row has an entry for every destination. Rather than materializing (multiple) dense copies of
+    the matrix, multiplication factors are collected and applied in place by ``ODMatrix.apply``.
+    Factors can be a scalar (``ODMatrix.scale``), the outer product of two vectors
+    (``ODMatrix.scale_outer``) or a (smaller) square matrix that is mapped onto the OD matrix by
+    an index for every origin/destination (``ODMatrix.multiply``). These factors are applied
+    in blocks of rows at a time so that the memory overhead is limited to
+    ``ODMatrix.BLOCK_ELEMENTS``. Changes are tracked on the underlying ``TrackedCSRArray`` using
+    its ``rtol``, ``atol`` and ``equal_nan``
+    """
+
+    BLOCK_ELEMENTS = 2**20
+
+    def __init__(self, csr: TrackedCSRArray):
+        self.csr = csr
+        shape = csr.matrix_view().shape
+        if shape[0] != shape[1]:
+            raise ValueError("OD matrices must be square")
+        self.size = shape[0]
+        self.reset()
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray):
+        return cls(matrix_to_csr(np.asarray(matrix)))
+
+    @property
+    def shape(self):
+        return (self.size, self.size)
+
+    @property
+    def has_pending(self):
+        return (
+            self._scale != 1
+            or self._row_factors is not None
+            or self._column_factors is not None
+            or bool(self._factors)
+        )
+
+    def reset(self):
+        """Discard all pending factors"""
+        self._scale = 1
+        self._row_factors: t.Optional[np.ndarray] = None
+        self._column_factors: t.Optional[np.ndarray] = None
+        self._factors: t.List[t.Tuple[np.ndarray, t.Optional[np.ndarray]]] = []
+
+    def scale(self, factor: float):
+        """Multiply every OD pair by a scalar ``factor``"""
+        self._scale *= factor
+
+    def scale_outer(self, row_factors: np.ndarray, column_factors: t.Optional[np.ndarray] = None):
+        """Multiply every OD pair ``ij`` by ``row_factors[i] * column_factors[j]``. When
+        ``column_factors`` is not given, ``row_factors`` is used for both origin and destination
+        """
+        row_factors = self._validate_vector(row_factors)
+        column_factors = (
+            row_factors if column_factors is None else self._validate_vector(column_factors)
+        )
+        self._row_factors = (
+            row_factors if self._row_factors is None else self._row_factors * row_factors
+        )
+        self._column_factors = (
+            column_factors
+            if self._column_factors is None
+            else self._column_factors * column_factors
+        )
+
+    def multiply(self, factors: np.ndarray, indices: t.Optional[np.ndarray] = None):
+        """Multiply every OD pair ``ij`` by ``factors[indices[i], indices[j]]``. ``factors`` must
+        be a square matrix and ``indices`` must have an entry for every origin/destination. When
+        ``indices`` is not given, ``factors`` must have the same shape as the OD matrix
+        """
+        factors = np.asarray(factors)
+        if factors.ndim != 2 or factors.shape[0] != factors.shape[1]:
+            raise ValueError("factors must be a square matrix")
+        if indices is None:
+            if factors.shape != self.shape:
+                raise ValueError("factors must have the same shape as the OD matrix")
+        else:
+            indices = self._validate_vector(indices)
+        self._factors.append((factors, indices))
+
+    def apply(self):
+        """Apply all pending factors to the OD matrix and track which rows have changed"""
+        if not self.has_pending:
+            return
+        if not self.csr.data.flags.writeable:
+            self.csr.data = self.csr.data.copy()
+
+        matrix = self.csr.matrix_view()
+        block_size = max(1, self.BLOCK_ELEMENTS // max(self.size, 1))
+        for start in range(0, self.size, block_size):
+            stop = min(start + block_size, self.size)
+            block = matrix[start:stop]
+            new_block = self._calculate_block(block, start, stop)
+            changed = ~np.isclose(
+                block,
+                new_block,
+                rtol=self.csr.rtol,
+                atol=self.csr.atol,
+                equal_nan=self.csr.equal_nan,
+            )
+            self.csr.changed[start:stop] |= np.any(changed, axis=1)
+            block[...] = new_block
+        self.reset()
+
+    def _calculate_block(self, block: np.ndarray, start: int, stop: int):
+        rv = block * np.float64(self._scale)
+        if self._row_factors is not None:
+            rv *= self._row_factors[start:stop, np.newaxis]
+        if self._column_factors is not None:
+            rv *= self._column_factors
+        for factors, indices in self._factors:
+            if indices is None:
+                rv *= factors[start:stop]
+            else:
+                rv *= factors[np.ix_(indices[start:stop], indices)]
+        return rv
+
+    def row_sums(self):
+        """Total outward demand per origin"""
+        return np.sum(self.csr.matrix_view(), axis=1)
+
+    def column_sums(self):
+        """Total inward demand per destination"""
+        return np.sum(self.csr.matrix_view(), axis=0)
+
+    def as_matrix(self):
+        """Return a dense copy of the OD matrix, excluding any pending factors"""
+        return self.csr.matrix_view().copy()
+
+    def _validate_vector(self, arr):
+        arr = np.asarray(arr)
+        if arr.shape != (self.size,):
+            raise ValueError(f"Expected an array of length {self.size}")
+        return arr
@@ -113,7 +113,11 @@ class GJTModel(TrackedModel, name="generalized_journey_time"):
     def initialize(self, **_):
         self._network_entities["transport_links"].ensure_ready()
 
-        network = Network(**self._network_entities)
+        network = Network(
+            **self._network_entities,
+            workers=self.config.get("workers", 1),
+            cache_size=self.config.get("cache_size"),
+        )
         self._calculator = GJTCalculator(
             network=network,
             travel_time=self._travel_time,
@@ -127,6 +131,12 @@ class GJTModel(TrackedModel, name="generalized_journey_time"):
         self._calculator.update_travel_time()
         gjt = self._calculator.gjt()
         self._network_entities["virtual_nodes"].gjt.csr.update_from_matrix(gjt)
+        if self._logger is not None:
+            self._calculator.network.cache.log_statistics(self._logger)
+
+    def shutdown(self, **_):
+        if self._calculator is not None:
+            self._calculator.network.close()
 
     @staticmethod
     def get_schema_attributes() -> t.List[AttributeSpec]:
@@ -185,7 +195,7 @@ class GJTCalculator:
         crowdedness = self.crowdedness()
         travel_time = self.network.all_shortest_paths()
         f = 1.5
-        freq = self.frequency.csr.as_matrix()
+        freq = self.frequency.csr.matrix_view()
 
         no_trains = freq < 1e-20
         rv = crowdedness * travel_time + safe_divide(f, (2 * freq), fill_value=0)
@@ -194,7 +204,7 @@ class GJTCalculator:
 
     def crowdedness(self):
         avg_passenger_flow = self.average_passenger_flow()
-        capacity = self.frequency.csr.as_matrix() * self.train_capacity.array
+        capacity = self.frequency.csr.matrix_view() * self.train_capacity.array
 
         load_factor = safe_divide(avg_passenger_flow, capacity, fill_value=-1)
         return crowdedness(load_factor)
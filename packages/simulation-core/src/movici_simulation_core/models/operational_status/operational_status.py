@@ -15,7 +15,7 @@ from movici_simulation_core import (
     UniformAttribute,
 )
 from movici_simulation_core.core.arrays import TrackedCSRArray
-from movici_simulation_core.csr import row_wise_max
+from movici_simulation_core.csr import row_wise_max, select_kernel
 from movici_simulation_core.json_schemas import SCHEMA_PATH
 from movici_simulation_core.models.common.entity_groups import (
     GeometryEntity,
@@ -124,13 +124,13 @@ class FloodingStatusModule(StatusModule):
 
     def update(self):
         wh = self.water_height[self.mapping.indices]
-        max_wh = row_wise_max(
+        max_wh = select_kernel(row_wise_max, wh, self.mapping.row_ptr)(
             wh, self.mapping.row_ptr, empty_row=self.water_height.options.special or -9999
         )
         wd = np.maximum(max_wh - self.elevation, 0)
 
         if self.row_ptr is not None:
-            wd = row_wise_max(wd, self.row_ptr, empty_row=0)
+            wd = select_kernel(row_wise_max, wd, self.row_ptr)(wd, self.row_ptr, empty_row=0)
 
         self.water_depth[:] = wd
 
@@ -403,7 +403,7 @@ class Model(TrackedModel, name="rules"):
         for attr_name, attr in rule.source_attributes.items():
             if not attr.has_data():
                 return
-            attributes[attr_name] = attr.array[rule.from_entity_idx]
+            attributes[attr_name] = attr.values[rule.from_entity_idx]
 
         # Evaluate condition
         result = rule.condition.evaluate(
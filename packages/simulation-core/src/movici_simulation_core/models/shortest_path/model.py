@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import dataclasses
 import functools
+import logging
 import typing as t
 
 import numpy as np
@@ -53,8 +54,16 @@ class ShortestPathModel(TrackedModel, name="shortest_path"):
     network: t.Optional[Network] = None
     calculators: t.List[NetworkCalculator]
     no_update_shortest_path: bool = False
-
-    def setup(self, state: TrackedState, schema: AttributeSchema, **_):
+    logger: t.Optional[logging.Logger] = None
+
+    def setup(
+        self,
+        state: TrackedState,
+        schema: AttributeSchema,
+        logger: t.Optional[logging.Logger] = None,
+        **_,
+    ):
+        self.logger = logger
         dataset, segments = self.config["transport_segments"]
         self.entity_groups = Network.register_required_attributes(
             state=state, dataset_name=dataset, transport_segments_name=segments
@@ -100,7 +109,12 @@ class ShortestPathModel(TrackedModel, name="shortest_path"):
             )
 
     def initialize(self, **_):
-        self.network = Network(**self.entity_groups, cost_factor=self.cost_factor.array)
+        self.network = Network(
+            **self.entity_groups,
+            cost_factor=self.cost_factor.array,
+            workers=self.config.get("workers", 1),
+            cache_size=self.config.get("cache_size"),
+        )
         for calculator in self.calculators:
             calculator.initialize(self.network)
 
@@ -114,6 +128,13 @@ class ShortestPathModel(TrackedModel, name="shortest_path"):
         for calculator in self.calculators:
             calculator.update(weights)
 
+        if self.logger is not None:
+            self.network.cache.log_statistics(self.logger)
+
+    def shutdown(self, **_):
+        if self.network is not None:
+            self.network.close()
+
     def single_source_entity_resolver(
         self, entity_id: t.Optional[int], entity_ref: t.Optional[str]
     ):
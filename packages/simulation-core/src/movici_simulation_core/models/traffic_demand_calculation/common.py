@@ -13,6 +13,7 @@ from movici_simulation_core.core.moment import Moment
 from movici_simulation_core.core.schema import AttributeSchema
 from movici_simulation_core.core.state import TrackedState
 from movici_simulation_core.models.common.csv_tape import CsvTape
+from movici_simulation_core.models.common.od_matrix import ODMatrix
 from movici_simulation_core.settings import Settings
 
 
@@ -40,18 +41,19 @@ class DemandEstimation:
         for param in self.local_params:
             param.initialize(mapper)
 
-    def update(
-        self, matrix: np.ndarray, force_update: bool = False, *, moment: Moment
-    ) -> np.ndarray:
+    def update(self, matrix: ODMatrix, force_update: bool = False, *, moment: Moment):
+        """Collect the demand changes of all contributors on ``matrix``. The changes are only
+        applied to the demand after calling ``ODMatrix.apply``
+        """
         global_factor = 1
         for param in self.global_params:
             if param.has_changes():
                 global_factor = param.update_factor(global_factor, moment=moment)
 
         for param in self.local_params:
-            matrix = param.update_demand(matrix, force_update, moment=moment)
+            param.update_demand(matrix, force_update, moment=moment)
 
-        return global_factor * matrix
+        matrix.scale(global_factor)
 
     def close(self):
         for param in self.local_params:
@@ -94,7 +96,7 @@ class LocalContributor(Contributor):
     def has_changes(self):
         raise NotImplementedError
 
-    def update_demand(self, matrix: np.ndarray, force_update: bool = False, *, moment: Moment):
+    def update_demand(self, matrix: ODMatrix, force_update: bool = False, *, moment: Moment):
         raise NotImplementedError
 
     def close(self):
@@ -17,6 +17,7 @@ from movici_simulation_core.models.common.model_util import (
     try_get_geometry_type,
 )
 from movici_simulation_core.models.common.network import Network, NetworkEntities
+from movici_simulation_core.models.common.od_matrix import ODMatrix
 
 from .common import LocalContributor, LocalMapper
 
@@ -30,8 +31,35 @@ class LocalParameterInfo:
     elasticity: float
 
 
+def deduplicate_nodes(meth):
+    """When mapping a demand OD matrix onto a target network, such as the effect of travel time
+    on roads (target network) on the waterway demand (demand OD matrix). There may be duplicate
+    mapped road virtual nodes, since this is an N -> M mapping, where M <= N. As an
+    optimization, these duplicates can be detected by this decorator, and only the unique
+    indices are passed to the decorated method as the first positional argument after `self`.
+    The decorated method is expected to return a MxM matrix. Instead of expanding this matrix
+    back to NxN, the decorator stores the position of every demand node in the MxM matrix in
+    `self._factor_indices` so that the contribution can be applied using `ODMatrix.multiply`
+
+    This only works for methods in classes that inherit from `LocalEffectsContributor`
+
+    """
+
+    @functools.wraps(meth)
+    def wrapper(self: LocalEffectsContributor, *args, **kwargs):
+        if self._indices is None:
+            raise ValueError("indices not set")
+        unique_indices = np.unique(self._indices)
+        result = meth(self, unique_indices, *args, **kwargs)
+        self._factor_indices = find_y_in_x(unique_indices, self._indices)
+        return result
+
+    return wrapper
+
+
 class LocalEffectsContributor(LocalContributor):
     _indices: t.Optional[np.ndarray] = None
+    _factor_indices: t.Optional[np.ndarray] = None
     old_value: t.Optional[np.ndarray] = None
 
     def __init__(self, info: LocalParameterInfo):
@@ -39,19 +67,17 @@ class LocalEffectsContributor(LocalContributor):
         self._attribute = info.target_attribute
         self._elasticity = info.elasticity
 
-    def update_demand(self, matrix: np.ndarray, force_update: bool = False, **_) -> np.ndarray:
+    def update_demand(self, matrix: ODMatrix, force_update: bool = False, **_):
         if self.old_value is None:
             self.old_value = self.calculate_values()
-            return matrix
+            return
 
         if not self.has_changes() and not force_update:
-            return matrix
+            return
 
         new_values = self.calculate_values()
-
-        factor = self.calculate_contribution(new_values, self.old_value)
+        self.apply_contribution(matrix, new_values, self.old_value)
         self.old_value = new_values
-        return factor * matrix
 
     def has_changes(self) -> bool:
         return self._attribute.has_changes()
@@ -59,11 +85,18 @@ class LocalEffectsContributor(LocalContributor):
     def calculate_values(self):
         """Calculate parameter values P[] so that P_ij can be reconstructed, this can be a 1d-array
         which together with self._indices can reconstruct P_ij (See eg. `NearestValue`) or a
-        2d-array containing every P_ij (See `RouteCostFactor`). P_ij will then be used to calculate
-        the contribution (P_ij/P_ij_old)**elasticity to the demand change factor
+        2d-array containing every P_ij, either directly or through self._factor_indices (See
+        `RouteCostFactor`). P_ij will then be used to calculate the contribution
+        (P_ij/P_ij_old)**elasticity to the demand change factor
         """
         raise NotImplementedError
 
+    def apply_contribution(self, matrix: ODMatrix, new_values, old_values):
+        """Multiply the demand matrix by the contribution of this parameter"""
+        matrix.multiply(
+            self.calculate_contribution(new_values, old_values), indices=self._factor_indices
+        )
+
     def calculate_contribution(self, new_values, old_values):
         """Calculate the contribution (P_ij/P_ij_old)**elasticity to the demand change factor"""
         rv = safe_divide(new_values, old_values, fill_value=1)
@@ -105,37 +138,34 @@ class NearestValue(LocalEffectsContributor):
     def _caculate_values_uniform(self):
         return self._attribute.array.copy()
 
-    def _calculate_values_csr(self):
-        matrix = self._attribute.csr.as_matrix()
+    @deduplicate_nodes
+    def _calculate_values_csr(self, unique_indices):
+        matrix = self._attribute.csr.matrix_view()
         if matrix.shape[0] != matrix.shape[1]:
             raise ValueError(
                 "Only square CSR matrices are supported for nearest value calculation"
             )
-        return matrix[:, self._indices][self._indices, :]
+        return matrix[np.ix_(unique_indices, unique_indices)]
 
-    def calculate_contribution(self, new_values, old_values):
+    def apply_contribution(self, matrix: ODMatrix, new_values, old_values):
         if self._is_csr:
-            return super().calculate_contribution(new_values, old_values)
+            return super().apply_contribution(matrix, new_values, old_values)
 
-        return calculate_localized_contribution_1d(
-            new_values, old_values, self._indices, self._elasticity
+        # The contribution factor (P_i/P_i_old * P_j/P_j_old) ** elasticity is the outer product
+        # of the per node factors (P_i/P_i_old) ** elasticity
+        matrix.scale_outer(
+            calculate_localized_contribution_1d(
+                new_values, old_values, self._indices, self._elasticity
+            )
         )
 
 
 @numba.njit(cache=True)
 def calculate_localized_contribution_1d(values, old_values, indices, elasticity):
     size = len(indices)
-    rv = np.ones((size, size), np.float64)
+    rv = np.ones((size,), np.float64)
     for i in range(size):
-        for j in range(size):
-            # symmetry: factor for ij == ji so we only need to iterate through half of the ij_pairs
-            # and fill up both ij and ji at the same time
-            if i < j:
-                continue
-            ratio_i = get_ratio_for_node(i, values, old_values, indices)
-            ratio_j = get_ratio_for_node(j, values, old_values, indices)
-            factor = (ratio_i * ratio_j) ** elasticity
-            rv[i][j] = rv[j][i] = factor
+        rv[i] = get_ratio_for_node(i, values, old_values, indices) ** elasticity
     return rv
 
 
@@ -172,31 +202,6 @@ class ShortestPathMixin:
 
         self._network = Network(**self._network_entities)
 
-    @staticmethod
-    def deduplicate_nodes(meth):
-        """When mapping a demand OD matrix onto a target network, such as the effect of travel time
-        on roads (target network) on the waterway demand (demand OD matrix). There may be duplicate
-        mapped road virtual nodes, since this is an N -> M mapping, where M <= N. As an
-        optimization, these duplicates can be detected by this decorator, and only the unique
-        indices are passed to the decorated method as the first positional argument after `self`.
-        The decorated method is expected to return a MxM matrix and this decorator expands it back
-        to NxN
-
-        This only works for methods in classes that inherit from `LocalEffectsContributor`
-
-        """
-
-        @functools.wraps(meth)
-        def wrapper(self: LocalEffectsContributor, *args, **kwargs):
-            if self._indices is None:
-                raise ValueError("indices not set")
-            unique_indices = np.unique(self._indices)
-            result = meth(self, unique_indices, *args, **kwargs)
-            orig_idx = find_y_in_x(unique_indices, self._indices)
-            return result[:, orig_idx][orig_idx, :]
-
-        return wrapper
-
 
 class RouteCostFactor(LocalEffectsContributor, ShortestPathMixin):
     """
@@ -229,12 +234,12 @@ class RouteCostFactor(LocalEffectsContributor, ShortestPathMixin):
         self._network.update_cost_factor(self._attribute.array)
         return self._get_local_route_cost()
 
-    @ShortestPathMixin.deduplicate_nodes
+    @deduplicate_nodes
     def _get_local_route_cost(self, unique_indices) -> np.ndarray:
         """
         For N _demand_nodes, these have N nearest, with possible duplicates
         We get M unique nearest, calculate MxM routes from all to all
-        Then we sample that back to N nearest
+        which are mapped back to the N nearest through self._factor_indices
         """
         ids = self._demand_nodes.index.ids
 
@@ -256,12 +261,13 @@ class InvestmentContributor(LocalContributor):
         self.index = demand_node_index
         self.investments: t.List[Investment] = list(reversed(investments))
 
-    def update_demand(self, matrix: np.ndarray, force_update: bool = False, *, moment: Moment):
+    def update_demand(self, matrix: ODMatrix, force_update: bool = False, *, moment: Moment):
         while self.investments and self.investments[-1].seconds <= moment.seconds:
             investment = self.investments.pop()
-            idx = self.index[[investment.entity_id]]
-            affected_entries = np.zeros_like(matrix, dtype=bool)
-            affected_entries[idx] = 1
-            affected_entries[:, idx] = 1
-            matrix[affected_entries] *= investment.multiplier
-        return matrix
+
+            # every OD pair that has the investment node as its origin and/or destination is
+            # multiplied exactly once
+            indices = np.zeros(matrix.size, dtype=int)
+            indices[self.index[[investment.entity_id]]] = 1
+            multiplier = investment.multiplier
+            matrix.multiply(np.array([[1, multiplier], [multiplier, multiplier]]), indices)
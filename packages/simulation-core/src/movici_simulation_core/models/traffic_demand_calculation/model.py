@@ -1,7 +1,6 @@
 import logging
 import typing as t
 
-import numpy as np
 import pandas as pd
 
 from movici_simulation_core.base_models.tracked_model import TrackedModel
@@ -20,6 +19,7 @@ from movici_simulation_core.json_schemas import SCHEMA_PATH
 from movici_simulation_core.model_connector.init_data import FileType, InitDataHandler
 from movici_simulation_core.models.common.csv_tape import CsvTape
 from movici_simulation_core.models.common.entity_groups import GeometryEntity, PointEntity
+from movici_simulation_core.models.common.od_matrix import ODMatrix
 from movici_simulation_core.models.traffic_demand_calculation.common import (
     DemandEstimation,
     GlobalContributor,
@@ -270,8 +270,7 @@ class TrafficDemandCalculation(TrackedModel, name="traffic_demand_calculation"):
         mapper = LocalMapper(demand_geometry)
         self.demand_estimation.initialize(mapper)
 
-        demand_matrix = self._demand_attribute.csr.as_matrix()
-        self._update_demand_sum(demand_matrix)
+        self._update_demand_sum(ODMatrix(self._demand_attribute.csr))
 
     def update(self, state: TrackedState, moment: Moment) -> t.Optional[Moment]:
         if self.update_count >= self.max_iterations:
@@ -279,10 +278,8 @@ class TrafficDemandCalculation(TrackedModel, name="traffic_demand_calculation"):
 
         self.proceed_tape(moment)
 
-        demand_matrix = self._demand_attribute.csr.as_matrix()
-        updated = self.demand_estimation.update(
-            demand_matrix, self.update_count == 0, moment=moment
-        )
+        demand_matrix = ODMatrix(self._demand_attribute.csr)
+        self.demand_estimation.update(demand_matrix, self.update_count == 0, moment=moment)
 
         # Reset SUBSCRIBE before we publish results, so that if we don't have any changes
         # the demand_attribute is reset and no changes are published, but if we do have changes
@@ -290,8 +287,8 @@ class TrafficDemandCalculation(TrackedModel, name="traffic_demand_calculation"):
         # TrackedModelAdapter
         state.reset_tracked_changes(SUBSCRIBE)
 
-        self._demand_attribute.csr.update_from_matrix(updated)
-        self._update_demand_sum(updated)
+        demand_matrix.apply()
+        self._update_demand_sum(demand_matrix)
 
         self.update_count += 1
 
@@ -309,12 +306,12 @@ class TrafficDemandCalculation(TrackedModel, name="traffic_demand_calculation"):
     def new_time(self, state: TrackedState, moment: Moment):
         self.update_count = 0
 
-    def _update_demand_sum(self, demand_matrix: np.ndarray):
+    def _update_demand_sum(self, demand_matrix: ODMatrix):
         if self._total_outward_demand_attribute is not None:
-            self._total_outward_demand_attribute[:] = np.sum(demand_matrix, axis=1)
+            self._total_outward_demand_attribute[:] = demand_matrix.row_sums()
 
         if self._total_inward_demand_attribute is not None:
-            self._total_inward_demand_attribute[:] = np.sum(demand_matrix, axis=0)
+            self._total_inward_demand_attribute[:] = demand_matrix.column_sums()
 
     def shutdown(self, state: TrackedState) -> None:
         self.demand_estimation.close()
@@ -6,7 +6,13 @@ from movici_simulation_core.core.arrays import TrackedCSRArray
 from movici_simulation_core.core.data_format import is_undefined_csr, is_undefined_uniform
 from movici_simulation_core.core.data_type import NP_TYPES
 from movici_simulation_core.core.schema import infer_data_type_from_array
-from movici_simulation_core.csr import csr_binop, row_wise_max, row_wise_min, row_wise_sum
+from movici_simulation_core.csr import (
+    csr_binop,
+    row_wise_max,
+    row_wise_min,
+    row_wise_sum,
+    select_kernel,
+)
 
 functions = {}
 
@@ -22,7 +28,7 @@ def func(name: str):
 @func("sum")
 def sum_func(arr):
     if isinstance(arr, TrackedCSRArray):
-        return row_wise_sum(arr.data, arr.row_ptr)
+        return select_kernel(row_wise_sum, arr.data, arr.row_ptr)(arr.data, arr.row_ptr)
     if isinstance(arr, np.ndarray):
         return np.sum(arr, axis=tuple(range(1, arr.ndim)))
     return np.sum(arr)
@@ -81,6 +87,7 @@ def _extreme_func(arrays_or_values, row_wise_csr, row_wise_uniform, reduce_func)
     if len(arrays_or_values) == 1:
         if isinstance(item, TrackedCSRArray):
             data_type = infer_data_type_from_array(item.data)
+            row_wise_csr = select_kernel(row_wise_csr, item.data, item.row_ptr)
             return row_wise_csr(item.data, item.row_ptr, empty_row=data_type.undefined)
         elif isinstance(item, np.ndarray):
             return row_wise_uniform(item, axis=tuple(range(1, item.ndim)))
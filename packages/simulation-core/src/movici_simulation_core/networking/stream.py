@@ -44,14 +44,32 @@ def get_message_socket(socket_type: int, ident: t.Optional[bytes] = None) -> Mes
 
 
 class MessageSocket(BaseSocket[T]):
+    """Sends and receives ``Message`` objects as multipart messages. Frames that are larger than
+    ``copy_threshold`` bytes, such as raw array data, are sent and received without copying them
+    """
+
+    copy_threshold = zmq.COPY_THRESHOLD
+
     def send(self, payload: T):
         """serialize identifier and message into MultipartMessage"""
-        return self.socket.send_multipart(self._serialize(payload))
+        frames = self._serialize(payload)
+        if any(memoryview(frame).nbytes >= self.copy_threshold for frame in frames):
+            return self.socket.send_multipart(frames, copy=False)
+        return self.socket.send_multipart(frames)
 
     def recv(self) -> T:
-        payload = self.socket.recv_multipart()
+        payload = [
+            self._frame_to_buffer(frame) for frame in self.socket.recv_multipart(copy=False)
+        ]
         return self._deserialize(payload)
 
+    def _frame_to_buffer(self, frame: t.Union[zmq.Frame, bytes]):
+        if isinstance(frame, bytes):
+            return frame
+        if len(frame) < self.copy_threshold:
+            return frame.bytes
+        return frame.buffer
+
     @staticmethod
     def parse_bytes(payload):
         try:
@@ -1,3 +1,4 @@
 from .service import Orchestrator
+from .telemetry import Telemetry, UpdateRecord
 
-__all__ = ["Orchestrator"]
+__all__ = ["Orchestrator", "Telemetry", "UpdateRecord"]
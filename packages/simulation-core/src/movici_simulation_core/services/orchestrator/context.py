@@ -6,6 +6,7 @@ from abc import ABC
 from dataclasses import dataclass, field
 from functools import singledispatchmethod
 from itertools import product
+from pathlib import Path
 
 from movici_simulation_core.exceptions import InvalidCommand
 from movici_simulation_core.messages import (
@@ -23,7 +24,9 @@ from movici_simulation_core.utils.data_mask import masks_overlap
 
 from .fsm import FSM, Always, Condition, FSMConfig, State
 from .interconnectivity import Publisher, format_matrix
+from .scheduling import critical_path_lengths
 from .stopwatch import ReportingStopwatch, Stopwatch
+from .telemetry import Telemetry, UpdateRecord
 
 
 @dataclass
@@ -34,6 +37,8 @@ class Context:
     phase_timer: Stopwatch = field(default=None)
     logger: logging.Logger = field(default_factory=logging.getLogger)
     orchestrator_failed: bool = False
+    telemetry: Telemetry = field(default_factory=Telemetry)
+    telemetry_file: Path | None = None
 
     def __post_init__(self):
         self.global_timer = self.global_timer or ReportingStopwatch(
@@ -64,7 +69,8 @@ class Context:
             self.timeline.current_time = next_time
             self.recv_for_all(NewTimeMessage(next_time))
 
-        for model in self.models.values():
+        self.models.update_priorities()
+        for model in self.models.by_priority():
             if model.next_time == next_time:
                 self.recv_message(model, UpdateMessage(timestamp=next_time))
 
@@ -100,8 +106,19 @@ class Context:
         self.phase_timer.reset()
         self.global_timer.reset()
         self.models.reset_model_timers()
+        self.export_telemetry()
         self.log_finalize_message()
 
+    def export_telemetry(self):
+        if self.telemetry_file is None:
+            return
+        try:
+            self.telemetry.export(self.telemetry_file)
+        except Exception:
+            self.logger.exception(f"Could not export telemetry to {self.telemetry_file}")
+        else:
+            self.logger.info(f"Telemetry written to {self.telemetry_file}")
+
     def log_finalize_message(self):
         if len(self.failed) == 0:
             self.logger.info("Simulation successfully finished")
@@ -165,6 +182,9 @@ class ConnectedModel:
     publishes_to: list[ConnectedModel] = field(default_factory=list)
     subscribed_to: list[ConnectedModel] = field(default_factory=list)
     timer: Stopwatch = field(init=False)
+    #: Measures the time that pending updates wait for the model's dependencies to finish
+    wait_timer: Stopwatch = field(init=False)
+    telemetry: Telemetry | None = None
     pub: dict | None = field(default_factory=dict)
     sub: dict | None = field(default_factory=dict)
 
@@ -172,6 +192,12 @@ class ConnectedModel:
     next_time: int | None = field(default=None, init=False)
     failed: bool = field(default=False, init=False)
 
+    #: The mean duration of the model's updates and the number of updates it was calculated from
+    mean_update_time: float = field(default=0.0, init=False)
+    update_count: int = field(default=0, init=False)
+    #: Models with a higher priority are sent their commands first
+    priority: float = field(default=0.0, init=False)
+
     pending_new_time: NewTimeMessage | None = field(default=None, init=False)
     pending_updates: list[UpdateMessage] = field(default_factory=list, init=False)
     pending_quit: QuitMessage | None = field(default=None, init=False)
@@ -188,6 +214,7 @@ class ConnectedModel:
                 f"Total time spent in in model '{self.name}': {s:.1f} seconds "
             ),
         )
+        self.wait_timer = Stopwatch()
         self.fsm = FSM(self.fsm_config or MODEL_FSM_CONFIG, self, raise_on_done=False)
 
     def start(self):
@@ -200,6 +227,27 @@ class ConnectedModel:
         """Send a command message to the model"""
         self.send(message)
 
+    def record_update_time(self, seconds: float):
+        self.update_count += 1
+        self.mean_update_time += (seconds - self.mean_update_time) / self.update_count
+
+    def record_telemetry(self, msg: ResultMessage):
+        wait_time = self.wait_timer.reset()
+        if self.telemetry is None:
+            return
+        metrics = msg.metrics or {}
+        self.telemetry.record(
+            UpdateRecord(
+                model=self.name,
+                timestamp=self.timeline.current_time,
+                latency=self.timer.elapsed,
+                wait_time=wait_time,
+                bytes_in=metrics.get("bytes_in", 0),
+                bytes_out=metrics.get("bytes_out", 0),
+                serialization_time=metrics.get("serialization_time", 0.0),
+            )
+        )
+
     def log_invalid(self, message, valid_messages: t.Iterable[t.Type[Message]]):
         self.logger.error(
             f"Received invalid message {message} from model '{self.name}'. Expected one of "
@@ -288,6 +336,8 @@ class WaitingForMessage(BaseModelState):
     def _(self, msg: ResultMessage) -> None:
         """When a result comes set the model's next_time and notify subscribers that this model
         has returned, with possible data"""
+        self.context.record_update_time(self.context.timer.elapsed)
+        self.context.record_telemetry(msg)
         self.context.timeline.set_next_time(self.context, msg.next_time)
         command = NoUpdateMessage()
         if msg.has_data:
@@ -296,6 +346,7 @@ class WaitingForMessage(BaseModelState):
                 key=msg.key,
                 address=msg.address,
                 origin=msg.origin,
+                fetch_count=len(self.context.publishes_to),
             )
         self.notify_subscribers(command)
 
@@ -315,7 +366,7 @@ class WaitingForMessage(BaseModelState):
 
     def notify_subscribers(self, command: UpdateMessage | NoUpdateMessage):
         """Notify subscribers that this ConnectedModel's model has returned."""
-        for model in self.context.publishes_to:
+        for model in sorted(self.context.publishes_to, key=lambda m: -m.priority):
             # This method may technically raise InvalidCommand if any of the subscribed models
             # does not accept an UpdateMessage or NoUpdateMessage, but the (default)
             # ``ConnectedModel.fsm_config`` ensures that this cannot happen. In case of a custom
@@ -389,6 +440,10 @@ class PendingMoreUpdates(Idle):
     valid_commands = (NoUpdateMessage, UpdateMessage, QuitMessage)
     valid_responses = ()
 
+    def on_enter(self):
+        if not self.context.wait_timer.running:
+            self.context.wait_timer.start()
+
 
 class ProcessPendingUpdates(BaseModelState):
     """While the model was Busy, one or more updates came in which needs to be processed, this
@@ -409,6 +464,8 @@ class ProcessPendingUpdates(BaseModelState):
         self.process_pending_updates()
 
     def process_pending_updates(self):
+        if self.context.wait_timer.running:
+            self.context.wait_timer.stop()
         updates = self.context.pending_updates
         msg = updates[0] if len(updates) == 1 else UpdateSeriesMessage(updates)
 
@@ -472,6 +529,20 @@ class ModelCollection(dict[bytes, ConnectedModel]):
                 publisher.publishes_to.append(subscriber)
                 subscriber.subscribed_to.append(publisher)
 
+    def update_priorities(self):
+        """Prioritize models by the length of their critical path (see ``critical_path_lengths``)
+        using their historical update times
+        """
+        lengths = critical_path_lengths(self.values())
+        for model in self.values():
+            model.priority = lengths[model.name]
+
+    def by_priority(self) -> list[ConnectedModel]:
+        """Return the models in order of descending priority. Models with equal priority remain
+        in their original order
+        """
+        return sorted(self.values(), key=lambda m: -m.priority)
+
     def reset_model_timers(self):
         for model in self.values():
             model.timer.reset()
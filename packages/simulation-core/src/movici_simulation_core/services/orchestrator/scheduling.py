@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import typing as t
+
+
+class Schedulable(t.Protocol):
+    name: str
+    mean_update_time: float
+    publishes_to: t.List[Schedulable]
+
+
+def critical_path_lengths(models: t.Iterable[Schedulable]) -> t.Dict[str, float]:
+    """Calculate, for every model, the length (in seconds) of the longest chain of updates that
+    follows from updating that model: the model's own (mean) update time plus the longest critical
+    path length of its subscribers. Models with a longer critical path length should be updated
+    first, since the models that depend on them can only start once they have finished.
+
+    Models may (indirectly) subscribe to each other. Such cycles are broken by ignoring a
+    subscriber that is already part of the chain that is being calculated. The result is
+    therefore an approximation for cyclic model graphs
+    """
+    lengths: t.Dict[str, float] = {}
+
+    def visit(model: Schedulable, chain: t.Set[str]) -> float:
+        if model.name in lengths:
+            return lengths[model.name]
+        chain.add(model.name)
+        downstream = max(
+            (visit(sub, chain) for sub in model.publishes_to if sub.name not in chain),
+            default=0.0,
+        )
+        chain.discard(model.name)
+        lengths[model.name] = model.mean_update_time + downstream
+        return lengths[model.name]
+
+    for model in models:
+        visit(model, set())
+    return lengths
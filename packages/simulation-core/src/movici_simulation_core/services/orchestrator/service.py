@@ -23,6 +23,7 @@ from .states import (
     StartRunningPhase,
     WaitForResults,
 )
+from .telemetry import Telemetry
 
 FSM_CONFIG = FSMConfig(
     initial_state=StartInitializingPhase,
@@ -63,6 +64,7 @@ class Orchestrator(Service):
     settings: Settings
     fsm: FSM[Context, ModelMessage]
     timeline: TimelineController
+    telemetry: Telemetry
     logger: logging.Logger
     context: Context
     stream: BaseStream
@@ -72,6 +74,7 @@ class Orchestrator(Service):
         self.logger = logger
         self.stream = stream
         self._setup_timeline()
+        self.telemetry = Telemetry()
         self._setup_context()
         self._setup_fsm()
 
@@ -89,8 +92,17 @@ class Orchestrator(Service):
             ),
             timeline=self.timeline,
             logger=self.logger,
+            telemetry=self.telemetry,
+            telemetry_file=self._get_telemetry_file(),
         )
 
+    def _get_telemetry_file(self):
+        """Relative telemetry files are placed next to the results in the ``storage_dir``"""
+        path = self.settings.telemetry_file
+        if path is None or path.is_absolute() or self.settings.storage_dir is None:
+            return path
+        return self.settings.storage_dir / path
+
     def _setup_fsm(self):
         self.fsm = FSM(FSM_CONFIG, context=self.context)
         self.stream.set_handler(self.fsm.handle_event)
@@ -101,6 +113,7 @@ class Orchestrator(Service):
             timeline=self.timeline,
             send=self.make_send(identifier),
             logger=self.logger,
+            telemetry=self.telemetry,
             fsm_config=MODEL_FSM_CONFIG,
         )
         model.start()
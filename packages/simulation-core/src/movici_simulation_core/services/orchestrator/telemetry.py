@@ -0,0 +1,210 @@
+"""Structured timing and throughput telemetry of model updates. The orchestrator records an
+``UpdateRecord`` for every update that a model performs. The records can be exported to a
+``.csv``, ``.jsonl`` or ``.sqlite`` (``.db``) file and loaded again to be queried, eg:
+
+.. code-block:: python
+
+    telemetry = Telemetry.load("telemetry.csv")
+    telemetry.bottleneck()  # the model that spent the most time updating
+    telemetry.query(model="traffic_assignment", start=3600)
+
+"""
+
+from __future__ import annotations
+
+import csv
+import dataclasses
+import json
+import sqlite3
+import typing as t
+from pathlib import Path
+
+
+@dataclasses.dataclass
+class UpdateRecord:
+    """Telemetry of a single update of a single model
+
+    :param model: the name of the model
+    :param timestamp: the simulation timestamp of the update
+    :param latency: the time (in seconds) between sending the update to the model and receiving
+        its result
+    :param wait_time: the time (in seconds) that the update was pending because the model was
+        waiting for one or more of its dependencies to finish
+    :param bytes_in: the size (in bytes) of the update data that the model received
+    :param bytes_out: the size (in bytes) of the update data that the model produced
+    :param serialization_time: the time (in seconds) that the model spent (de)serializing update
+        data
+    """
+
+    model: str
+    timestamp: int
+    latency: float = 0.0
+    wait_time: float = 0.0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    serialization_time: float = 0.0
+
+    @classmethod
+    def fields(cls) -> t.List[str]:
+        return [f.name for f in dataclasses.fields(cls)]
+
+    @classmethod
+    def from_dict(cls, dict_: dict):
+        return cls(**{f.name: f.type_cast(dict_[f.name]) for f in _FIELDS if f.name in dict_})
+
+
+@dataclasses.dataclass
+class _Field:
+    name: str
+    type_cast: t.Callable[[t.Any], t.Any]
+    sql_type: str
+
+
+_FIELDS = [
+    _Field("model", str, "TEXT"),
+    _Field("timestamp", int, "INTEGER"),
+    _Field("latency", float, "REAL"),
+    _Field("wait_time", float, "REAL"),
+    _Field("bytes_in", int, "INTEGER"),
+    _Field("bytes_out", int, "INTEGER"),
+    _Field("serialization_time", float, "REAL"),
+]
+
+SUMMED_FIELDS = ("latency", "wait_time", "bytes_in", "bytes_out", "serialization_time")
+
+
+class Telemetry:
+    """A collection of ``UpdateRecord``-s that can be queried and exported"""
+
+    def __init__(self, records: t.Optional[t.Iterable[UpdateRecord]] = None):
+        self.records: t.List[UpdateRecord] = list(records or [])
+
+    def record(self, record: UpdateRecord):
+        self.records.append(record)
+
+    def query(
+        self,
+        model: t.Optional[str] = None,
+        timestamp: t.Optional[int] = None,
+        start: t.Optional[int] = None,
+        end: t.Optional[int] = None,
+    ) -> t.List[UpdateRecord]:
+        """Return the records of a ``model`` and/or at a ``timestamp`` or between ``start`` and
+        ``end`` (inclusive)
+        """
+        return [
+            rec
+            for rec in self.records
+            if (model is None or rec.model == model)
+            and (timestamp is None or rec.timestamp == timestamp)
+            and (start is None or rec.timestamp >= start)
+            and (end is None or rec.timestamp <= end)
+        ]
+
+    def models(self) -> t.List[str]:
+        return list(dict.fromkeys(rec.model for rec in self.records))
+
+    def summary(self) -> t.Dict[str, dict]:
+        """Return per model the number of updates (``count``) and the totals of the
+        ``SUMMED_FIELDS``
+        """
+        rv = {model: dict(count=0, **{f: 0 for f in SUMMED_FIELDS}) for model in self.models()}
+        for rec in self.records:
+            totals = rv[rec.model]
+            totals["count"] += 1
+            for f in SUMMED_FIELDS:
+                totals[f] += getattr(rec, f)
+        return rv
+
+    def bottleneck(self, key: str = "latency") -> t.Optional[str]:
+        """Return the name of the model with the highest total ``key``, one of the
+        ``SUMMED_FIELDS``
+        """
+        if key not in SUMMED_FIELDS:
+            raise ValueError(f"key must be one of {SUMMED_FIELDS}")
+        summary = self.summary()
+        if not summary:
+            return None
+        return max(summary, key=lambda model: summary[model][key])
+
+    def export(self, path: t.Union[str, Path]):
+        """Write the records to ``path``. The file format is determined by the file extension"""
+        path = Path(path)
+        get_format(path).write(path, self.records)
+
+    @classmethod
+    def load(cls, path: t.Union[str, Path]) -> Telemetry:
+        path = Path(path)
+        return cls(get_format(path).read(path))
+
+
+class TelemetryFormat:
+    def write(self, path: Path, records: t.Sequence[UpdateRecord]):
+        raise NotImplementedError
+
+    def read(self, path: Path) -> t.List[UpdateRecord]:
+        raise NotImplementedError
+
+
+class CSVFormat(TelemetryFormat):
+    def write(self, path: Path, records: t.Sequence[UpdateRecord]):
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=UpdateRecord.fields())
+            writer.writeheader()
+            writer.writerows(dataclasses.asdict(rec) for rec in records)
+
+    def read(self, path: Path) -> t.List[UpdateRecord]:
+        with open(path, newline="") as file:
+            return [UpdateRecord.from_dict(row) for row in csv.DictReader(file)]
+
+
+class JSONLinesFormat(TelemetryFormat):
+    def write(self, path: Path, records: t.Sequence[UpdateRecord]):
+        with open(path, "w") as file:
+            file.writelines(json.dumps(dataclasses.asdict(rec)) + "\n" for rec in records)
+
+    def read(self, path: Path) -> t.List[UpdateRecord]:
+        with open(path) as file:
+            return [UpdateRecord.from_dict(json.loads(line)) for line in file if line.strip()]
+
+
+class SQLiteFormat(TelemetryFormat):
+    table = "update_telemetry"
+
+    def write(self, path: Path, records: t.Sequence[UpdateRecord]):
+        columns = ", ".join(f"{f.name} {f.sql_type}" for f in _FIELDS)
+        placeholders = ", ".join("?" for _ in _FIELDS)
+        with sqlite3.connect(path) as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {self.table}")
+            conn.execute(f"CREATE TABLE {self.table} ({columns})")
+            conn.executemany(
+                f"INSERT INTO {self.table} VALUES ({placeholders})",  # noqa: S608
+                (dataclasses.astuple(rec) for rec in records),
+            )
+        conn.close()
+
+    def read(self, path: Path) -> t.List[UpdateRecord]:
+        with sqlite3.connect(path) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(UpdateRecord.fields())} FROM {self.table}"  # noqa: S608
+            ).fetchall()
+        conn.close()
+        return [UpdateRecord(*row) for row in rows]
+
+
+FORMATS: t.Dict[str, TelemetryFormat] = {
+    ".csv": CSVFormat(),
+    ".jsonl": JSONLinesFormat(),
+    ".sqlite": SQLiteFormat(),
+    ".db": SQLiteFormat(),
+}
+
+
+def get_format(path: Path) -> TelemetryFormat:
+    try:
+        return FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported telemetry file '{path.name}', extension must be one of "
+            + ", ".join(FORMATS)
+        ) from None
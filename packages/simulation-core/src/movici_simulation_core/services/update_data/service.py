@@ -1,8 +1,11 @@
+import contextlib
 import logging
+import os
 import typing as t
 from functools import singledispatchmethod
 
 from movici_simulation_core.core import Extensible
+from movici_simulation_core.core.serialization import estimate_frames_nbytes, get_shared_files
 from movici_simulation_core.core.types import Service
 from movici_simulation_core.messages import (
     AcknowledgeMessage,
@@ -14,25 +17,56 @@ from movici_simulation_core.messages import (
     PutDataMessage,
 )
 from movici_simulation_core.networking.stream import BaseStream, MessageRouterSocket
+from movici_simulation_core.settings import Settings
 from movici_simulation_core.types import InternalSerializationStrategy
 from movici_simulation_core.utils import strategies
-from movici_simulation_core.utils.data_mask import filter_data, validate_mask
+from movici_simulation_core.utils.data_mask import canonical_mask, filter_data, validate_mask
+
+from .store import UpdateDataStore
 
 
 class UpdateDataService(Service):
+    """Stores update data from models and serves (filtered) update data to the models that
+    subscribe to it. Data is stored as it is decoded (without copying) from the incoming message.
+    Since multiple subscribers often request data using the same mask, the serialized responses
+    are cached per key and (canonical) mask until the key is cleared.
+
+    The amount of data held in memory can be limited using the ``update_store_memory_limit``
+    setting, in which case the least recently used data is spilled to disk (see
+    ``UpdateDataStore``). Cached responses count towards this limit and are dropped when their
+    data is spilled. Responses that do not fit are not cached. When a ``GetDataMessage`` has a
+    ``fetch_count``, data is removed from the store as soon as it has been fetched that many
+    times, rather than when it is cleared
+    """
+
     stream: BaseStream[ModelMessage]
     socket: MessageRouterSocket
     logger: logging.Logger
 
     def __init__(self):
-        self.store: t.Dict[str, dict] = {}
         self.serialization = strategies.get_instance(InternalSerializationStrategy)
+        self.cache: t.Dict[str, t.Dict[t.Hashable, t.List[t.Any]]] = {}
+        self.store = UpdateDataStore(
+            self.serialization, on_spill=lambda key: self.cache.pop(key, None)
+        )
+        self.fetches: t.Dict[str, int] = {}
+        self.shared_files: t.Dict[str, t.Set[str]] = {}
 
     @classmethod
     def install(cls, obj: Extensible):
         obj.register_service("update_data", cls, auto_use=True)
 
-    def setup(self, *, stream: BaseStream, logger: logging.Logger, **_):
+    def setup(
+        self,
+        *,
+        stream: BaseStream,
+        logger: logging.Logger,
+        settings: t.Optional[Settings] = None,
+        **_,
+    ):
+        if settings is not None:
+            self.store.memory_limit = settings.update_store_memory_limit
+            self.store.spill_dir = settings.temp_dir
         self.stream = stream
         self.stream.set_handler(self.handle_request)
         self.logger = logger
@@ -61,24 +95,53 @@ class UpdateDataService(Service):
             return ErrorMessage("Invalid mask")
         if msg.key not in self.store:
             return ErrorMessage("Key not found")
-        filtered = filter_data(self.store[msg.key], msg.mask)
-        raw_data = self.serialization.dumps(filtered)
-        return DataMessage(raw_data)
+        # accessing the data also marks it as recently used when the response is cached
+        data = self.store[msg.key]
+        mask_key = canonical_mask(msg.mask)
+        if (frames := self.cache.get(msg.key, {}).get(mask_key)) is None:
+            frames = self.serialization.dumps_multipart(filter_data(data, msg.mask))
+            if self.store.reserve(msg.key, estimate_frames_nbytes(frames, data)):
+                self.cache.setdefault(msg.key, {})[mask_key] = frames
+
+        if msg.fetch_count is not None:
+            self.fetches[msg.key] = fetches = self.fetches.get(msg.key, 0) + 1
+            if fetches >= msg.fetch_count:
+                self._evict(msg.key)
+        return DataMessage(frames)
 
     @handle_message.register
     def put(self, msg: PutDataMessage):
         try:
-            data = self.serialization.loads(msg.data)
+            # Data in the store is never modified so it can share memory with the message
+            data = self.serialization.loads_multipart(msg.frames, copy=False)
             if not isinstance(data, dict):
                 raise ValueError()
         except ValueError:
             return ErrorMessage("Invalid data")
 
+        if msg.key in self.store:
+            self._evict(msg.key)
         self.store[msg.key] = data
+        if shared_files := get_shared_files(data):
+            self.shared_files.setdefault(msg.key, set()).update(shared_files)
 
     @handle_message.register
     def clear(self, msg: ClearDataMessage):
-        # Copy the list of keys to be able to delete keys while iterating
-        for key in list(self.store.keys()):
+        for key in self.store.keys() | self.shared_files.keys():
             if key.startswith(msg.prefix):
-                del self.store[key]
+                if key in self.store:
+                    self._evict(key)
+                self._release(key)
+
+    def _evict(self, key: str):
+        del self.store[key]
+        self.cache.pop(key, None)
+        self.fetches.pop(key, None)
+
+    def _release(self, key: str):
+        # Shared data is written once by the producer and owned by the service from then on. It
+        # is only released on clear, since subscribers may still be reading data that has
+        # already been evicted from the store
+        for path in self.shared_files.pop(key, ()):
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
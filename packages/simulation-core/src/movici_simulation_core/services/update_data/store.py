@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import struct
+import tempfile
+import typing as t
+from pathlib import Path
+
+from movici_simulation_core.core.serialization import estimate_nbytes
+from movici_simulation_core.types import InternalSerializationStrategy
+
+_FRAME_LENGTH = struct.Struct("<Q")
+
+
+@dataclasses.dataclass
+class StoreEntry:
+    data: t.Optional[dict]
+    nbytes: int
+    file: t.Optional[t.BinaryIO] = None
+    reserved: int = 0
+
+    @property
+    def spilled(self):
+        return self.data is None
+
+
+class UpdateDataStore(t.MutableMapping[str, dict]):
+    """A mapping of keys to update data that holds at most ``memory_limit`` bytes of (array) data
+    in memory. When the limit is exceeded, the least recently used entries are spilled to
+    (anonymous) temporary files in ``spill_dir`` and loaded back into memory when they are
+    accessed again. Spilled data is serialized using the ``serialization`` strategy
+
+    :param serialization: the strategy to (de)serialize spilled data with
+    :param memory_limit: the maximum number of bytes to hold in memory, or ``None`` for no limit
+    :param spill_dir: the directory to create spill files in, defaults to the system's temporary
+        directory
+    :param on_spill: a callback that is called with the key of every entry that is spilled.
+        Callers that hold data derived from an entry (see ``reserve``) must release it here
+    """
+
+    def __init__(
+        self,
+        serialization: InternalSerializationStrategy,
+        memory_limit: t.Optional[int] = None,
+        spill_dir: t.Optional[Path] = None,
+        on_spill: t.Optional[t.Callable[[str], None]] = None,
+    ):
+        self.serialization = serialization
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.on_spill = on_spill
+        self.entries: t.OrderedDict[str, StoreEntry] = collections.OrderedDict()
+        self.nbytes = 0
+
+    def __getitem__(self, key: str) -> dict:
+        entry = self.entries[key]
+        self.entries.move_to_end(key)
+        if entry.spilled:
+            self._load(entry)
+            self._spill(keep=key)
+        return entry.data
+
+    def __setitem__(self, key: str, data: dict):
+        if key in self.entries:
+            del self[key]
+        entry = StoreEntry(data, estimate_nbytes(data))
+        self.entries[key] = entry
+        self.nbytes += entry.nbytes
+        self._spill(keep=key)
+
+    def __delitem__(self, key: str):
+        entry = self.entries.pop(key)
+        if entry.spilled:
+            entry.file.close()
+        else:
+            self.nbytes -= entry.nbytes + entry.reserved
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def is_spilled(self, key: str):
+        return self.entries[key].spilled
+
+    def reserve(self, key: str, nbytes: int) -> bool:
+        """Account for ``nbytes`` of data that the caller holds in memory alongside the (in
+        memory) entry at ``key``, such as serialized copies of it. Other entries are spilled to
+        make room if necessary. The reservation lasts until the entry is spilled or deleted.
+        Returns ``False`` if the data does not fit in ``memory_limit``, in which case nothing is
+        reserved and the caller should not hold on to the data
+        """
+        entry = self.entries[key]
+        self.entries.move_to_end(key)
+        entry.reserved += nbytes
+        self.nbytes += nbytes
+        self._spill(keep=key)
+        if self.memory_limit is not None and self.nbytes > self.memory_limit:
+            entry.reserved -= nbytes
+            self.nbytes -= nbytes
+            return False
+        return True
+
+    def _spill(self, keep: str):
+        if self.memory_limit is None:
+            return
+        for key, entry in self.entries.items():
+            if self.nbytes <= self.memory_limit:
+                break
+            if key == keep or entry.spilled:
+                continue
+            self._dump(entry)
+            if self.on_spill is not None:
+                self.on_spill(key)
+
+    def _dump(self, entry: StoreEntry):
+        file = tempfile.TemporaryFile(dir=self.spill_dir)
+        for frame in self.serialization.dumps_multipart(entry.data):
+            file.write(_FRAME_LENGTH.pack(memoryview(frame).nbytes))
+            file.write(frame)
+        entry.file = file
+        entry.data = None
+        self.nbytes -= entry.nbytes + entry.reserved
+        entry.reserved = 0
+
+    def _load(self, entry: StoreEntry):
+        entry.file.seek(0)
+        raw = entry.file.read()
+        entry.file.close()
+        frames, offset = [], 0
+        while offset < len(raw):
+            (length,) = _FRAME_LENGTH.unpack_from(raw, offset)
+            offset += _FRAME_LENGTH.size
+            frames.append(memoryview(raw)[offset : offset + length])
+            offset += length
+        entry.data = self.serialization.loads_multipart(frames, copy=False)
+        entry.file = None
+        self.nbytes += entry.nbytes
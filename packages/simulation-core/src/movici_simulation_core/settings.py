@@ -33,7 +33,19 @@ class Settings(BaseSettings):
     service_types: t.List[str] = Field(default_factory=list)
     scenario_config: t.Optional[dict] = Field(default=None)
     service_discovery: t.Dict[str, str] = Field(default_factory=dict)
+    service_address: str = "tcp://127.0.0.1"
     distributed: bool = True
+    update_compression: t.Optional[t.Literal["zlib", "lz4", "zstd"]] = None
+    update_compression_threshold: int = 64 * 1024
+    update_shared_memory: bool = False
+    update_shared_memory_dir: t.Optional[Path] = None
+    update_store_memory_limit: t.Optional[int] = None
+    update_data_shards: int = Field(default=1, ge=1)
+    in_process_workers: int = Field(default=1, ge=1)
+    update_coalescing: bool = False
+    tracking_block_size: int = Field(default=0, ge=0)
+    csr_num_threads: int = Field(default=0, ge=0)
+    telemetry_file: t.Optional[Path] = None
 
     # pydantic settings. the "model_" here has nothing to do with movici models, but with pydantic
     model_config = SettingsConfigDict(env_prefix="movici_")
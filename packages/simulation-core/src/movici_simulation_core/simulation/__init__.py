@@ -26,6 +26,7 @@ from movici_simulation_core.utils import strategies
 from ..settings import Settings
 from .distributed import DistributedSimulationRunner
 from .in_process import InProcessSimulationRunner
+from .launcher import Launcher
 
 
 class Simulation(Extensible):
@@ -44,6 +45,8 @@ class Simulation(Extensible):
     schema: AttributeSchema
     timeline_info: t.Optional[TimelineInfo] = None
     exit_code: int = None
+    launchers: t.Dict[str, Launcher]
+    default_launcher: t.Optional[Launcher] = None
 
     def __init__(self, use_global_plugins=True, debug=False, **settings):
         """
@@ -56,6 +59,7 @@ class Simulation(Extensible):
         self.service_types = {}
         self.model_types = {}
         self.active_modules = {}
+        self.launchers = {}
         self.schema = AttributeSchema()
 
         self.settings = Settings(**settings)
@@ -108,6 +112,20 @@ class Simulation(Extensible):
             raise TypeError(f"Invalid model type '{model.__class__}")
         self.schema.add_attributes(model.get_schema_attributes())
 
+    def set_launcher(self, launcher: Launcher, *models: str):
+        """Set the `Launcher` that starts the given models when running a distributed simulation,
+        for example to run a model on another host. When no models are given, the launcher is used
+        for all models that do not have a launcher of their own
+
+        :param launcher: the `Launcher`
+        :param models: the names of the models to launch with ``launcher``
+
+        """
+        if not models:
+            self.default_launcher = launcher
+        for name in models:
+            self.launchers[name] = launcher
+
     def set_timeline_info(self, timeline_info: TimelineInfo):
         """
         When configuring the Simulation manually, use this method to add timeline information
@@ -128,8 +146,14 @@ class Simulation(Extensible):
         self._activate_services()
         self._activate_models()
         if self.settings.distributed:
+            self._ensure_local_launchers()
             runner = DistributedSimulationRunner(
-                self.active_modules, self.settings, schema=self.schema, strategies=self.strategies
+                self.active_modules,
+                self.settings,
+                schema=self.schema,
+                strategies=self.strategies,
+                launchers=self.launchers,
+                default_launcher=self.default_launcher,
             )
         else:
             runner = InProcessSimulationRunner(
@@ -138,6 +162,20 @@ class Simulation(Extensible):
         self.exit_code = runner.run()
         return self.exit_code
 
+    def _ensure_local_launchers(self):
+        """Update data can only be shared through files when all models run on the local host"""
+        if not self.settings.update_shared_memory:
+            return
+        for name, module in self.active_modules.items():
+            if not isinstance(module, ModelInfo):
+                continue
+            launcher = self.launchers.get(name, self.default_launcher)
+            if launcher is not None and not launcher.is_local:
+                raise ValueError(
+                    f"Model '{name}' is launched on another host, which is not supported when "
+                    "update_shared_memory is enabled"
+                )
+
     def _activate_services(self):
         active_svc_names = set(name for name, svc in self.service_types.items() if svc.auto_use)
         for name in self.settings.service_types:
@@ -1,6 +1,6 @@
 import dataclasses
+import socket
 import typing as t
-from multiprocessing import Process
 
 from movici_simulation_core.core import (
     AttributeSchema,
@@ -9,6 +9,7 @@ from movici_simulation_core.core import (
 )
 
 from ..settings import Settings
+from .launcher import LaunchedProcess
 
 DEFAULT_SERVICE_ADDRESS = "tcp://127.0.0.1"
 
@@ -34,7 +35,7 @@ class ModelTypeInfo(ModuleTypeInfo):
 class ActiveModuleInfo:
     name: str
     daemon: bool
-    process: t.Optional[Process] = dataclasses.field(init=False, default=None)
+    process: t.Optional[LaunchedProcess] = dataclasses.field(init=False, default=None)
 
 
 @dataclasses.dataclass
@@ -47,8 +48,19 @@ class ServiceInfo(ActiveModuleInfo):
             raise ValueError(f"No address set for service '{self.name}'")
         svc_discovery[self.name] = self.address
 
-    def set_port(self, port: int):
-        self.address = f"{DEFAULT_SERVICE_ADDRESS}:{port}"
+    def set_port(self, port: int, address: str = DEFAULT_SERVICE_ADDRESS):
+        self.address = f"{get_advertised_address(address)}:{port}"
+
+
+def get_advertised_address(bind_address: str) -> str:
+    """Return the address that others can use to connect to a service that is bound to
+    ``bind_address``. A service that is bound to all interfaces (``tcp://*`` or
+    ``tcp://0.0.0.0``) is advertised by the host name of this machine
+    """
+    protocol, _, host = bind_address.partition("://")
+    if host in ("*", "0.0.0.0"):  # noqa: S104
+        host = socket.getfqdn()
+    return f"{protocol}://{host}"
 
 
 class ModelInfo:
@@ -1,14 +1,23 @@
+import contextlib
 import multiprocessing
 import multiprocessing.connection
 import sys
+import tempfile
 import traceback
 import typing as t
 from multiprocessing import Process
+from pathlib import Path
 
 import zmq
 from zmq import Socket
 
-from movici_simulation_core.core import AttributeSchema, ModelAdapterBase, set_timeline_info
+from movici_simulation_core.core import (
+    AttributeSchema,
+    ModelAdapterBase,
+    set_timeline_info,
+    set_tracking_block_size,
+)
+from movici_simulation_core.csr import set_csr_num_threads
 from movici_simulation_core.exceptions import StartupFailure
 from movici_simulation_core.messages import ErrorMessage, QuitMessage
 from movici_simulation_core.model_connector import (
@@ -27,17 +36,44 @@ from movici_simulation_core.utils import get_logger, strategies
 
 from .common import (
     DEFAULT_SERVICE_ADDRESS,
+    ActiveModuleInfo,
     ModelInfo,
     ServiceInfo,
     SimulationRunner,
 )
+from .launcher import Launcher, ProcessLauncher
+
+UPDATE_DATA_SERVICE = "update_data"
+
+
+def update_data_shard_name(index: int) -> str:
+    """The service name of the ``index``-th instance (shard) of the update data service"""
+    return UPDATE_DATA_SERVICE if index == 0 else f"{UPDATE_DATA_SERVICE}_{index}"
 
 
 class DistributedSimulationRunner(SimulationRunner):
     """SimulationRunner that runs every model and service in its own separate process. The models
-    and services then connect using TCP and zeroMQ
+    and services then connect using TCP and zeroMQ. Models are started by a ``Launcher``, which
+    may start them on other hosts (see ``movici_simulation_core.simulation.launcher``)
+
+    :param launchers: a ``Launcher`` per model name for models that should not be launched by the
+        ``default_launcher``
+    :param default_launcher: the launcher for all other models, defaults to a ``ProcessLauncher``
     """
 
+    def __init__(
+        self,
+        modules: dict[str, ActiveModuleInfo],
+        settings: Settings,
+        schema: AttributeSchema,
+        strategies: t.Sequence[t.Type],
+        launchers: t.Optional[t.Dict[str, Launcher]] = None,
+        default_launcher: t.Optional[Launcher] = None,
+    ):
+        super().__init__(modules, settings, schema, strategies)
+        self.launchers = launchers or {}
+        self.default_launcher = default_launcher or ProcessLauncher()
+
     def run(self) -> int:
         """
         starts up services from config and auto_use using ServiceRunner. Collects service addresses
@@ -45,16 +81,34 @@ class DistributedSimulationRunner(SimulationRunner):
         tracks models and services, terminates when necessary (question: when do we terminate
         everything and when does the orchestrator take over exception handling?)
         """
-        self._start_services()
-        self._start_models()
-        procs = (
-            mod.process
-            for mod in self.modules.values()
-            if mod.process is not None and not mod.daemon
-        )
-        self._wait_for_processes(procs)
+        with self._update_shared_memory():
+            self._start_services()
+            self._start_models()
+            procs = (
+                mod.process
+                for mod in self.modules.values()
+                if mod.process is not None and not mod.daemon
+            )
+            self._wait_for_processes(procs)
         return self.exit_code
 
+    @contextlib.contextmanager
+    def _update_shared_memory(self):
+        """When enabled, provide a directory for the duration of the simulation in which update
+        data is shared between the models and the update data service (see ``UpdateDataFormat``)
+        """
+        if not self.settings.update_shared_memory:
+            yield
+            return
+        with tempfile.TemporaryDirectory(
+            prefix="movici-updates-", dir=self.settings.temp_dir
+        ) as directory:
+            self.settings.update_shared_memory_dir = Path(directory)
+            try:
+                yield
+            finally:
+                self.settings.update_shared_memory_dir = None
+
     def _wait_for_processes(self, processes: t.Iterable[Process]):
         exit_code = 0
         for proc in processes:
@@ -65,13 +119,27 @@ class DistributedSimulationRunner(SimulationRunner):
     def _start_services(self):
         svc_discovery: t.Dict[str, str] = {}
 
-        for service in (
-            module for module in self.modules.values() if isinstance(module, ServiceInfo)
-        ):
+        for service in self._get_services():
             self._start_service(service)
             service.fill_service_discovery(svc_discovery)
         self.settings.service_discovery = svc_discovery
 
+    def _get_services(self) -> t.List[ServiceInfo]:
+        """Get the services to start. When ``update_data_shards`` is larger than 1, additional
+        instances of the update data service are added so that models can store their updates
+        in different processes (see ``ModelRunner``)
+        """
+        services = [module for module in self.modules.values() if isinstance(module, ServiceInfo)]
+        if (update_data := self.modules.get(UPDATE_DATA_SERVICE)) is None:
+            return services
+        for index in range(1, self.settings.update_data_shards):
+            shard = ServiceInfo(
+                update_data_shard_name(index), cls=update_data.cls, daemon=update_data.daemon
+            )
+            self.modules[shard.name] = shard
+            services.append(shard)
+        return services
+
     def _start_models(self):
         for model in (module for module in self.modules.values() if isinstance(module, ModelInfo)):
             self._start_model(model)
@@ -84,7 +152,7 @@ class DistributedSimulationRunner(SimulationRunner):
     def _start_model(self, model: ModelInfo):
         return ModelRunner(
             model, self.settings, strategies=self.strategies, schema=self.schema
-        ).start()
+        ).start(self.launchers.get(model.name, self.default_launcher))
 
 
 class ProcessRunner:
@@ -92,6 +160,7 @@ class ProcessRunner:
     # that may be modified by other libraries
     _start_method = "spawn" if sys.platform in ("darwin", "win32") else "fork"
     ctx = multiprocessing.get_context(_start_method)
+    settings: t.Optional[Settings] = None
 
     def __init__(
         self, strategies: list[t.Type] | None, schema: t.Optional[AttributeSchema] = None
@@ -107,7 +176,9 @@ class ProcessRunner:
             for strat in self.strategies:
                 strategies.set(strat)
         strategies.get_instance(ExternalSerializationStrategy, schema=self.schema)
-        strategies.get_instance(InternalSerializationStrategy)
+        serialization = strategies.get_instance(InternalSerializationStrategy)
+        if self.settings is not None:
+            strategies.set(serialization.with_settings(self.settings))
 
 
 class ServiceRunner(ProcessRunner):
@@ -158,12 +229,14 @@ class ServiceRunner(ProcessRunner):
             raise StartupFailure(f"Service {self.service.name} failed to start in time")
 
         self.service.process = proc
-        self.service.set_port(recv.recv())
+        self.service.set_port(recv.recv(), address=self.settings.service_address)
 
     def entry_point(self, conn: multiprocessing.connection.Connection):
         self.prepare_subprocess()
         self.settings.name = self.service.name
-        zmq_socket, port = self._get_bound_socket(self.service.name)
+        zmq_socket, port = self._get_bound_socket(
+            self.service.name, addr=self.settings.service_address
+        )
         socket = MessageRouterSocket(zmq_socket)
         logger = get_logger(self.settings)
         stream = Stream(socket, logger=logger)
@@ -187,8 +260,8 @@ class ModelRunner(ProcessRunner):
     """
     Provides logic for:
 
-    * Creating a Process (daemon=False) that runs a Model. Using a wrapping function, this
-        subprocess will:
+    * Launching a Process (daemon=False) that runs a Model, using a ``Launcher``. Using a
+        wrapping function, this process will:
 
         * create the model with its model adapter
         * create a (dealer) socket
@@ -216,12 +289,9 @@ class ModelRunner(ProcessRunner):
         self.settings = settings
         self.model_info = model_info
 
-    def start(self):
-        proc = self.ctx.Process(
-            target=self.entry_point, daemon=False, name="Process-" + self.model_info.name
-        )
-        proc.start()
-        self.model_info.process = proc
+    def start(self, launcher: t.Optional[Launcher] = None):
+        launcher = launcher or ProcessLauncher()
+        self.model_info.process = launcher.launch(self)
 
     def entry_point(self):
         self.prepare_subprocess()
@@ -232,6 +302,8 @@ class ModelRunner(ProcessRunner):
 
         try:
             set_timeline_info(self.settings.timeline_info)
+            set_tracking_block_size(self.settings.tracking_block_size)
+            set_csr_num_threads(self.settings.csr_num_threads)
             stream = Stream(self.socket, logger=logger)
             model = self._get_model(logger)
 
@@ -264,15 +336,17 @@ class ModelRunner(ProcessRunner):
         stream,
         model: ModelAdapterBase,
     ):
-        self.update_handler = UpdateDataClient(
-            self.settings.name, self.settings.service_discovery["update_data"]
-        )
+        self.update_handler = UpdateDataClient(self.settings.name, self._get_update_data_address())
         self.init_data_handler = ServicedInitDataClient(
             self.settings.name, server=self.settings.service_discovery["init_data"]
         )
         serialization = strategies.get_instance(InternalSerializationStrategy)
         connector = ModelConnector(
-            model, self.update_handler, self.init_data_handler, serialization=serialization
+            model,
+            self.update_handler,
+            self.init_data_handler,
+            serialization=serialization,
+            coalesce_updates=self.settings.update_coalescing,
         )
         stream_handler = ConnectorStreamHandler(connector, stream)
         stream_handler.initialize()
@@ -285,6 +359,17 @@ class ModelRunner(ProcessRunner):
         socket.connect(addr)
         return MessageDealerSocket(socket)
 
+    def _get_update_data_address(self):
+        """Models are distributed over the update data shards in order of their appearance in
+        the simulation. Subscribers get the address of the shard that holds an update from the
+        ``UpdateMessage``
+        """
+        shards = self.settings.update_data_shards
+        index = 0
+        if shards > 1 and self.settings.name in self.settings.model_names:
+            index = self.settings.model_names.index(self.settings.name) % shards
+        return self.settings.service_discovery[update_data_shard_name(index)]
+
     def close(self):
         self.socket.close(linger=1000)  # ms
         if self.init_data_handler:
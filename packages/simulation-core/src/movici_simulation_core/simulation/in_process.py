@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import itertools
+import threading
 import traceback
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 
-from movici_simulation_core.core import AttributeSchema, set_timeline_info
+from movici_simulation_core.core import (
+    AttributeSchema,
+    set_timeline_info,
+    set_tracking_block_size,
+)
 from movici_simulation_core.core.types import UpdateDataClientBase
+from movici_simulation_core.csr import set_csr_num_threads
 from movici_simulation_core.exceptions import FSMDone, FSMError, InvalidMessage
 from movici_simulation_core.messages import (
     AcknowledgeMessage,
@@ -71,24 +78,39 @@ class InProcessUpdateDataClient(UpdateDataClientBase[dict]):
 
     def __init__(self):
         self.store = {}
+        self.fetches = {}
+        # The client is shared by all models, which may run concurrently
+        self.lock = threading.Lock()
         self.reset_counter()
 
-    def get(self, address: str, key: str, mask: t.Optional[dict]) -> dict:
+    def get(
+        self, address: str, key: str, mask: t.Optional[dict], fetch_count: t.Optional[int] = None
+    ) -> dict:
         if not validate_mask(mask):
             raise ValueError("Invalid Mask")
-        if key not in self.store:
-            raise ValueError("Key not found")
-
-        return filter_data(self.store[key], mask)
+        with self.lock:
+            if key not in self.store:
+                raise ValueError("Key not found")
+
+            result = filter_data(self.store[key], mask)
+            if fetch_count is not None:
+                self.fetches[key] = fetches = self.fetches.get(key, 0) + 1
+                if fetches >= fetch_count:
+                    del self.store[key]
+                    del self.fetches[key]
+        return result
 
     def put(self, data: dict) -> t.Tuple[str, str]:
-        key = next(self.counter)
-        self.store[key] = data
+        with self.lock:
+            key = next(self.counter)
+            self.store[key] = data
         return "", key
 
     def clear(self):
-        self.store = {}
-        self.reset_counter()
+        with self.lock:
+            self.store = {}
+            self.fetches = {}
+            self.reset_counter()
 
     def close(self):
         pass
@@ -100,7 +122,17 @@ class InProcessUpdateDataClient(UpdateDataClientBase[dict]):
 class InProcessSimulationRunner(SimulationRunner):
     """A SimulationRunner that connects all models and services in a single process, as opposed to
     the DistributedSimulationRunner that sets up models and services that run in a separate process
-    each and have them connect through TCP"""
+    each and have them connect through TCP.
+
+    By default, models are invoked one at a time. When the ``in_process_workers`` setting is larger
+    than 1, all commands that are pending at the same time are dispatched concurrently to a thread
+    pool. The orchestrator only releases models whose dependencies have finished, so these models
+    are independent of each other. Their responses are handled in the order of the models in the
+    simulation, so that the orchestration remains deterministic. This is mostly beneficial for
+    models that spend their time in code that releases the GIL. Commands are submitted in order of
+    the models' priority (see ``ModelCollection.update_priorities``), so that when there are more
+    pending commands than workers, the models on the critical path are started first
+    """
 
     def __init__(
         self,
@@ -185,11 +217,14 @@ class InProcessSimulationRunner(SimulationRunner):
             init_data_client,
             serialization=serializer,
             name=model_info.name,
+            coalesce_updates=self.settings.update_coalescing,
         )
 
     def run(self) -> int:
         self._configure_strategies()
         set_timeline_info(self.settings.timeline_info)
+        set_tracking_block_size(self.settings.tracking_block_size)
+        set_csr_num_threads(self.settings.csr_num_threads)
         stream, orchestrator = self._start_orchestrator()
         models = self._setup_models()
         for name in self.model_names:
@@ -203,6 +238,22 @@ class InProcessSimulationRunner(SimulationRunner):
             except FSMError:
                 return 1
 
+        if self.settings.in_process_workers > 1:
+            with ThreadPoolExecutor(
+                self.settings.in_process_workers,
+                # numba keeps the number of threads per calling thread
+                initializer=set_csr_num_threads,
+                initargs=(self.settings.csr_num_threads,),
+            ) as executor:
+                return self._run_concurrently(stream, orchestrator, models, executor)
+        return self._run_sequentially(stream, orchestrator, models)
+
+    def _run_sequentially(
+        self,
+        stream: InProcessOrchestratorStream,
+        orchestrator: Orchestrator,
+        models: dict[str, ModelConnector],
+    ) -> int:
         while True:
             for name in self.model_names:
                 command = stream.pending_commands.pop(name, None)
@@ -221,6 +272,36 @@ class InProcessSimulationRunner(SimulationRunner):
                 except FSMError:
                     return 1
 
+    def _run_concurrently(
+        self,
+        stream: InProcessOrchestratorStream,
+        orchestrator: Orchestrator,
+        models: dict[str, ModelConnector],
+        executor: ThreadPoolExecutor,
+    ) -> int:
+        while True:
+            futures = {}
+            for name in (model.name for model in orchestrator.context.models.by_priority()):
+                command = stream.pending_commands.pop(name, None)
+                if not command:
+                    continue
+                self._get_logger("orchestrator").debug(f"Sending: {command}")
+
+                orchestrator.restart_model_timer(name)
+                futures[name] = executor.submit(self.handle_model_command, models[name], command)
+
+            for name in self.model_names:
+                if (future := futures.get(name)) is None:
+                    continue
+                response = future.result()
+                self._get_logger(name).debug(f"Sending: {response}")
+                try:
+                    stream.handle_message((name, response))
+                except FSMDone:
+                    return 0
+                except FSMError:
+                    return 1
+
     def handle_model_command(self, model: ModelConnector, command: Message):
         try:
             if isinstance(command, NewTimeMessage):
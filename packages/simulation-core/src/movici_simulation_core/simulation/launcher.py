@@ -0,0 +1,134 @@
+"""Launchers start the model processes of a distributed simulation. By default, every model runs
+in a subprocess of the simulation (``ProcessLauncher``). A ``CommandLauncher`` instead starts a
+model as an independent python process through a command, such as ``["ssh", "some-host"]``, so
+that models can run on other hosts. These processes run this module (see ``main``) and receive
+their ``ModelRunner`` through stdin. They only connect to the simulation's services through the
+(TCP) addresses in ``Settings.service_discovery``. When launching models on other hosts, the
+services must therefore bind to an address that is reachable from those hosts, see
+``Settings.service_address``. ``LocalLauncher`` launches these independent processes on the local
+host.
+"""
+
+from __future__ import annotations
+
+import pickle
+import subprocess
+import sys
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .distributed import ModelRunner
+
+
+class LaunchedProcess(t.Protocol):
+    """The interface of a launched process, modelled after ``multiprocessing.Process``"""
+
+    @property
+    def exitcode(self) -> t.Optional[int]: ...
+
+    def join(self, timeout: t.Optional[float] = None) -> None: ...
+
+    def is_alive(self) -> bool: ...
+
+    def terminate(self) -> None: ...
+
+
+class Launcher:
+    # whether the launched processes run on the local host, so that they can share update data
+    # with the simulation through files (see ``Settings.update_shared_memory``)
+    is_local = True
+
+    def launch(self, runner: ModelRunner) -> LaunchedProcess:
+        """Start a process that runs ``runner.entry_point``"""
+        raise NotImplementedError
+
+
+class ProcessLauncher(Launcher):
+    """Launch a model as a subprocess of the simulation using ``multiprocessing``"""
+
+    def launch(self, runner: ModelRunner) -> LaunchedProcess:
+        proc = runner.ctx.Process(
+            target=runner.entry_point, daemon=False, name="Process-" + runner.model_info.name
+        )
+        proc.start()
+        return proc
+
+
+class CommandLauncher(Launcher):
+    """Launch a model as an independent python process by running a command. The python
+    interpreter is started by ``command``, eg. ``["ssh", "some-host"]``, and must have
+    ``movici_simulation_core`` and the model's package installed.
+
+    :param command: the command (prefix) that starts the python interpreter
+    :param python: the python interpreter to run, defaults to the current interpreter
+    """
+
+    def __init__(self, command: t.Sequence[str] = (), python: t.Optional[str] = None):
+        self.command = list(command)
+        self.python = python or sys.executable
+
+    @property
+    def is_local(self):
+        return not self.command
+
+    def launch(self, runner: ModelRunner) -> LaunchedProcess:
+        popen = subprocess.Popen(  # noqa: S603
+            [*self.command, self.python, "-m", __name__], stdin=subprocess.PIPE
+        )
+        popen.stdin.write(dump_runner(runner))
+        popen.stdin.close()
+        return CommandProcess(popen)
+
+
+class LocalLauncher(CommandLauncher):
+    """Launch a model as an independent python process on the local host. The process only shares
+    the service discovery with the simulation, just like it would on a remote host
+    """
+
+    def __init__(self, python: t.Optional[str] = None):
+        super().__init__(command=(), python=python)
+
+
+class CommandProcess:
+    """Wraps a ``subprocess.Popen`` object to provide the ``LaunchedProcess`` interface"""
+
+    def __init__(self, popen: subprocess.Popen):
+        self.popen = popen
+
+    @property
+    def exitcode(self):
+        return self.popen.poll()
+
+    def join(self, timeout: t.Optional[float] = None):
+        try:
+            self.popen.wait(timeout)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def is_alive(self):
+        return self.popen.poll() is None
+
+    def terminate(self):
+        self.popen.terminate()
+
+
+def dump_runner(runner: ModelRunner) -> bytes:
+    """Serialize the runner together with the current ``sys.path`` so that the launched process
+    can import the model's module in the same way
+    """
+    return pickle.dumps({"sys_path": sys.path, "runner": pickle.dumps(runner)})
+
+
+def load_runner(raw: bytes) -> ModelRunner:
+    payload = pickle.loads(raw)  # noqa: S301
+    sys.path.extend(path for path in payload["sys_path"] if path not in sys.path)
+    return pickle.loads(payload["runner"])  # noqa: S301
+
+
+def main():
+    runner = load_runner(sys.stdin.buffer.read())
+    runner.entry_point()
+
+
+if __name__ == "__main__":
+    main()
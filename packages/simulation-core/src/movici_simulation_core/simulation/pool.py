@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import atexit
+import multiprocessing.connection
+import typing as t
+
+from movici_simulation_core.utils.logging import reset_loggers
+from movici_simulation_core.utils.path import DEFAULT_DATASET_CACHE_SIZE, enable_dataset_cache
+
+from .distributed import ModelRunner, ProcessRunner
+from .launcher import Launcher
+
+
+class WorkerPool(Launcher):
+    """A ``Launcher`` that runs models in a pool of persistent worker processes. A worker process
+    stays alive after its model has finished, so that it can run a model in a next simulation
+    without having to start a new process. The worker then keeps its imported modules and compiled
+    (numba) kernels. Optionally, the workers also keep the init datasets they have read in memory
+    (see ``enable_dataset_cache``). A model is preferably run by an idle worker that has run a
+    model with the same name before. When no worker is idle, a new worker is added to the pool.
+
+    Models are sent to the workers by pickling their ``ModelRunner``, so models that are added to
+    a ``Simulation`` as an instance must be picklable. A pool can be shared by consecutive
+    simulations, and must be closed when it is no longer needed:
+
+    .. code-block:: python
+
+        with WorkerPool(cache_init_data=True) as pool:
+            for config in scenarios:
+                sim = Simulation()
+                sim.configure(config)
+                sim.set_launcher(pool)
+                sim.run()
+
+    :param cache_init_data: Keep init datasets in memory in the worker processes
+    :param dataset_cache_size: the maximum total size (in bytes of their files) of the init
+        datasets that a worker keeps in memory
+    """
+
+    def __init__(self, cache_init_data=False, dataset_cache_size=DEFAULT_DATASET_CACHE_SIZE):
+        self.cache_init_data = cache_init_data
+        self.dataset_cache_size = dataset_cache_size
+        self.workers: t.List[PoolWorker] = []
+        self.closed = False
+        atexit.register(self.close)
+
+    def launch(self, runner: ModelRunner) -> PooledProcess:
+        if self.closed:
+            raise RuntimeError("WorkerPool is closed")
+        self.workers = [worker for worker in self.workers if worker.alive]
+        worker = self._get_idle_worker(runner.model_info.name)
+        if worker is None:
+            worker = PoolWorker(
+                cache_init_data=self.cache_init_data, dataset_cache_size=self.dataset_cache_size
+            )
+            self.workers.append(worker)
+        return worker.run(runner)
+
+    def _get_idle_worker(self, model_name: str) -> t.Optional[PoolWorker]:
+        idle = [worker for worker in self.workers if not worker.busy]
+        for worker in idle:
+            if worker.last_model == model_name:
+                return worker
+        return idle[0] if idle else None
+
+    def close(self):
+        """Stop all worker processes after they have finished their current model"""
+        if self.closed:
+            return
+        self.closed = True
+        for worker in self.workers:
+            worker.stop()
+        self.workers = []
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class PoolWorker:
+    """A persistent process that runs the ``ModelRunner``-s that it receives one at a time"""
+
+    def __init__(self, cache_init_data=False, dataset_cache_size=DEFAULT_DATASET_CACHE_SIZE):
+        self.conn, child_conn = ProcessRunner.ctx.Pipe()
+        self.process = ProcessRunner.ctx.Process(
+            target=worker_main,
+            args=(child_conn, cache_init_data, dataset_cache_size),
+            daemon=False,
+        )
+        self.process.start()
+        child_conn.close()
+        self.last_model: t.Optional[str] = None
+        self.task: t.Optional[PooledProcess] = None
+
+    @property
+    def alive(self):
+        return self.process.is_alive()
+
+    @property
+    def busy(self):
+        return self.task is not None and self.task.exitcode is None
+
+    def run(self, runner: ModelRunner) -> PooledProcess:
+        self.conn.send(runner)
+        self.last_model = runner.model_info.name
+        self.process.name = "PoolWorker-" + runner.model_info.name
+        self.task = PooledProcess(self)
+        return self.task
+
+    def stop(self):
+        if self.alive:
+            if self.busy:
+                self.task.join()
+            self.conn.send(None)
+            self.process.join()
+        self.conn.close()
+
+
+class PooledProcess:
+    """The ``LaunchedProcess`` of a model that runs in a ``PoolWorker``"""
+
+    def __init__(self, worker: PoolWorker):
+        self.worker = worker
+        self._exitcode: t.Optional[int] = None
+
+    @property
+    def exitcode(self) -> t.Optional[int]:
+        self._poll(0)
+        return self._exitcode
+
+    def join(self, timeout: t.Optional[float] = None):
+        self._poll(timeout)
+
+    def is_alive(self):
+        return self.exitcode is None
+
+    def terminate(self):
+        self.worker.process.terminate()
+
+    def _poll(self, timeout: t.Optional[float]):
+        if self._exitcode is not None:
+            return
+        try:
+            if self.worker.conn.poll(timeout):
+                self._exitcode = self.worker.conn.recv()
+        except (EOFError, OSError):
+            # The worker process has died
+            self.worker.process.join()
+            self._exitcode = self.worker.process.exitcode or 1
+
+
+def worker_main(
+    conn: multiprocessing.connection.Connection,
+    cache_init_data=False,
+    dataset_cache_size=DEFAULT_DATASET_CACHE_SIZE,
+):
+    if cache_init_data:
+        enable_dataset_cache(dataset_cache_size)
+    while True:
+        try:
+            runner = conn.recv()
+        except EOFError:
+            return
+        if runner is None:
+            return
+        exitcode = 0
+        try:
+            runner.entry_point()
+        except SystemExit as e:
+            exitcode = e.code if isinstance(e.code, int) else 1
+        except Exception:
+            exitcode = 1
+        finally:
+            # the next model may run with different log settings
+            reset_loggers()
+        conn.send(exitcode)
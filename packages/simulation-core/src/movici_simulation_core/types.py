@@ -7,6 +7,7 @@ import numpy as np
 
 if t.TYPE_CHECKING:
     from movici_simulation_core import AttributeSchema
+    from movici_simulation_core.settings import Settings
 
 Timestamp = int
 NextTime = t.Optional[int]
@@ -83,8 +84,29 @@ T = t.TypeVar("T", bytes, dict)
 
 
 class InternalSerializationStrategy(t.Protocol[T]):
+    def with_settings(self, settings: Settings) -> InternalSerializationStrategy[T]:
+        """Return a strategy that is configured according to the simulation ``settings``"""
+        return self
+
     def dumps(self, data: dict) -> T:
         raise NotImplementedError
 
     def loads(self, raw_data: T) -> dict:
         raise NotImplementedError
+
+    def loads_readonly(self, raw_data: T) -> dict:
+        """Deserialize ``raw_data`` for read-only use. The result may share memory with
+        ``raw_data`` and must not be modified
+        """
+        return self.loads(raw_data)
+
+    def dumps_multipart(self, data: dict) -> t.List[T]:
+        """Serialize ``data`` into one or more frames. By default this is a single frame"""
+        return [self.dumps(data)]
+
+    def loads_multipart(self, frames: t.Sequence[T], copy=True) -> dict:
+        """Deserialize data from the frames produced by ``dumps_multipart``. When ``copy`` is
+        ``False`` the result is for read-only use (see ``loads_readonly``)
+        """
+        (raw_data,) = frames
+        return self.loads(raw_data) if copy else self.loads_readonly(raw_data)
@@ -48,6 +48,18 @@ def filter_data(data: dict, mask: t.Optional[dict]):
     return filter_helper(data, mask)
 
 
+def canonical_mask(mask: t.Union[dict, list, None]) -> t.Hashable:
+    """returns a hashable representation of a (validated) mask. Masks that give the same result
+    in `filter_data` have an equal canonical representation, regardless of the order of their
+    keys and attributes
+    """
+    if mask is None:
+        return None
+    if isinstance(mask, list):
+        return frozenset(mask) | {"id"}
+    return frozenset((key, canonical_mask(val)) for key, val in mask.items())
+
+
 def ensure_id(mask: t.List[str]):
     if "id" not in mask:
         mask.append("id")
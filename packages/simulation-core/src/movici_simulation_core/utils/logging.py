@@ -6,14 +6,19 @@ import warnings
 
 from movici_simulation_core.settings import Settings
 
-_configured_loggers: set[str] = set()
+# the log settings and handler of every logger that has been configured by get_logger
+_configured_loggers: dict[str, tuple[str, str, logging.Handler]] = {}
 
 
 def get_logger(settings: Settings, name=None, capture_warnings=True):
     name = name or settings.name
     logger = logging.getLogger(name or settings.name)
-    if name in _configured_loggers:
-        return logger
+    if (configured := _configured_loggers.get(name)) is not None:
+        if configured[:2] == (settings.log_level, settings.log_format):
+            return logger
+        # the logger was configured with different settings, eg. by an earlier simulation that
+        # ran in the same process
+        logger.removeHandler(configured[2])
 
     level = logging.getLevelName(settings.log_level.upper())
     logger.setLevel(level)
@@ -22,10 +27,20 @@ def get_logger(settings: Settings, name=None, capture_warnings=True):
     logger.addHandler(handler)
     if capture_warnings:
         captureWarnings(logger)
-    _configured_loggers.add(name)
+    _configured_loggers[name] = (settings.log_level, settings.log_format, handler)
     return logger
 
 
+def reset_loggers():
+    """Remove the handlers that ``get_logger`` has added, so that loggers are configured again
+    on their next use
+    """
+    for name, (_, _, handler) in _configured_loggers.items():
+        logging.getLogger(name).removeHandler(handler)
+    _configured_loggers.clear()
+    captureWarnings(None)
+
+
 # Warnings integration
 # Reimplementation of warning integration from `logging` module with the difference that you can
 # specify which logger to use as an output
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import collections
+import copy
 import functools
 import pathlib
 import typing as t
@@ -48,4 +50,77 @@ class DatasetPath(type(pathlib.Path())):
         if filetype not in self.strategy.supported_file_types():
             raise TypeError(f"Unsupported filetype {filetype} with extension '{self.suffix}'")
 
-        return self.strategy.loads(self.read_bytes(), filetype)
+        if _dataset_cache is None:
+            return self.strategy.loads(self.read_bytes(), filetype)
+
+        stat = self.stat()
+        key = (str(self.resolve()), filetype, type(self.strategy))
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if (data := _dataset_cache.get(key, stamp)) is None:
+            data = self.strategy.loads(self.read_bytes(), filetype)
+            _dataset_cache.put(key, stamp, data, nbytes=stat.st_size)
+        # Datasets may be modified by their consumers, so we hand out a copy
+        return copy.deepcopy(data)
+
+
+DEFAULT_DATASET_CACHE_SIZE = 1024**3
+
+
+class DatasetCache:
+    """A least recently used (LRU) cache of parsed datasets. The size of a dataset is estimated
+    by the size of its file. When the total size exceeds ``max_bytes``, the least recently used
+    datasets are evicted. A dataset of which the file has changed is replaced
+
+    :param max_bytes: the maximum total size of the cached dataset files in bytes
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_DATASET_CACHE_SIZE):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: collections.OrderedDict[tuple, tuple[tuple, dict, int]] = (
+            collections.OrderedDict()
+        )
+
+    def get(self, key: tuple, stamp: tuple) -> t.Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != stamp:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: tuple, stamp: tuple, data: dict, nbytes: int):
+        self.pop(key)
+        if nbytes > self.max_bytes:
+            return
+        self._entries[key] = (stamp, data, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def pop(self, key: tuple):
+        if (entry := self._entries.pop(key, None)) is not None:
+            self.nbytes -= entry[2]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_dataset_cache: t.Optional[DatasetCache] = None
+
+
+def enable_dataset_cache(max_bytes: int = DEFAULT_DATASET_CACHE_SIZE):
+    """Keep the datasets that are read using ``DatasetPath.read_dict`` in memory, so that they do
+    not need to be read and parsed again when they are read again (by another simulation in the
+    same process). A dataset is read again from disk when its file has changed. The least recently
+    used datasets are evicted when the total size of their files exceeds ``max_bytes``
+    """
+    global _dataset_cache
+    if _dataset_cache is None:
+        _dataset_cache = DatasetCache(max_bytes)
+
+
+def disable_dataset_cache():
+    """Disable and clear the dataset cache (see ``enable_dataset_cache``)"""
+    global _dataset_cache
+    _dataset_cache = None
@@ -15,7 +15,15 @@ from movici_simulation_core.core.data_format import (
 )
 from movici_simulation_core.core.data_type import UNDEFINED
 from movici_simulation_core.core.schema import DEFAULT_ROWPTR_KEY, AttributeSchema, AttributeSpec
-from movici_simulation_core.core.serialization import dump_update, load_update
+from movici_simulation_core.core.serialization import (
+    CompressedArray,
+    SharedArray,
+    UpdateDataFormat,
+    dump_update,
+    get_shared_files,
+    load_update,
+)
+from movici_simulation_core.settings import Settings
 from movici_simulation_core.testing.helpers import assert_dataset_dicts_equal
 from movici_simulation_core.types import FileType
 
@@ -236,6 +244,157 @@ def test_serialization_round_trip(data):
     assert_dataset_dicts_equal(data, load_update(dump_update(data)))
 
 
+@pytest.fixture
+def update_data():
+    return {
+        "dataset": {
+            "entities": {
+                "id": np.array([1, 2, 3]),
+                "attr": np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]),
+                "str_attr": np.array(["a", "bb", "ccc"]),
+                "strided": np.arange(6)[::2],
+            }
+        }
+    }
+
+
+def test_readonly_serialization_round_trip(update_data):
+    result = UpdateDataFormat().loads_readonly(dump_update(update_data))
+    assert_dataset_dicts_equal(update_data, result)
+    assert not result["dataset"]["entities"]["id"].flags.writeable
+
+
+def test_loads_copies_by_default(update_data):
+    result = UpdateDataFormat().loads(dump_update(update_data))
+    assert result["dataset"]["entities"]["id"].flags.writeable
+
+
+def test_multipart_serialization_round_trip(update_data):
+    strategy = UpdateDataFormat()
+    frames = strategy.dumps_multipart(update_data)
+    assert len(frames) == 5
+    assert_dataset_dicts_equal(update_data, strategy.loads_multipart(frames))
+
+
+def test_multipart_zero_copy_decoding(update_data):
+    strategy = UpdateDataFormat()
+    frames = [bytearray(frame) for frame in strategy.dumps_multipart(update_data)]
+    result = strategy.loads_multipart(frames, copy=False)
+    assert_dataset_dicts_equal(update_data, result)
+
+    attr = result["dataset"]["entities"]["attr"]
+    assert not attr.flags.writeable
+    assert any(np.shares_memory(attr, np.frombuffer(frame, dtype=np.uint8)) for frame in frames)
+
+
+@pytest.fixture
+def large_update_data():
+    return {
+        "dataset": {
+            "entities": {
+                "id": np.arange(10),
+                "attr": np.zeros((1000, 2)),
+                "str_attr": np.array(["a"] * 1000),
+            }
+        }
+    }
+
+
+@pytest.mark.parametrize("multipart", [False, True])
+def test_compressed_serialization_round_trip(large_update_data, multipart):
+    strategy = UpdateDataFormat(compression="zlib", compression_threshold=1000)
+    if multipart:
+        frames = strategy.dumps_multipart(large_update_data)
+        assert sum(len(frame) for frame in frames) < 2000
+        result = strategy.loads_multipart(frames)
+    else:
+        raw = strategy.dumps(large_update_data)
+        assert len(raw) < 2000
+        result = strategy.loads(raw)
+    assert_dataset_dicts_equal(large_update_data, result)
+
+
+def test_does_not_compress_arrays_below_threshold(large_update_data):
+    strategy = UpdateDataFormat(compression="zlib", compression_threshold=1000)
+    header, *buffers = strategy.dumps_multipart(large_update_data)
+    assert bytes(buffers[0]) == large_update_data["dataset"]["entities"]["id"].tobytes()
+
+
+def test_can_decode_compressed_data_without_compression(large_update_data):
+    raw = UpdateDataFormat(compression="zlib", compression_threshold=0).dumps(large_update_data)
+    assert_dataset_dicts_equal(large_update_data, UpdateDataFormat().loads(raw))
+
+
+def test_readonly_decoding_keeps_compressed_arrays(large_update_data):
+    frames = UpdateDataFormat(compression="zlib", compression_threshold=1000).dumps_multipart(
+        large_update_data
+    )
+    strategy = UpdateDataFormat()
+    result = strategy.loads_multipart(frames, copy=False)
+    attr = result["dataset"]["entities"]["attr"]
+    assert isinstance(attr, CompressedArray)
+    np.testing.assert_array_equal(
+        attr.decompress(), large_update_data["dataset"]["entities"]["attr"]
+    )
+
+    reencoded = strategy.dumps_multipart(result)
+    assert [bytes(f) for f in reencoded] == [bytes(f) for f in frames]
+    assert_dataset_dicts_equal(large_update_data, strategy.loads_multipart(reencoded))
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_shared_memory_serialization_round_trip(tmp_path, large_update_data, compression):
+    strategy = UpdateDataFormat(
+        compression=compression, compression_threshold=1000, shared_memory_dir=tmp_path
+    )
+    frames = strategy.dumps_multipart(large_update_data)
+    assert len(frames) == 1
+    assert len(list(tmp_path.iterdir())) == 1
+    assert_dataset_dicts_equal(large_update_data, strategy.loads_multipart(frames))
+
+
+def test_readonly_decoding_keeps_shared_arrays(tmp_path, large_update_data):
+    strategy = UpdateDataFormat(shared_memory_dir=tmp_path)
+    frames = strategy.dumps_multipart(large_update_data)
+    result = strategy.loads_multipart(frames, copy=False)
+    assert isinstance(result["dataset"]["entities"]["attr"], SharedArray)
+    assert get_shared_files(result) == {str(path) for path in tmp_path.iterdir()}
+
+    reencoded = strategy.dumps_multipart(result)
+    assert len(list(tmp_path.iterdir())) == 1
+    assert_dataset_dicts_equal(large_update_data, UpdateDataFormat().loads_multipart(reencoded))
+
+
+@pytest.mark.parametrize("copy", [True, False])
+def test_shared_arrays_are_loaded_as_readonly_memory_maps(tmp_path, large_update_data, copy):
+    strategy = UpdateDataFormat(shared_memory_dir=tmp_path)
+    result = strategy.loads_multipart(strategy.dumps_multipart(large_update_data), copy=copy)
+    attr = result["dataset"]["entities"]["attr"]
+    if not copy:
+        attr = attr.load()
+    assert isinstance(attr, np.memmap)
+    assert attr.filename == str(next(tmp_path.iterdir()))
+    assert not attr.flags.writeable
+    np.testing.assert_array_equal(attr, large_update_data["dataset"]["entities"]["attr"])
+
+
+def test_unknown_compression_codec_raises():
+    with pytest.raises(ValueError):
+        UpdateDataFormat(compression="invalid")
+
+
+def test_configure_with_settings(tmp_path):
+    settings = Settings(
+        update_compression="zlib",
+        update_compression_threshold=10,
+        update_shared_memory_dir=tmp_path,
+    )
+    strategy = UpdateDataFormat().with_settings(settings)
+    assert strategy.codec.name == "zlib"
+    assert strategy.compression_threshold == 10
+    assert strategy.shared_memory_dir == tmp_path
+
+
 @pytest.mark.parametrize(
     "data,ignored, expected",
     [
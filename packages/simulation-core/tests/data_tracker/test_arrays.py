@@ -3,8 +3,13 @@ import operator
 import numpy as np
 import pytest
 
-from movici_simulation_core.core.arrays import TrackedArray, TrackedCSRArray
+from movici_simulation_core.core.arrays import (
+    TrackedArray,
+    TrackedCSRArray,
+    set_tracking_block_size,
+)
 from movici_simulation_core.core.attribute import ensure_csr_data
+from movici_simulation_core.csr import update_csr_array
 
 
 def assert_equal_csr_arrays(a, b):
@@ -64,6 +69,74 @@ def test_update_csr_array(array, updates, indices, expected):
     assert_equal_csr_arrays(array, expected)
 
 
+def test_update_csr_array_in_place_when_row_lengths_are_equal():
+    csr = TrackedCSRArray(np.array([1, 2, 3, 4, 5, 6, 7]), np.array([0, 3, 6, 7]))
+    data, row_ptr = csr.data, csr.row_ptr
+    csr.update(TrackedCSRArray(np.array([4, 5, 0]), np.array([0, 3])), np.array([1]))
+    assert csr.data is data
+    assert csr.row_ptr is row_ptr
+    assert np.array_equal(csr.data, [1, 2, 3, 4, 5, 0, 7])
+    assert np.array_equal(csr.changed, [False, True, False])
+
+
+def test_update_read_only_csr_array():
+    data = np.array([1, 2, 3])
+    data.flags.writeable = False
+    csr = TrackedCSRArray(data, np.array([0, 2, 3]))
+    csr.update(TrackedCSRArray(np.array([4]), np.array([0, 1])), np.array([1]))
+    assert np.array_equal(csr.data, [1, 2, 4])
+    assert np.array_equal(data, [1, 2, 3])
+
+
+def test_update_csr_array_reuses_buffer_when_row_lengths_change():
+    csr = TrackedCSRArray(np.arange(20), np.arange(0, 21, 2))
+    csr.update(TrackedCSRArray(np.array([1, 2, 3]), np.array([0, 3])), np.array([0]))
+    buffer = csr._buffer
+    assert buffer is not None and len(buffer) > len(csr.data)
+    assert csr.data.base is buffer
+
+    csr.update(TrackedCSRArray(np.array([5, 6, 7]), np.array([0, 3])), np.array([9]))
+    assert csr._buffer is buffer
+    assert np.array_equal(csr.data, [1, 2, 3, *range(2, 18), 5, 6, 7])
+    assert np.array_equal(csr.row_ptr, [0, *range(3, 20, 2), 22])
+
+
+def test_update_csr_array_with_large_growth_allocates_exact_size():
+    csr = TrackedCSRArray(np.arange(4), np.arange(0, 5, 2))
+    csr.update(TrackedCSRArray(np.arange(10), np.array([0, 10])), np.array([0]))
+    assert csr._buffer is None
+    assert np.array_equal(csr.data, [*range(10), 2, 3])
+
+
+@pytest.mark.parametrize("unit_shape", [(), (2,)])
+def test_update_csr_array_in_buffer_equals_update_csr_array(unit_shape):
+    random = np.random.default_rng(seed=42)
+    lengths = random.integers(0, 4, size=50)
+    row_ptr = np.concatenate(([0], np.cumsum(lengths)))
+    data = random.random((row_ptr[-1], *unit_shape))
+    csr = TrackedCSRArray(data, row_ptr)
+    for _ in range(20):
+        indices = random.choice(50, size=random.integers(1, 10), replace=False)
+        upd_lengths = random.integers(0, 4, size=len(indices))
+        upd_row_ptr = np.concatenate(([0], np.cumsum(upd_lengths)))
+        updates = TrackedCSRArray(random.random((upd_row_ptr[-1], *unit_shape)), upd_row_ptr)
+
+        csr.reset()
+        expected = csr.copy()
+        expected.data, expected.row_ptr = update_csr_array(
+            expected.data,
+            expected.row_ptr,
+            updates.data,
+            updates.row_ptr,
+            indices,
+            compare=expected.get_comparator(),
+            changes=expected.changed,
+        )
+        csr.update(updates, indices)
+        assert_equal_csr_arrays(csr, expected)
+        assert np.array_equal(csr.changed, expected.changed)
+
+
 @pytest.mark.parametrize(
     ["csr", "indices", "expected"],
     [
@@ -258,6 +331,129 @@ class TestTrackedArray:
         arr[1] = 3
         self.assert_changed(arr, [True, True, False])
 
+    @pytest.mark.parametrize(
+        "arr, key",
+        [
+            ([1, 2, 3], 0),
+            ([1, 2, 3], [0, 1]),
+            ([1, 2, 3], np.array([True, False, True])),
+            ([[1, 2], [3, 4]], (0, 1)),
+            ([[1, 2], [3, 4]], (slice(None), [0])),
+        ],
+    )
+    def test_reading_a_copy_does_not_start_tracking(self, arr, key):
+        arr = TrackedArray(arr)
+        arr[key]
+        assert arr._curr is None
+
+    @pytest.mark.parametrize(
+        "arr, key",
+        [
+            ([1, 2, 3], slice(0, 2)),
+            ([1, 2, 3], Ellipsis),
+            ([[1, 2], [3, 4]], 0),
+        ],
+    )
+    def test_reading_a_view_starts_tracking(self, arr, key):
+        arr = TrackedArray(arr)
+        arr[key][...] = 0
+        assert np.any(arr.changed)
+
+    def test_readonly_does_not_start_tracking(self):
+        arr = TrackedArray([1, 2, 3])
+        view = arr.readonly()
+        assert type(view) is np.ndarray
+        assert np.array_equal(view[0:2], [1, 2])
+        assert arr._curr is None
+
+    def test_readonly_is_not_writeable(self):
+        arr = TrackedArray([1, 2, 3])
+        with pytest.raises(ValueError):
+            arr.readonly()[0] = 2
+
+
+class TestBlockTrackedArray:
+    @pytest.fixture
+    def arr(self):
+        return TrackedArray(np.arange(10), block_size=4)
+
+    def test_only_keeps_previous_values_of_indexed_blocks(self, arr):
+        arr[5] = 0
+        assert list(arr._blocks) == [1]
+        assert np.array_equal(arr._blocks[1], [4, 5, 6, 7])
+        assert arr._curr is None
+
+    @pytest.mark.parametrize(
+        "key, value",
+        [
+            (1, 0),
+            (-1, 0),
+            (slice(2, 6), 0),
+            (slice(None, None, 3), 0),
+            (slice(None, None, -1), np.arange(10)[::-1] + 1),
+            ([1, 9], 0),
+            (np.array([True, False] * 5), 0),
+            (Ellipsis, 0),
+            ((slice(3, 5),), 0),
+        ],
+    )
+    def test_tracks_changes_as_full_array(self, arr, key, value):
+        full = TrackedArray(np.arange(10))
+        arr[key] = value
+        full[key] = value
+        assert np.array_equal(arr.changed, full.changed)
+        for diff, expected in zip(arr.diff(), full.diff()):
+            assert np.array_equal(diff, expected)
+
+    def test_tracks_changes_in_multiple_blocks(self, arr):
+        arr[1] = 0
+        arr[9] = 0
+        assert sorted(arr._blocks) == [0, 2]
+        assert np.array_equal(np.flatnonzero(arr.changed), [1, 9])
+        self.assert_diff_equal(arr, ([1, 9], [0, 0]))
+
+    def test_changed_without_changes(self, arr):
+        assert not np.any(arr.changed)
+        self.assert_diff_equal(arr, ([], []))
+
+    def test_multidimensional_array(self):
+        arr = TrackedArray([[3, 4], [4, 3], [3, 3]], block_size=2)
+        arr[arr == 3] = 4
+        assert np.array_equal(arr.changed, [[True, False], [False, True], [True, True]])
+
+    def test_reset(self, arr):
+        arr[1] = 0
+        arr.reset()
+        assert arr._blocks is None
+        assert not np.any(arr.changed)
+
+    def test_uses_default_block_size(self):
+        set_tracking_block_size(4)
+        try:
+            assert TrackedArray([1, 2, 3]).block_size == 4
+        finally:
+            set_tracking_block_size(None)
+        assert TrackedArray([1, 2, 3]).block_size == 0
+
+    def test_astype_keeps_tracking(self, arr):
+        arr[1] = 0
+        rv = arr.astype(float)
+        assert rv._blocks[0].dtype == float
+        assert np.array_equal(rv.changed, arr.changed)
+
+    @pytest.mark.parametrize("block_size", [0, 3, 4])
+    def test_copy_tracking(self, arr, block_size):
+        arr[1] = 0
+        arr[9] = 0
+        larger = TrackedArray(np.zeros(12, dtype=int), block_size=block_size)
+        larger[:10] = arr
+        larger.copy_tracking(arr)
+        assert np.array_equal(np.flatnonzero(larger.changed), [1, 9])
+
+    def assert_diff_equal(self, arr, expected):
+        for diff, exp in zip(arr.diff(), expected):
+            assert np.array_equal(diff, exp)
+
 
 @pytest.mark.parametrize(
     "a, b, op, expected",
@@ -324,6 +520,14 @@ def test_invalid_shape_for_matrix():
         TrackedCSRArray([0, 1, 1], np.array([0, 1, 3])).as_matrix()
 
 
+def test_matrix_view_shares_data():
+    array = TrackedCSRArray(np.array([0.0, 0.0, 1.0, 1.0]), np.array([0, 2, 4]))
+    view = array.matrix_view()
+    view[1, 0] = 2
+    np.testing.assert_array_equal(array.data, [0, 0, 2, 1])
+    assert not np.any(array.changed)
+
+
 @pytest.mark.parametrize(
     "array, matrix, exp_change, exp_data, exp_rowptr",
     [
@@ -2,7 +2,11 @@ import numpy as np
 import pytest
 
 from movici_simulation_core.core import DataType
-from movici_simulation_core.core.arrays import TrackedArray, TrackedCSRArray
+from movici_simulation_core.core.arrays import (
+    TrackedArray,
+    TrackedCSRArray,
+    set_tracking_block_size,
+)
 from movici_simulation_core.core.attribute import (
     Attribute,
     AttributeOptions,
@@ -494,6 +498,18 @@ def test_grow_uniform_attribute():
     assert np.array_equal(attr.array, [1, 2, 3, data_type.undefined])
 
 
+def test_uniform_attribute_values_does_not_track_changes():
+    attr = UniformAttribute([1, 2, 3], data_type=DataType(int, (), False))
+    assert np.array_equal(attr.values[:2], [1, 2])
+    assert attr.array._curr is None
+
+
+def test_uniform_attribute_values_requires_data():
+    attr = UniformAttribute(None, data_type=DataType(int, (), False))
+    with pytest.raises(ValueError):
+        _ = attr.values
+
+
 def test_grow_uniform_attribute_keeps_changes():
     data_type = DataType(int, (), False)
     attr = UniformAttribute([1, 2, 3], data_type=data_type)
@@ -503,6 +519,19 @@ def test_grow_uniform_attribute_keeps_changes():
     assert np.array_equal(attr.changed, [True, False, False, False])
 
 
+def test_grow_uniform_attribute_keeps_block_tracked_changes():
+    data_type = DataType(int, (), False)
+    attr = UniformAttribute(TrackedArray([1, 2, 3], block_size=2), data_type=data_type)
+    attr[2] = 2
+    set_tracking_block_size(2)
+    try:
+        attr.resize(5)
+    finally:
+        set_tracking_block_size(None)
+    assert np.array_equal(attr.array, [1, 2, 2, data_type.undefined, data_type.undefined])
+    assert np.array_equal(attr.changed, [False, False, True, False, False])
+
+
 def test_grow_uniform_attribute_keeps_unicode_length():
     data_type = DataType(str, (), False)
     attr = UniformAttribute(["some_long_string"], data_type=data_type)
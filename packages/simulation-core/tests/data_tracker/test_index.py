@@ -1,7 +1,15 @@
 import numpy as np
 import pytest
 
-from movici_simulation_core.core.index import Index, IndexParams, build_index, query_idx
+from movici_simulation_core.core.index import (
+    Index,
+    IndexParams,
+    build_hash_index,
+    build_index,
+    extend_index,
+    hash_query_indices,
+    query_idx,
+)
 
 
 class TestIndex:
@@ -31,6 +39,47 @@ class TestIndex:
     def test_index_length(self):
         assert len(Index()) == 0
 
+    def test_new_ids_must_be_unique(self):
+        index = Index([1, 2, 3])
+        with pytest.raises(ValueError) as exc:
+            index.add_ids([4, 3, 5])
+        assert str(exc.value) == "Duplicate entries detected: 3"
+        assert np.array_equal(index.ids, [1, 2, 3])
+
+    def test_add_ids_in_multiple_steps(self):
+        index = Index()
+        for ids in ([1, 2], [3], [10, 11, 12], [4]):
+            index.add_ids(ids)
+        np.testing.assert_array_equal(index.ids, [1, 2, 3, 10, 11, 12, 4])
+        np.testing.assert_array_equal(index[[4, 12, 3]], [6, 5, 2])
+        assert index.block_count() == 3
+
+    def test_uses_hash_table_for_scattered_ids(self):
+        index = Index(np.arange(1000, 0, -10))
+        assert index.is_hashed()
+        np.testing.assert_array_equal(index[[10, 1000, 500, 12]], [99, 0, 50, -1])
+        assert index[990] == 1
+
+    @pytest.mark.parametrize("ids", [np.arange(100), [3, 40, 11, 25, 10]])
+    def test_uses_blocks_for_contiguous_or_few_ids(self, ids):
+        assert not Index(ids).is_hashed()
+
+    def test_switches_to_hash_table_when_ids_become_scattered(self):
+        index = Index(np.arange(100))
+        assert not index.is_hashed()
+        index.add_ids(np.arange(1000, 5000, 10))
+        assert index.is_hashed()
+        np.testing.assert_array_equal(index[[5, 1010, 1011]], [5, 101, -1])
+
+    def test_grow_hash_table(self):
+        random = np.random.default_rng(seed=42)
+        ids = random.choice(1_000_000, size=1000, replace=False)
+        index = Index(ids[:10])
+        for chunk in np.split(ids[10:], 9):
+            index.add_ids(chunk)
+        assert index.is_hashed()
+        np.testing.assert_array_equal(index[ids], np.arange(1000))
+
 
 class TestBlockIndex:
     @pytest.mark.parametrize(
@@ -63,6 +112,42 @@ class TestBlockIndex:
         index = build_index([1, 2, 7, 8, 9])
         assert query_idx(index.block_from, index.block_to, index.block_offset, not_found) == -1
 
+    @pytest.mark.parametrize(
+        "ids, start",
+        [
+            ([1, 2, 3, 4, 5], 3),
+            ([1, 2, 3, 7, 8], 3),
+            ([7, 8, 1, 2, 9, 3], 2),
+            ([7, 8, 9, 1, 2, 10], 5),
+            ([4, 5, 1, 2, 3], 3),
+        ],
+    )
+    def test_extend_index(self, ids, start):
+        ids = np.asarray(ids)
+        result = extend_index(build_index(ids[:start]), ids, start)
+        expected = build_index(ids)
+        np.testing.assert_array_equal(result.block_from, expected.block_from)
+        np.testing.assert_array_equal(result.block_to, expected.block_to)
+        np.testing.assert_array_equal(result.block_offset, expected.block_offset)
+
+
+class TestHashIndex:
+    @pytest.mark.parametrize("ids", [[2, 3, 4, 8, 9, 12, 13, 14], [-5, 0, 2**40, 7, -(2**40)]])
+    def test_query_indices(self, ids):
+        ids = np.asarray(ids)
+        params = build_hash_index(ids)
+        np.testing.assert_array_equal(
+            hash_query_indices(params.table, params.shift, ids, ids), np.arange(len(ids))
+        )
+
+    def test_not_found(self):
+        ids = np.array([1, 2, 7, 8, 9])
+        params = build_hash_index(ids)
+        np.testing.assert_array_equal(
+            hash_query_indices(params.table, params.shift, ids, np.array([-1, 0, 4, 6, 10])),
+            [-1, -1, -1, -1, -1],
+        )
+
 
 @pytest.mark.parametrize("query", [[1], 1])
 def test_raises_when_not_found(query):
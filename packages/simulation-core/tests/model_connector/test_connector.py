@@ -2,6 +2,7 @@ import json
 from pathlib import Path
 from unittest.mock import Mock, call
 
+import numpy as np
 import pytest
 
 from movici_simulation_core.core.types import ModelAdapterBase
@@ -24,6 +25,7 @@ from movici_simulation_core.model_connector.connector import (
     ConnectorStreamHandler,
     ModelConnector,
     UpdateDataClient,
+    coalesce_update_series,
 )
 from movici_simulation_core.model_connector.init_data import (
     DirectoryInitDataClient,
@@ -31,6 +33,7 @@ from movici_simulation_core.model_connector.init_data import (
     InitDataHandler,
 )
 from movici_simulation_core.networking.client import Sockets
+from movici_simulation_core.testing.helpers import assert_dataset_dicts_equal
 from movici_simulation_core.types import InternalSerializationStrategy
 
 
@@ -116,7 +119,7 @@ class TestModelConnector:
 
     @pytest.fixture
     def update_data(self):
-        return json.dumps({"some": "data"})
+        return json.dumps({"some": "data"}).encode()
 
     @pytest.fixture
     def update_handler(self, update_data):
@@ -173,9 +176,11 @@ class TestModelConnector:
     def test_update_gets_update_data_when_update_has_data(
         self, initialized_connector, update_handler, data_mask
     ):
-        initialized_connector.update(UpdateMessage(1, key="key_a", address="address_a"))
+        initialized_connector.update(
+            UpdateMessage(1, key="key_a", address="address_a", fetch_count=2)
+        )
         assert update_handler.get.call_args == call(
-            key="key_a", address="address_a", mask=data_mask["sub"]
+            key="key_a", address="address_a", mask=data_mask["sub"], fetch_count=2
         )
 
     def test_update_sends_update_data_to_handler(self, initialized_connector, update_handler):
@@ -199,7 +204,7 @@ class TestModelConnector:
         model.update_series.side_effect = update_series
         initialized_connector.update_series(update_series_message)
         assert update_handler.get.call_args == call(
-            address="an_address", key="a_key", mask=data_mask["sub"]
+            address="an_address", key="a_key", mask=data_mask["sub"], fetch_count=None
         )
 
     def test_update_series_processes_result(self, initialized_connector, model):
@@ -213,6 +218,40 @@ class TestModelConnector:
         result = initialized_connector.update(UpdateMessage(1))
         assert result == ResultMessage(key="key", address="address", origin=origin)
 
+    def test_result_contains_metrics(self, initialized_connector, update_data):
+        result = initialized_connector.update(UpdateMessage(1, key="key_a", address="address_a"))
+        assert result.metrics["bytes_in"] == len(update_data)
+        assert result.metrics["bytes_out"] == len(b'{"some": "result"}')
+        assert result.metrics["serialization_time"] > 0
+
+    def test_resets_metrics_on_every_update(self, initialized_connector, update_data):
+        initialized_connector.update(UpdateMessage(1, key="key_a", address="address_a"))
+        result = initialized_connector.update(UpdateMessage(2))
+        assert result.metrics["bytes_in"] == 0
+
+    def test_coalesces_update_series(self, initialized_connector, model, update_handler):
+        initialized_connector.coalesce_updates = True
+        initialized_connector.serialization = Mock(
+            loads_multipart=Mock(
+                side_effect=[
+                    {"ds": {"g": {"id": {"data": np.array([1])}, "a": {"data": np.array([1])}}}},
+                    {"ds": {"g": {"id": {"data": np.array([1])}, "a": {"data": np.array([2])}}}},
+                ]
+            ),
+            dumps_multipart=Mock(return_value=[b"result"]),
+        )
+        model.update_series.return_value = (None, None)
+        initialized_connector.update_series(
+            UpdateSeriesMessage(
+                [UpdateMessage(1, "a", "address"), UpdateMessage(1, "b", "address")]
+            )
+        )
+        assert model.update_series.call_args[0][0] == UpdateSeriesMessage(
+            [UpdateMessage(1, "b", "address")]
+        )
+        (data,) = model.update_series.call_args[1]["data"]
+        assert data["ds"]["g"]["a"]["data"] == [2]
+
     def test_closes_model(self, initialized_connector, model):
         initialized_connector.close(object())
         assert model.close.call_count == 1
@@ -355,3 +394,59 @@ class TestInitDataHandler:
         dstype, path = handler.get(name)
         assert dstype == data_type
         assert path.read_text() == data
+
+
+def entity_update(ids, **attributes):
+    return {
+        "ds": {
+            "g": {
+                "id": {"data": np.asarray(ids)},
+                **{key: {"data": np.asarray(val)} for key, val in attributes.items()},
+            }
+        }
+    }
+
+
+class TestCoalesceUpdateSeries:
+    @pytest.fixture
+    def messages(self):
+        return [
+            UpdateMessage(1, "a", "address"),
+            UpdateMessage(1),
+            UpdateMessage(1, "b", "address"),
+            UpdateMessage(1, "c", "address"),
+        ]
+
+    def test_last_write_wins(self, messages):
+        _, data = coalesce_update_series(
+            UpdateSeriesMessage(messages),
+            [
+                entity_update([1, 2], a=[1.0, 2.0], b=[1, 1]),
+                None,
+                entity_update([2, 3], a=[3.0, 4.0]),
+                entity_update([1], a=[np.nan], b=[5]),
+            ],
+        )
+        assert data[0] is None
+        assert_dataset_dicts_equal(
+            data[1],
+            entity_update([1, 2, 3], a=[1.0, 3.0, 4.0], b=[5, 1, -(2**31)]),
+        )
+
+    def test_merged_update_replaces_last_update_with_data(self, messages):
+        data = [entity_update([1], a=[1.0]), None, entity_update([1], a=[2.0]), None]
+        message, _ = coalesce_update_series(UpdateSeriesMessage(messages), data)
+        assert message == UpdateSeriesMessage([messages[1], messages[2], messages[3]])
+
+    def test_keeps_single_update_as_is(self, messages):
+        data = [None, None, entity_update([1], a=[1.0]), None]
+        message, result = coalesce_update_series(UpdateSeriesMessage(messages), data)
+        assert message == UpdateSeriesMessage(messages)
+        assert result == data
+
+    def test_merges_general_sections(self, messages):
+        first = {**entity_update([1], a=[1.0]), "general": {"enum": {"x": ["a"]}}}
+        second = {**entity_update([1], a=[2.0]), "general": {"enum": {"y": ["b"]}}}
+        _, data = coalesce_update_series(UpdateSeriesMessage(messages[:2]), [first, second])
+        assert data[-1]["general"] == {"enum": {"x": ["a"], "y": ["b"]}}
+        assert "general" in first
@@ -16,6 +16,7 @@ from movici_simulation_core.models.area_aggregation.aggregators import (
     func_max,
     func_min,
     func_sum,
+    functions,
 )
 
 
@@ -164,3 +165,97 @@ def test_aggregate_integral(
     agg.calculate(dt)
     assert np.array_equal(agg.target.array, np.array(result))
     assert np.array_equal(agg.previous_source, agg.source.array)
+
+
+def test_aggregate_mapping_without_row_ptr(float_data):
+    agg = AttributeAggregator(
+        source=float_data([0, 5, 7]),
+        target=float_data([2, 0, 6]),
+        func="max",
+        mapping=QueryResult(indices=np.array([2, 0, 1])),
+    )
+    agg.calculate()
+    np.testing.assert_array_equal(agg.target.array, [7, 0, 5])
+
+
+@pytest.mark.parametrize("func", ["max", "min", "average", "sum", "integral_hours"])
+def test_aggregate_matches_aggregation_function(float_data, func):
+    random = np.random.default_rng(42)
+    source_data = random.random(100)
+    source_data[::7] = -1  # special value
+    mapping = QueryResult(
+        indices=random.integers(0, 100, 300),
+        row_ptr=np.r_[0, np.sort(random.integers(0, 300, 9)), 300],
+    )
+    source = float_data(source_data)
+    source.options.special = -1
+    previous_source = random.random(100)
+    weights = random.random(100)
+    agg = AttributeAggregator(
+        source=source,
+        target=float_data(np.zeros(10)),
+        func=func,
+        mapping=mapping,
+        weights=weights,
+        previous_source=previous_source,
+    )
+    agg.calculate(dt=3600)
+
+    finite = source_data != -1
+    function = functions[func][0]
+    expected = []
+    for source_indices in mapping.iterate():
+        to_count = np.zeros(100, dtype=bool)
+        to_count[source_indices] = True
+        to_count &= finite
+        expected.append(
+            function(
+                source=source_data[to_count],
+                previous_source=previous_source[to_count],
+                weights=weights[to_count],
+                dt=3600,
+                previous_target=0,
+                special=-9999,
+            )
+        )
+    np.testing.assert_allclose(agg.target.array, expected)
+
+
+@pytest.mark.parametrize(
+    "changed, expected",
+    [
+        ([False, False, False], []),
+        ([True, False, False], [0, 2]),
+        ([False, False, True], [2]),
+    ],
+)
+def test_get_affected_targets(aggregator, changed, expected):
+    agg = aggregator("max")
+    np.testing.assert_array_equal(agg.get_affected_targets(np.array(changed)), expected)
+
+
+@pytest.mark.parametrize(
+    "func, result",
+    [
+        ("max", [5, 100, 9]),
+        ("min", [0, 100, 0]),
+        ("sum", [5, 100, 14]),
+    ],
+)
+def test_only_recalculates_targets_with_changed_sources(aggregator, func, result):
+    agg = aggregator(func)
+    agg.calculate()
+    agg.source.reset()
+    agg.target[1] = 100
+    agg.source[2] = 9
+    agg.calculate()
+    np.testing.assert_array_equal(agg.target.array, result)
+
+
+def test_recalculates_all_targets_after_new_mapping(aggregator):
+    agg = aggregator("max")
+    agg.calculate()
+    agg.source.reset()
+    agg.add_mapping(QueryResult(indices=np.array([2, 1, 0]), row_ptr=np.array([0, 1, 2, 3])))
+    agg.calculate()
+    np.testing.assert_array_equal(agg.target.array, [7, 5, 0])
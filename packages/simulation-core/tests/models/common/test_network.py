@@ -2,6 +2,7 @@ from unittest import mock
 
 import numpy as np
 import pytest
+from scipy.sparse.csgraph import shortest_path
 
 from movici_simulation_core.core.index import Index
 from movici_simulation_core.models.common.entity_groups import (
@@ -9,7 +10,12 @@ from movici_simulation_core.models.common.entity_groups import (
     PointEntity,
     TransportSegmentEntity,
 )
-from movici_simulation_core.models.common.network import Graph, Network, link_indices
+from movici_simulation_core.models.common.network import (
+    Graph,
+    Network,
+    ShortestPathCache,
+    link_indices,
+)
 from movici_simulation_core.testing.helpers import create_entity_group_with_data
 
 
@@ -262,18 +268,39 @@ class TestNetwork1:
         np.testing.assert_array_almost_equal(result, [[0, 1, 2], [1, 0, 1], [np.inf, np.inf, 0]])
 
     def test_caches_results(self, network: Network):
-        with mock.patch(Network.__module__ + ".shortest_path") as shortest_path:
+        with mock.patch(
+            Network.__module__ + ".shortest_path", wraps=shortest_path
+        ) as shortest_path_mock:
             network.get_shortest_path(6)
             network.get_shortest_path(6)
             network.get_shortest_path(7)
-        assert shortest_path.call_count == 2
+        assert shortest_path_mock.call_count == 2
 
     def test_clears_cache_on_new_cost_factor(self, network: Network):
-        with mock.patch(Network.__module__ + ".shortest_path") as shortest_path:
+        with mock.patch(
+            Network.__module__ + ".shortest_path", wraps=shortest_path
+        ) as shortest_path_mock:
             network.get_shortest_path(6)
-            network.update_cost_factor(network.cost_factor)
+            network.update_cost_factor([1, 2, 1, 1, 1, 1])  # 2->4 is part of the tree of 6
             network.get_shortest_path(6)
-        assert shortest_path.call_count == 2
+        assert shortest_path_mock.call_count == 2
+
+    @pytest.mark.parametrize(
+        "cost_factor",
+        [
+            [1, 1, 1, 1, 1, 1],  # unchanged
+            [2, 1, 1, 1, 1, 1],  # 1->2 cannot be reached from 6
+            [1, 1, 1, 1, 1, 2],  # 4->2 is not part of the tree of 6
+        ],
+    )
+    def test_keeps_cache_for_unaffected_source(self, network: Network, cost_factor):
+        with mock.patch(
+            Network.__module__ + ".shortest_path", wraps=shortest_path
+        ) as shortest_path_mock:
+            network.get_shortest_path(6)
+            network.update_cost_factor(cost_factor)
+            network.get_shortest_path(6)
+        assert shortest_path_mock.call_count == 1
 
 
 class TestNetwork2:
@@ -514,3 +541,224 @@ def test_csr_argslice(rowidx, colidx, expected):
     indptr = np.array([0, 2, 8, 9])
     indices = np.array([0, 1, 2, 3, 3, 5, 6, 7, 8])
     np.testing.assert_equal(link_indices(indptr, indices, rowidx, colidx), expected)
+
+
+@pytest.fixture
+def grid_network():
+    r"""
+    A 4x4 grid of transport nodes with bidirectional links with equal cost factors, so that there
+    are many equally short paths, and a virtual node connected to every corner and to the center
+
+    (100)-0--1--2--3-(101)
+          |  |  |  |
+          4--5--6--7
+          |  |  |  |
+          8--9-10-11
+          |  |  |  |
+    (102)-12-13-14-15-(103)
+    """
+    size = 4
+    from_node_id, to_node_id = [], []
+    for row in range(size):
+        for col in range(size):
+            node = row * size + col
+            if col < size - 1:
+                from_node_id.append(node)
+                to_node_id.append(node + 1)
+            if row < size - 1:
+                from_node_id.append(node)
+                to_node_id.append(node + size)
+    link_count = len(from_node_id)
+    transport_nodes = create_entity_group_with_data(
+        PointEntity("t"), {"id": list(range(size * size))}
+    )
+    virtual_nodes = create_entity_group_with_data(
+        PointEntity("v"), {"id": [100, 101, 102, 103, 104]}
+    )
+    transport_links = create_entity_group_with_data(
+        TransportSegmentEntity("tl"),
+        {
+            "id": list(range(200, 200 + link_count)),
+            "topology.from_node_id": from_node_id,
+            "topology.to_node_id": to_node_id,
+            "transport.layout": [[0, 0, 1, 0]] * link_count,
+        },
+    )
+    virtual_links = create_entity_group_with_data(
+        LinkEntity("vl"),
+        {
+            "id": [300, 301, 302, 303, 304],
+            "topology.from_node_id": [100, 3, 102, 15, 104],
+            "topology.to_node_id": [0, 101, 12, 103, 5],
+        },
+    )
+    return Network(
+        transport_nodes,
+        transport_links,
+        virtual_nodes,
+        virtual_links,
+        np.ones((link_count,), dtype=float),
+    )
+
+
+class TestBatchedShortestPaths:
+    @pytest.fixture(params=["grid_network", "network_1", "network_2", "network_4"])
+    def network(self, request):
+        return request.getfixturevalue(request.param)
+
+    @staticmethod
+    def single_source_shortest_path(network: Network, source_node_id):
+        network.set_source_node(source_node_id)
+        return network.graph.shortest_path(network.all_node_index[source_node_id])
+
+    def test_batched_shortest_paths_match_single_source(self, network: Network):
+        dist, prev = network.get_shortest_paths(network.virtual_node_ids)
+        for row, ident in enumerate(network.virtual_node_ids):
+            expected_dist, expected_prev = self.single_source_shortest_path(network, ident)
+            np.testing.assert_allclose(dist[row], expected_dist)
+            np.testing.assert_array_equal(prev[row], expected_prev)
+
+    def test_batches_sources(self, network: Network):
+        expected = network.all_shortest_paths()
+        network._cache.clear()
+        with (
+            mock.patch.object(network, "MAX_BATCH_ELEMENTS", 1),
+            mock.patch(
+                Network.__module__ + ".shortest_path", wraps=shortest_path
+            ) as shortest_path_mock,
+        ):
+            result = network.all_shortest_paths()
+        np.testing.assert_allclose(result, expected)
+        assert shortest_path_mock.call_count == len(network.virtual_node_ids)
+
+    def test_solves_all_sources_in_single_call(self, network: Network):
+        with mock.patch(
+            Network.__module__ + ".shortest_path", wraps=shortest_path
+        ) as shortest_path_mock:
+            network.all_shortest_paths()
+        assert shortest_path_mock.call_count == 1
+
+    def test_all_shortest_paths_sum_matches_single_source(self, network: Network):
+        values = np.arange(network.tl_count, dtype=float)
+        result = network.all_shortest_paths_sum(values)
+        for row, ident in enumerate(network.virtual_node_ids):
+            np.testing.assert_allclose(result[row], network.shortest_path_sum(ident, values))
+
+    def test_all_shortest_paths_weighted_average_matches_single_source(self, network: Network):
+        values = np.arange(network.tl_count, dtype=float)
+        result = network.all_shortest_paths_weighted_average(values)
+        for row, ident in enumerate(network.virtual_node_ids):
+            np.testing.assert_allclose(
+                result[row], network.shortest_path_weighted_average(ident, values)
+            )
+
+    def test_parallel_shortest_paths_match_serial(self, network: Network):
+        values = np.arange(network.tl_count, dtype=float)
+        expected_dist, expected_prev = network.get_shortest_paths(network.virtual_node_ids)
+        expected_sum = network.all_shortest_paths_sum(values)
+        expected_avg = network.all_shortest_paths_weighted_average(values)
+
+        network._cache.clear()
+        network.graph.workers = 2
+        try:
+            dist, prev = network.get_shortest_paths(network.virtual_node_ids)
+            np.testing.assert_array_equal(dist, expected_dist)
+            np.testing.assert_array_equal(prev, expected_prev)
+            np.testing.assert_array_equal(network.all_shortest_paths_sum(values), expected_sum)
+            np.testing.assert_array_equal(
+                network.all_shortest_paths_weighted_average(values), expected_avg
+            )
+        finally:
+            network.close()
+
+    def test_parallel_shortest_paths_after_cost_factor_update(self, network: Network):
+        network.graph.workers = 2
+        try:
+            network.get_shortest_paths(network.virtual_node_ids)
+            cost_factor = network.cost_factor.copy()
+            cost_factor[:2] *= 3
+            network.update_cost_factor(cost_factor)
+            network._cache.clear()
+            dist, prev = network.get_shortest_paths(network.virtual_node_ids)
+
+            network.graph.workers = 1
+            network._cache.clear()
+            expected_dist, expected_prev = network.get_shortest_paths(network.virtual_node_ids)
+            np.testing.assert_array_equal(dist, expected_dist)
+            np.testing.assert_array_equal(prev, expected_prev)
+        finally:
+            network.close()
+
+    def test_incremental_update_matches_full_recalculation(self, network: Network):
+        rng = np.random.default_rng(1)
+        network.all_shortest_paths()
+        for _ in range(10):
+            cost_factor = network.cost_factor.copy()
+            changed = rng.choice(network.tl_count, size=2)
+            cost_factor[changed] = rng.choice([0.5, 1, 2, 3], size=2)
+            network.update_cost_factor(cost_factor)
+            result = network.all_shortest_paths()
+
+            network._cache.clear()
+            np.testing.assert_allclose(result, network.all_shortest_paths())
+
+    def test_raises_on_invalid_source_node(self, network: Network):
+        with pytest.raises(ValueError):
+            network.get_shortest_paths([network.transport_node_ids[0]])
+
+
+class TestShortestPathCache:
+    @staticmethod
+    def entry(size=4):
+        return np.zeros((size,), dtype=np.float64), np.zeros((size,), dtype=np.int32)
+
+    def test_counts_hits_and_misses(self):
+        cache = ShortestPathCache()
+        cache[1] = self.entry()
+        assert cache.get(1) is not None
+        assert cache.get(2) is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_tracks_nbytes(self):
+        cache = ShortestPathCache()
+        cache[1] = self.entry(4)
+        cache[2] = self.entry(4)
+        assert cache.nbytes == 2 * (4 * 8 + 4 * 4)
+        del cache[1]
+        assert cache.nbytes == 4 * 8 + 4 * 4
+
+    def test_evicts_least_recently_used(self):
+        cache = ShortestPathCache(max_bytes=2 * (4 * 8 + 4 * 4))
+        cache[1] = self.entry()
+        cache[2] = self.entry()
+        cache.get(1)
+        cache[3] = self.entry()
+        assert 1 in cache
+        assert 2 not in cache
+        assert 3 in cache
+        assert cache.evictions == 1
+
+    def test_does_not_store_entry_larger_than_budget(self):
+        cache = ShortestPathCache(max_bytes=10)
+        cache[1] = self.entry()
+        assert len(cache) == 0
+        assert cache.nbytes == 0
+
+    def test_log_statistics(self):
+        cache = ShortestPathCache()
+        cache[1] = self.entry()
+        cache.get(1)
+        logger = mock.Mock()
+        cache.log_statistics(logger)
+        assert "1 hits, 0 misses" in logger.log.call_args[0][1]
+
+
+def test_network_with_cache_size(grid_network: Network):
+    network = grid_network
+    expected = network.all_shortest_paths()
+    row_size = network.graph.node_count * (8 + 4)
+    network._cache = ShortestPathCache(max_bytes=2 * row_size)
+
+    np.testing.assert_allclose(network.all_shortest_paths(), expected)
+    assert len(network.cache) == 2
+    assert network.cache.evictions == len(network.virtual_node_ids) - 2
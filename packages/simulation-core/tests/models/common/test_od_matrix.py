@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from movici_simulation_core.core.arrays import TrackedCSRArray
+from movici_simulation_core.models.common.od_matrix import ODMatrix
+
+
+@pytest.fixture
+def demand():
+    return np.arange(9, dtype=float).reshape((3, 3))
+
+
+@pytest.fixture
+def od_matrix(demand):
+    return ODMatrix.from_matrix(demand)
+
+
+def test_od_matrix_requires_square_matrix():
+    with pytest.raises(ValueError):
+        ODMatrix(TrackedCSRArray(np.zeros(6), np.array([0, 3, 6])))
+
+
+def test_factors_are_only_applied_on_apply(od_matrix, demand):
+    od_matrix.scale(2)
+    np.testing.assert_array_equal(od_matrix.as_matrix(), demand)
+    od_matrix.apply()
+    np.testing.assert_array_equal(od_matrix.as_matrix(), 2 * demand)
+
+
+def test_apply_updates_csr_in_place(od_matrix, demand):
+    data = od_matrix.csr.data
+    od_matrix.scale(2)
+    od_matrix.apply()
+    assert od_matrix.csr.data is data
+
+
+def test_scale_outer(od_matrix, demand):
+    od_matrix.scale_outer(np.array([1, 2, 3]), np.array([1, 1, 2]))
+    od_matrix.apply()
+    np.testing.assert_array_equal(od_matrix.as_matrix(), demand * np.outer([1, 2, 3], [1, 1, 2]))
+
+
+def test_scale_outer_defaults_to_symmetric_factors(od_matrix, demand):
+    od_matrix.scale_outer(np.array([1, 2, 3]))
+    od_matrix.apply()
+    np.testing.assert_array_equal(od_matrix.as_matrix(), demand * np.outer([1, 2, 3], [1, 2, 3]))
+
+
+def test_multiply_full_matrix(od_matrix, demand):
+    factors = np.arange(9, 18, dtype=float).reshape((3, 3))
+    od_matrix.multiply(factors)
+    od_matrix.apply()
+    np.testing.assert_array_equal(od_matrix.as_matrix(), demand * factors)
+
+
+def test_multiply_indexed_matrix(od_matrix, demand):
+    factors = np.array([[1, 2], [3, 4]], dtype=float)
+    indices = np.array([1, 0, 1])
+    od_matrix.multiply(factors, indices)
+    od_matrix.apply()
+    np.testing.assert_array_equal(
+        od_matrix.as_matrix(), demand * factors[np.ix_(indices, indices)]
+    )
+
+
+@pytest.mark.parametrize(
+    "factors, indices",
+    [
+        (np.ones((2, 2)), None),
+        (np.ones((2, 3)), np.array([0, 1, 1])),
+        (np.ones((2, 2)), np.array([0, 1])),
+    ],
+)
+def test_multiply_with_invalid_shape_raises(od_matrix, factors, indices):
+    with pytest.raises(ValueError):
+        od_matrix.multiply(factors, indices)
+
+
+def test_combines_factors(od_matrix, demand):
+    od_matrix.scale(2)
+    od_matrix.scale_outer(np.array([1, 2, 3]))
+    od_matrix.multiply(np.array([[1, 2], [3, 4]]), np.array([0, 0, 1]))
+    od_matrix.apply()
+    expected = (
+        2 * demand * np.outer([1, 2, 3], [1, 2, 3]) * np.array([[1, 1, 2], [1, 1, 2], [3, 3, 4]])
+    )
+    np.testing.assert_array_equal(od_matrix.as_matrix(), expected)
+
+
+def test_tracks_changed_rows(od_matrix):
+    od_matrix.scale_outer(np.array([1, 2, 1]), np.ones(3))
+    od_matrix.apply()
+    np.testing.assert_array_equal(od_matrix.csr.changed, [False, True, False])
+
+
+def test_does_not_track_changes_within_tolerance(demand):
+    od_matrix = ODMatrix(TrackedCSRArray(demand.flatten(), np.array([0, 3, 6, 9]), rtol=1e-3))
+    od_matrix.scale(1.0001)
+    od_matrix.apply()
+    assert not np.any(od_matrix.csr.changed)
+
+
+def test_applies_in_blocks(od_matrix, demand):
+    od_matrix.BLOCK_ELEMENTS = 1
+    od_matrix.scale_outer(np.array([1, 2, 3]))
+    od_matrix.apply()
+    np.testing.assert_array_equal(od_matrix.as_matrix(), demand * np.outer([1, 2, 3], [1, 2, 3]))
+    np.testing.assert_array_equal(od_matrix.csr.changed, [True, True, True])
+
+
+def test_apply_copies_read_only_data(demand):
+    data = demand.flatten()
+    data.flags.writeable = False
+    od_matrix = ODMatrix(TrackedCSRArray(data, np.array([0, 3, 6, 9])))
+    od_matrix.scale(2)
+    od_matrix.apply()
+    np.testing.assert_array_equal(od_matrix.as_matrix(), 2 * demand)
+
+
+def test_row_and_column_sums(od_matrix, demand):
+    np.testing.assert_array_equal(od_matrix.row_sums(), demand.sum(axis=1))
+    np.testing.assert_array_equal(od_matrix.column_sums(), demand.sum(axis=0))
@@ -175,6 +175,32 @@ class TestShortestPathModel:
         ]
         np.testing.assert_allclose(length, expected)
 
+    def test_shortest_path_model_with_workers(
+        self,
+        create_model_tester,
+        get_model_config,
+        update_data,
+        road_network_name,
+    ):
+        model_config = get_model_config(
+            calculation={
+                "type": "sum",
+                "input": "shape.length",
+                "output": "transport.shortest_path_length",
+            },
+            workers=2,
+        )
+        tester = create_model_tester(
+            ShortestPathModel, model_config, raise_on_premature_shutdown=False
+        )
+        tester.initialize()
+        result, _ = tester.update(0, update_data)
+        tester.close()
+        length = result[road_network_name]["virtual_node_entities"][
+            "transport.shortest_path_length"
+        ]
+        np.testing.assert_allclose(length, [[0, 5, 2], [1, 0, 3], [4, 3, 0]])
+
     def test_update_shortest_path(
         self,
         create_model_tester,
@@ -346,6 +372,8 @@ def json_schema():
         (None, None),
         ({"no_update_shortest_path": True}, None),
         ({"no_update_shortest_path": False}, None),
+        ({"workers": 4}, None),
+        ({"cache_size": 1000000}, None),
         (
             None,
             {
@@ -380,6 +408,8 @@ def test_validate_model_config(
     "extra_props, calculation",
     [
         ({"invalid": True}, None),
+        ({"workers": 0}, None),
+        ({"cache_size": -1}, None),
         (
             None,
             {
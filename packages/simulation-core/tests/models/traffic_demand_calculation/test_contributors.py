@@ -12,6 +12,7 @@ from movici_simulation_core.core.moment import Moment
 from movici_simulation_core.core.state import TrackedState
 from movici_simulation_core.models.common.csv_tape import CsvTape
 from movici_simulation_core.models.common.entity_groups import GeometryEntity
+from movici_simulation_core.models.common.od_matrix import ODMatrix
 from movici_simulation_core.models.traffic_demand_calculation.common import (
     DemandEstimation,
     LocalMapper,
@@ -131,25 +132,32 @@ class TestNearestValueContributor:
         np.testing.assert_array_equal(calculator._indices, [0, 1])
 
     def test_update_demand_first_time_doesnt_change_demand(self, calculator):
-        input_matrix = np.array([[0, 1], [1, 0]])
-        result = calculator.update_demand(input_matrix)
-        np.testing.assert_array_equal(result, input_matrix)
+        input_matrix = np.array([[0, 1], [1, 0]], dtype=float)
+        matrix = ODMatrix.from_matrix(input_matrix)
+        calculator.update_demand(matrix)
+        matrix.apply()
+        np.testing.assert_array_equal(matrix.as_matrix(), input_matrix)
+        assert not np.any(matrix.csr.changed)
 
     @pytest.mark.parametrize("force", [True, False])
     def test_demand_stays_equal_on_no_change_attribute(self, calculator, force):
-        input_matrix = np.array([[0, 1], [1, 0]])
-        calculator.update_demand(input_matrix)
-        result = calculator.update_demand(input_matrix, force_update=force)
-        np.testing.assert_array_equal(result, input_matrix)
+        input_matrix = np.array([[0, 1], [1, 0]], dtype=float)
+        matrix = ODMatrix.from_matrix(input_matrix)
+        calculator.update_demand(matrix)
+        calculator.update_demand(matrix, force_update=force)
+        matrix.apply()
+        np.testing.assert_array_equal(matrix.as_matrix(), input_matrix)
+        assert not np.any(matrix.csr.changed)
 
     def test_update_demand(self, calculator, attribute):
-        input_matrix = np.array([[0, 1], [1, 0]])
-        calculator.update_demand(input_matrix)
+        matrix = ODMatrix.from_matrix(np.array([[0, 1], [1, 0]], dtype=float))
+        calculator.update_demand(matrix)
         attribute[:] = [4, 4, 4, 4, 4]
-        result = calculator.update_demand(input_matrix)
+        calculator.update_demand(matrix)
+        matrix.apply()
         exp = (4 / 1 * 4 / 2) ** 2
         np.testing.assert_array_equal(
-            result,
+            matrix.as_matrix(),
             [
                 [0, exp],
                 [exp, 0],
@@ -213,9 +221,9 @@ def test_calculate_localized_multiplication_factor():
 
     exp = (values / old_values) ** elasticity  # [0.25000, 0.44444, 0.56250]
 
-    # result should be a matrix where every value at ij = exp[i]*exp[j]. We can achieve
-    # this by calculating the outer product of exp x exp
-    np.testing.assert_array_equal(result, np.outer(exp, exp))
+    # The factor for every OD pair ij = exp[i]*exp[j], which is the outer product of the
+    # result with itself
+    np.testing.assert_array_equal(result, exp)
 
 
 @pytest.mark.parametrize("node_i, expected", zip(range(5), [1 / 2, 2 / 3, 3 / 4, 1, 1]))
@@ -275,8 +283,10 @@ class TestRouteCostFactor:
     def test_calculate_values(self, calculator, attribute, input_val):
         base_path_travel_costs = np.array([[0, 0, 2], [0, 0, 2], [1, 1, 0]])
         attribute[:] = input_val
+        values = calculator.calculate_values()
+        indices = calculator._factor_indices
         np.testing.assert_allclose(
-            calculator.calculate_values(),
+            values[np.ix_(indices, indices)],
             base_path_travel_costs * input_val,
             rtol=1e-10,
             atol=1e-11,
@@ -285,14 +295,16 @@ class TestRouteCostFactor:
     def test_update_demand(self, calculator, attribute):
         base_costs = np.array([[0, 0, 2], [0, 0, 2], [1, 1, 0]])
         input_matrix = np.ones_like(base_costs, dtype=float)
+        matrix = ODMatrix.from_matrix(input_matrix)
 
-        calculator.update_demand(input_matrix)
+        calculator.update_demand(matrix)
         attribute[:] = 2
-        result = calculator.update_demand(input_matrix)
+        calculator.update_demand(matrix)
+        matrix.apply()
 
         expected = np.ones_like(input_matrix)
         expected[np.nonzero(base_costs)] = 2**2  # (2*bc/bc) ** elasticity
-        np.testing.assert_allclose(result, expected, rtol=1e-10, atol=1e-11)
+        np.testing.assert_allclose(matrix.as_matrix(), expected, rtol=1e-10, atol=1e-11)
 
 
 def test_demand_estimation_global_parameters_update_demand(simple_demand):
@@ -309,8 +321,10 @@ def test_demand_estimation_global_parameters_update_demand(simple_demand):
     )
     estimator.global_params[0].curr = 1
     expected_factor = (0.5 / 1) ** (2 * 2) * 3
-    updated = estimator.update(simple_demand, moment=Moment(0))
-    np.testing.assert_array_equal(updated, simple_demand * expected_factor)
+    matrix = ODMatrix.from_matrix(simple_demand)
+    estimator.update(matrix, moment=Moment(0))
+    matrix.apply()
+    np.testing.assert_array_equal(matrix.as_matrix(), simple_demand * expected_factor)
 
 
 class TestInvestmentContributor:
@@ -372,7 +386,8 @@ class TestInvestmentContributor:
         ],
     )
     def test_update_demand(self, contributor, investments, seconds, expected, exp_remaining):
-        matrix = np.ones((3, 3), dtype=float)
-        result = contributor.update_demand(matrix, moment=Moment.from_seconds(seconds))
-        np.testing.assert_array_equal(result, expected)
+        matrix = ODMatrix.from_matrix(np.ones((3, 3), dtype=float))
+        contributor.update_demand(matrix, moment=Moment.from_seconds(seconds))
+        matrix.apply()
+        np.testing.assert_array_equal(matrix.as_matrix(), expected)
         assert len(contributor.investments) == exp_remaining
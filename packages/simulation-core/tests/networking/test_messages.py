@@ -37,8 +37,10 @@ from movici_simulation_core.messages import (
         QuitMessage(due_to_failure=True),
         GetDataMessage("key", {"some": "filter"}),
         PutDataMessage("key", b"some_data"),
+        PutDataMessage("key", [b"header", b"some_data"]),
         ClearDataMessage("key"),
         DataMessage(b"some_data"),
+        DataMessage([b"header", b"some_data"]),
         ErrorMessage(),
         PathMessage(path=Path("/some/path")),
         PathMessage(path=None),
@@ -51,7 +53,8 @@ def test_serialization_deserialization(message):
 def test_dump_update_message():
     assert dump_message(UpdateMessage(1, None, None, origin="some_model")) == [
         b"UPDATE",
-        b'{"timestamp": 1, "key": null, "address": null, "origin": "some_model"}',
+        b'{"timestamp": 1, "key": null, "address": null, "origin": "some_model", '
+        b'"fetch_count": null}',
     ]
 
 
@@ -60,13 +63,14 @@ def test_dump_update_series():
         UpdateSeriesMessage(
             updates=[
                 UpdateMessage(1, None, None),
-                UpdateMessage(2, "some_key", "some_address"),
+                UpdateMessage(2, "some_key", "some_address", fetch_count=1),
             ]
         )
     ) == [
         b"UPDATE_SERIES",
-        b'{"timestamp": 1, "key": null, "address": null, "origin": null}',
-        b'{"timestamp": 2, "key": "some_key", "address": "some_address", "origin": null}',
+        b'{"timestamp": 1, "key": null, "address": null, "origin": null, "fetch_count": null}',
+        b'{"timestamp": 2, "key": "some_key", "address": "some_address", "origin": null, '
+        b'"fetch_count": 1}',
     ]
 
 
@@ -93,6 +97,27 @@ def test_dump_update_data_message():
     assert dump_message(DataMessage(b"some_data")) == [b"DATA", b"some_data"]
 
 
+def test_dump_multipart_data_message():
+    assert dump_message(PutDataMessage("key", [b"header", b"data"])) == [
+        b"PUT",
+        b"key",
+        b"header",
+        b"data",
+    ]
+
+
+def test_data_message_unpacks_single_frame():
+    assert DataMessage([b"some_data"]).data == b"some_data"
+
+
+def test_data_message_size_counts_all_frames():
+    assert DataMessage([b"header", memoryview(bytes(10))]).size == 16
+
+
+def test_load_message_converts_buffers_for_regular_messages():
+    assert load_message(b"NEW_TIME", memoryview(b'{"timestamp": 1}')) == NewTimeMessage(1)
+
+
 def test_error_on_invalid_message_content():
     with pytest.raises(ValueError):
         ResultMessage(key=None, address="something")
@@ -1,11 +1,19 @@
 import typing as t
 from unittest.mock import MagicMock, Mock, call
 
+import numpy as np
 import pytest
 import zmq
 
+from movici_simulation_core.core.serialization import UpdateDataFormat
 from movici_simulation_core.exceptions import InvalidMessage
-from movici_simulation_core.messages import AcknowledgeMessage, Message, QuitMessage, dump_message
+from movici_simulation_core.messages import (
+    AcknowledgeMessage,
+    DataMessage,
+    Message,
+    QuitMessage,
+    dump_message,
+)
 from movici_simulation_core.networking.stream import (
     MessageDealerSocket,
     MessageReqSocket,
@@ -96,6 +104,41 @@ class TestRouterSocket:
             [b"model", b"", b"ACK", b"{}"]
         )
 
+    def test_send_large_frames_without_copying(self, socket_adapter):
+        data = [b"header", bytes(socket_adapter.copy_threshold)]
+        socket_adapter.send(("model", DataMessage(data)))
+        assert socket_adapter.socket.send_multipart.call_args == call(
+            [b"model", b"", b"DATA", *data], copy=False
+        )
+
+
+class TestMultipartDataMessages:
+    @pytest.fixture
+    def sockets(self):
+        context = zmq.Context.instance()
+        router = MessageRouterSocket(context.socket(zmq.ROUTER))
+        dealer = MessageDealerSocket(context.socket(zmq.DEALER))
+        dealer.socket.set(zmq.IDENTITY, b"model")
+        router.bind("inproc://test_multipart")
+        dealer.connect("inproc://test_multipart")
+        yield router, dealer
+        dealer.close(linger=0)
+        router.close(linger=0)
+
+    def test_send_and_receive_arrays_as_frames(self, sockets):
+        router, dealer = sockets
+        serialization = UpdateDataFormat()
+        data = {"dataset": {"entities": {"id": np.arange(100_000), "attr": np.ones(10)}}}
+
+        router.send(("model", DataMessage(serialization.dumps_multipart(data))))
+        message = dealer.recv()
+
+        assert len(message.frames) == 3
+        assert isinstance(message.frames[1], memoryview)
+        result = serialization.loads_multipart(message.frames, copy=False)
+        np.testing.assert_array_equal(result["dataset"]["entities"]["id"], np.arange(100_000))
+        np.testing.assert_array_equal(result["dataset"]["entities"]["attr"], np.ones(10))
+
 
 class TestDealerSocket:
     @pytest.fixture
@@ -9,6 +9,7 @@ from movici_simulation_core.messages import (
     UpdateMessage,
 )
 from movici_simulation_core.services.orchestrator.context import ConnectedModel, TimelineController
+from movici_simulation_core.services.orchestrator.telemetry import Telemetry, UpdateRecord
 
 
 @pytest.fixture
@@ -71,6 +72,48 @@ class TestConnectedModel:
         assert not running_model.timer.running
         assert not running_model.busy
 
+    def test_result_message_records_update_time(self, running_model):
+        running_model.timer.now = Mock(return_value=running_model.timer.started_at + 2)
+        running_model.recv_event(ResultMessage())
+        assert running_model.update_count == 1
+        assert running_model.mean_update_time == pytest.approx(2)
+
+    def test_result_message_records_telemetry(self, running_model):
+        running_model.telemetry = Telemetry()
+        running_model.timer.now = Mock(return_value=running_model.timer.started_at + 2)
+        running_model.recv_event(
+            ResultMessage(metrics={"bytes_in": 10, "bytes_out": 20, "serialization_time": 0.5})
+        )
+        assert running_model.telemetry.records == [
+            UpdateRecord(
+                "dummy",
+                timestamp=0,
+                latency=pytest.approx(2),
+                bytes_in=10,
+                bytes_out=20,
+                serialization_time=0.5,
+            )
+        ]
+
+    def test_records_time_waiting_for_dependencies(self, model, subscriber):
+        subscriber.telemetry = Telemetry()
+        subscriber.subscribed_to = [model]
+        model.recv_event(UpdateMessage(0))
+        subscriber.recv_event(ResultMessage())
+        subscriber.recv_event(UpdateMessage(0))
+        assert subscriber.wait_timer.running
+
+        model.recv_event(ResultMessage())
+        assert not subscriber.wait_timer.running
+        subscriber.wait_timer._total_elapsed = 3
+        subscriber.recv_event(ResultMessage())
+        assert subscriber.telemetry.records[-1].wait_time == 3
+
+    def test_record_update_time_keeps_mean(self, model):
+        for seconds in (1, 2, 6):
+            model.record_update_time(seconds)
+        assert model.mean_update_time == pytest.approx(3)
+
     def test_registration_message_sets_next_time_to_start(self, timeline):
         model = get_model(
             send=Mock(),
@@ -94,6 +137,7 @@ class TestConnectedModel:
             address=result.address,
             origin="some_model",
         )
+        assert subscriber.pending_updates[0].fetch_count == 1
 
     def test_result_doesnt_queue_subscriber_on_empty_result(
         self, running_model, subscriber, timeline
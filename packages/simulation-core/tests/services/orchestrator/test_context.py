@@ -65,7 +65,7 @@ class TestContext:
             logger=sentinel,
             **kwargs,
         ):
-            a, b = Mock(), Mock()
+            a, b = (Mock(publishes_to=[], mean_update_time=0.0) for _ in range(2))
             return Context(
                 models=models if models is not None else ModelCollection(a=a, b=b),
                 timeline=timeline if timeline is not sentinel else Mock(),
@@ -138,6 +138,27 @@ class TestContext:
         assert a.recv_event.call_args_list == [call(msg) for msg in exp_a]
         assert b.recv_event.call_args_list == [call(msg) for msg in exp_b]
 
+    def test_queues_models_by_priority(self, make_context):
+        order = []
+        models = ModelCollection(
+            **{
+                name: Mock(
+                    publishes_to=[],
+                    mean_update_time=duration,
+                    next_time=0,
+                    recv_event=Mock(side_effect=lambda msg, name=name: order.append(name)),
+                )
+                for name, duration in [("a", 1.0), ("b", 3.0), ("c", 2.0)]
+            }
+        )
+        for name, model in models.items():
+            model.name = name
+        context = make_context(
+            models=models, timeline=TimelineController(start=0, end=20, current_time=0)
+        )
+        context.queue_models_for_next_time()
+        assert order == ["b", "c", "a"]
+
     def test_recv_for_all(self, context):
         assert len(context.models) > 0
         message = object()
@@ -0,0 +1,45 @@
+import dataclasses
+import typing as t
+
+import pytest
+
+from movici_simulation_core.services.orchestrator.scheduling import critical_path_lengths
+
+
+@dataclasses.dataclass(eq=False)
+class Model:
+    name: str
+    mean_update_time: float
+    publishes_to: t.List["Model"] = dataclasses.field(default_factory=list)
+
+
+def connect(*chain: Model):
+    for pub, sub in zip(chain, chain[1:]):
+        pub.publishes_to.append(sub)
+
+
+def test_independent_models():
+    models = [Model("a", 1), Model("b", 2)]
+    assert critical_path_lengths(models) == {"a": 1, "b": 2}
+
+
+def test_chain_of_models():
+    a, b, c = Model("a", 1), Model("b", 2), Model("c", 3)
+    connect(a, b, c)
+    assert critical_path_lengths([a, b, c]) == {"a": 6, "b": 5, "c": 3}
+
+
+def test_takes_longest_downstream_path():
+    a, b, c, d = Model("a", 1), Model("b", 10), Model("c", 1), Model("d", 1)
+    connect(a, b, d)
+    connect(a, c, d)
+    assert critical_path_lengths([a, b, c, d]) == {"a": 12, "b": 11, "c": 2, "d": 1}
+
+
+@pytest.mark.parametrize("order", [[0, 1], [1, 0]])
+def test_breaks_cycles(order):
+    models = [Model("a", 1), Model("b", 2)]
+    connect(models[0], models[1], models[0])
+    result = critical_path_lengths([models[i] for i in order])
+    assert result.keys() == {"a", "b"}
+    assert max(result.values()) == 3
@@ -0,0 +1,92 @@
+import pytest
+
+from movici_simulation_core.services.orchestrator.telemetry import Telemetry, UpdateRecord
+
+
+@pytest.fixture
+def telemetry():
+    return Telemetry(
+        [
+            UpdateRecord("a", 0, latency=1.0, bytes_out=100),
+            UpdateRecord("b", 0, latency=0.5, wait_time=1.0, bytes_in=100),
+            UpdateRecord("a", 10, latency=2.0, serialization_time=0.25),
+            UpdateRecord("b", 10, latency=3.0, wait_time=2.0),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected",
+    [
+        ({}, [0, 1, 2, 3]),
+        ({"model": "a"}, [0, 2]),
+        ({"timestamp": 10}, [2, 3]),
+        ({"model": "b", "timestamp": 0}, [1]),
+        ({"start": 5}, [2, 3]),
+        ({"end": 5}, [0, 1]),
+        ({"model": "c"}, []),
+    ],
+)
+def test_query(telemetry, kwargs, expected):
+    assert telemetry.query(**kwargs) == [telemetry.records[i] for i in expected]
+
+
+def test_summary(telemetry):
+    assert telemetry.summary() == {
+        "a": {
+            "count": 2,
+            "latency": 3.0,
+            "wait_time": 0,
+            "bytes_in": 0,
+            "bytes_out": 100,
+            "serialization_time": 0.25,
+        },
+        "b": {
+            "count": 2,
+            "latency": 3.5,
+            "wait_time": 3.0,
+            "bytes_in": 100,
+            "bytes_out": 0,
+            "serialization_time": 0,
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    "key, expected",
+    [
+        ("latency", "b"),
+        ("bytes_out", "a"),
+        ("serialization_time", "a"),
+    ],
+)
+def test_bottleneck(telemetry, key, expected):
+    assert telemetry.bottleneck(key) == expected
+
+
+def test_bottleneck_without_records():
+    assert Telemetry().bottleneck() is None
+
+
+def test_bottleneck_raises_on_invalid_key(telemetry):
+    with pytest.raises(ValueError):
+        telemetry.bottleneck("model")
+
+
+@pytest.mark.parametrize("filename", ["telemetry.csv", "telemetry.jsonl", "telemetry.sqlite"])
+def test_export_and_load(telemetry, tmp_path, filename):
+    path = tmp_path / filename
+    telemetry.export(path)
+    assert Telemetry.load(path).records == telemetry.records
+
+
+def test_export_overwrites_existing_sqlite_file(telemetry, tmp_path):
+    path = tmp_path / "telemetry.db"
+    Telemetry([UpdateRecord("c", 0)]).export(path)
+    telemetry.export(path)
+    assert Telemetry.load(path).records == telemetry.records
+
+
+def test_raises_on_unsupported_file(telemetry, tmp_path):
+    with pytest.raises(ValueError):
+        telemetry.export(tmp_path / "telemetry.txt")
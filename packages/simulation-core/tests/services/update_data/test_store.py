@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from movici_simulation_core.core.serialization import UpdateDataFormat
+from movici_simulation_core.services.update_data.store import UpdateDataStore, estimate_nbytes
+from movici_simulation_core.testing.helpers import assert_dataset_dicts_equal
+
+
+@pytest.fixture
+def spilled():
+    return []
+
+
+@pytest.fixture
+def store(tmp_path, spilled):
+    return UpdateDataStore(
+        UpdateDataFormat(), memory_limit=200, spill_dir=tmp_path, on_spill=spilled.append
+    )
+
+
+def make_data(value, size=10):
+    return {"dataset": {"entities": {"id": np.arange(size), "attr": np.full(size, value)}}}
+
+
+def test_store_and_retrieve_data(store):
+    store["a"] = make_data(1)
+    assert_dataset_dicts_equal(store["a"], make_data(1))
+    assert store.nbytes == 160
+
+
+def test_spills_least_recently_used_data(store, spilled):
+    store["a"] = make_data(1)
+    store["b"] = make_data(2)
+    assert store.is_spilled("a")
+    assert not store.is_spilled("b")
+    assert spilled == ["a"]
+    assert store.nbytes == 160
+
+
+def test_loads_spilled_data_when_accessed(store, spilled):
+    store["a"] = make_data(1)
+    store["b"] = make_data(2)
+    assert_dataset_dicts_equal(store["a"], make_data(1))
+    assert not store.is_spilled("a")
+    assert store.is_spilled("b")
+    assert spilled == ["a", "b"]
+
+
+def test_access_updates_recently_used_order(tmp_path):
+    store = UpdateDataStore(UpdateDataFormat(), memory_limit=400, spill_dir=tmp_path)
+    store["a"] = make_data(1)
+    store["b"] = make_data(2)
+    store["a"]
+    store["c"] = make_data(3)
+    assert store.is_spilled("b")
+    assert not store.is_spilled("a")
+
+
+def test_deleting_data_frees_memory(store):
+    store["a"] = make_data(1)
+    store["b"] = make_data(2)
+    del store["a"]
+    del store["b"]
+    assert store.nbytes == 0
+    assert len(store) == 0
+
+
+def test_without_memory_limit_nothing_is_spilled(tmp_path):
+    store = UpdateDataStore(UpdateDataFormat(), spill_dir=tmp_path)
+    store["a"] = make_data(1)
+    store["b"] = make_data(2)
+    assert not store.is_spilled("a")
+    assert store.nbytes == 320
+
+
+def test_reserved_bytes_count_towards_memory_limit(store, spilled):
+    store["a"] = make_data(1)
+    assert store.reserve("a", 30)
+    assert store.nbytes == 190
+    assert not store.reserve("a", 30)
+    assert store.nbytes == 190
+    store["b"] = make_data(2)
+    assert spilled == ["a"]
+    assert store.nbytes == 160
+
+
+def test_reserving_bytes_spills_other_data(tmp_path):
+    store = UpdateDataStore(UpdateDataFormat(), memory_limit=400, spill_dir=tmp_path)
+    store["a"] = make_data(1)
+    store["b"] = make_data(2)
+    assert store.reserve("b", 60)
+    assert not store.is_spilled("a")
+    assert store.reserve("b", 60)
+    assert store.is_spilled("a")
+    assert store.nbytes == 280
+
+
+def test_deleting_data_frees_reserved_bytes(store):
+    store["a"] = make_data(1)
+    store.reserve("a", 30)
+    del store["a"]
+    assert store.nbytes == 0
+
+
+def test_spill_files_are_anonymous(store, tmp_path):
+    store["a"] = make_data(1)
+    store["b"] = make_data(2)
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ({"a": np.zeros(10)}, 80),
+        ({"a": {"b": np.zeros(2), "c": [np.zeros(1, dtype=np.int32)]}}, 20),
+        ({"a": "b", "c": None}, 0),
+    ],
+)
+def test_estimate_nbytes(data, expected):
+    assert estimate_nbytes(data) == expected
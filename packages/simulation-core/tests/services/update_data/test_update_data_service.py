@@ -1,9 +1,15 @@
 import logging
 from unittest.mock import Mock, call
 
+import numpy as np
 import pytest
 
-from movici_simulation_core.core.serialization import dump_update, load_update
+from movici_simulation_core.core.serialization import (
+    UpdateDataFormat,
+    dump_update,
+    estimate_nbytes,
+    load_update,
+)
 from movici_simulation_core.messages import (
     AcknowledgeMessage,
     ClearDataMessage,
@@ -14,6 +20,7 @@ from movici_simulation_core.messages import (
 )
 from movici_simulation_core.networking.stream import Stream
 from movici_simulation_core.services.update_data import UpdateDataService
+from movici_simulation_core.settings import Settings
 
 DEFAULT_KEY = "default_key"
 DEFAULT_PAYLOAD = {"some": "payload", "other": "other_payload"}
@@ -92,6 +99,106 @@ def test_put(data_service, raw_payload, payload):
     assert data_service.store["some_key"] == payload
 
 
+def test_put_multipart(data_service):
+    put = PutDataMessage("some_key", UpdateDataFormat().dumps_multipart({"some": np.arange(3)}))
+    data_service.handle_message(put)
+    stored = data_service.store["some_key"]["some"]
+    np.testing.assert_array_equal(stored, [0, 1, 2])
+    assert not stored.flags.writeable
+
+
+def test_get_returns_multipart_data(data_service):
+    data_service.store["some_key"] = {"some": np.arange(3)}
+    resp = data_service.handle_message(GetDataMessage("some_key"))
+    assert len(resp.frames) == 2
+    result = UpdateDataFormat().loads_multipart(resp.frames)
+    np.testing.assert_array_equal(result["some"], [0, 1, 2])
+
+
+def test_get_caches_serialized_data_per_mask(data_service, default_key):
+    data_service.serialization = Mock(wraps=data_service.serialization)
+    for mask in [None, {"some": None}, None, {"some": None}]:
+        data_service.handle_message(GetDataMessage(default_key, mask=mask))
+    assert data_service.serialization.dumps_multipart.call_count == 2
+
+
+def test_put_invalidates_cache(data_service, default_key):
+    data_service.handle_message(GetDataMessage(default_key))
+    data_service.handle_message(PutDataMessage(default_key, dump_update({"new": "payload"})))
+    resp = data_service.handle_message(GetDataMessage(default_key))
+    assert extract_data(resp) == {"new": "payload"}
+
+
+def test_clear_evicts_cache(data_service):
+    data_service.store["other_1"] = {"some": "data"}
+    data_service.handle_message(GetDataMessage("other_1"))
+    data_service.handle_message(ClearDataMessage("other"))
+    assert "other_1" not in data_service.cache
+
+
+def test_get_evicts_data_after_fetch_count(data_service, default_key):
+    data_service.handle_message(GetDataMessage(default_key, fetch_count=2))
+    assert default_key in data_service.store
+    data_service.handle_message(GetDataMessage(default_key, mask={"some": None}, fetch_count=2))
+    assert default_key not in data_service.store
+    assert default_key not in data_service.cache
+
+
+def test_evicted_shared_files_are_removed_on_clear(data_service, tmp_path):
+    data_service.serialization = UpdateDataFormat(shared_memory_dir=tmp_path)
+    raw = data_service.serialization.dumps_multipart({"some": np.array([1, 2, 3])})
+    data_service.handle_message(PutDataMessage("other_1", raw))
+    data_service.handle_message(GetDataMessage("other_1", fetch_count=1))
+    assert "other_1" not in data_service.store
+    assert len(list(tmp_path.iterdir())) == 1
+
+    data_service.handle_message(ClearDataMessage("other"))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_setup_configures_memory_limit(stream, logger, tmp_path):
+    service = UpdateDataService()
+    service.setup(
+        stream=stream,
+        logger=logger,
+        settings=Settings(update_store_memory_limit=100, temp_dir=tmp_path),
+    )
+    assert service.store.memory_limit == 100
+    assert service.store.spill_dir == tmp_path
+
+
+def test_spilling_data_evicts_cache(data_service):
+    data_service.store.memory_limit = 200
+    data_service.handle_message(PutDataMessage("a", dump_update({"data": np.arange(10)})))
+    data_service.handle_message(GetDataMessage("a"))
+    assert "a" in data_service.cache
+    data_service.handle_message(PutDataMessage("b", dump_update({"data": np.arange(10)})))
+    assert data_service.store.is_spilled("a")
+    assert "a" not in data_service.cache
+    resp = data_service.handle_message(GetDataMessage("a"))
+    result = UpdateDataFormat().loads_multipart(resp.frames)
+    np.testing.assert_array_equal(result["data"], np.arange(10))
+
+
+def test_cached_responses_count_towards_memory_limit(data_service):
+    data_service.store.memory_limit = 1000
+    attributes = [f"attr_{i}" for i in range(8)]
+    data = {"dataset": {"entities": {attr: np.arange(10) for attr in attributes}}}
+    data_service.handle_message(PutDataMessage("a", dump_update(data)))
+    for i in range(len(attributes)):
+        mask = {"dataset": {"entities": attributes[: i + 1]}}
+        resp = data_service.handle_message(GetDataMessage("a", mask=mask))
+        result = UpdateDataFormat().loads_multipart(resp.frames)
+        assert result["dataset"]["entities"].keys() == set(attributes[: i + 1])
+
+        # the array frames are views on the stored data, so only the headers take extra memory
+        cached = data_service.cache.get("a", {}).values()
+        held = estimate_nbytes(data_service.store["a"]) + sum(len(f[0]) for f in cached)
+        assert data_service.store.nbytes == held
+        assert held <= 1000
+    assert 0 < len(data_service.cache["a"]) < len(attributes)
+
+
 def test_clear(data_service, default_key, payload):
     data_service.store["other_1"] = {"some": "data"}
     data_service.store["other_2"] = {"some": "data"}
@@ -100,6 +207,27 @@ def test_clear(data_service, default_key, payload):
     assert data_service.store == {default_key: payload}
 
 
+def test_clear_removes_shared_files(data_service, tmp_path):
+    data_service.serialization = UpdateDataFormat(shared_memory_dir=tmp_path)
+    raw = data_service.serialization.dumps_multipart({"some": np.array([1, 2, 3])})
+    data_service.handle_message(PutDataMessage("other_1", raw))
+    assert len(list(tmp_path.iterdir())) == 1
+
+    data_service.handle_message(ClearDataMessage("other"))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_get_shared_data_only_sends_references(data_service, tmp_path):
+    data_service.serialization = UpdateDataFormat(shared_memory_dir=tmp_path)
+    raw = data_service.serialization.dumps_multipart({"some": np.zeros(10000)})
+    data_service.handle_message(PutDataMessage("other_1", raw))
+
+    resp = data_service.handle_message(GetDataMessage("other_1"))
+    assert resp.size < 1000
+    result = data_service.serialization.loads_multipart(resp.frames)
+    np.testing.assert_array_equal(result["some"], np.zeros(10000))
+
+
 @pytest.mark.parametrize(
     "req,expected",
     [
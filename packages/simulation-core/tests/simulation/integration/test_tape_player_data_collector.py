@@ -40,15 +40,23 @@ def tapefile(data_dir):
     return name
 
 
-@pytest.mark.parametrize("distributed", [False, True])
+@pytest.mark.parametrize(
+    "distributed, shared_memory", [(False, False), (True, False), (True, True)]
+)
 def test_simulation_with_tape_player_and_data_collector(
-    tmp_path, data_dir, storage_dir, tapefile, distributed
+    tmp_path, data_dir, storage_dir, tapefile, distributed, shared_memory
 ):
     sim = Simulation(
-        data_dir=data_dir, storage_dir=storage_dir, debug=True, distributed=distributed
+        data_dir=data_dir,
+        storage_dir=storage_dir,
+        temp_dir=tmp_path,
+        debug=True,
+        distributed=distributed,
+        update_shared_memory=shared_memory,
     )
     sim.add_model("data_collector", DataCollector, {})
     sim.add_model("tape_player", TapePlayer, {"tabular": [tapefile]})
     sim.set_timeline_info(TimelineInfo(0, 1, 0, duration=1))
     sim.run()
     assert {"t0_0_dataset.json", "t1_0_dataset.json"}.issubset(set(list_dir(storage_dir)))
+    assert list_dir(tmp_path) == []
@@ -21,6 +21,15 @@ def test_retrieve_update_with_mask():
     assert client.get(address, key, mask={"some": None}) == {"some": "data"}
 
 
+def test_removes_update_after_fetch_count():
+    client = InProcessUpdateDataClient()
+    address, key = client.put({"some": "data"})
+    client.get(address, key, mask=None, fetch_count=2)
+    assert key in client.store
+    client.get(address, key, mask=None, fetch_count=2)
+    assert key not in client.store
+
+
 def test_retrieve_data_with_invalid_mask_raises():
     client = InProcessUpdateDataClient()
     address, key = client.put({"some": "data"})
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+from unittest.mock import Mock
+
+from movici_simulation_core.simulation.launcher import (
+    CommandLauncher,
+    CommandProcess,
+    dump_runner,
+    load_runner,
+)
+
+
+class PicklableRunner:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_dump_and_load_runner():
+    runner = load_runner(dump_runner(PicklableRunner("some_model")))
+    assert isinstance(runner, PicklableRunner)
+    assert runner.name == "some_model"
+
+
+def test_load_runner_extends_sys_path(monkeypatch):
+    raw = dump_runner(PicklableRunner("some_model"))
+    monkeypatch.setattr(sys, "path", [])
+    load_runner(raw)
+    assert len(sys.path) > 0
+
+
+def test_command_launcher_runs_command(monkeypatch):
+    popen = Mock()
+    monkeypatch.setattr(subprocess, "Popen", popen)
+    CommandLauncher(["ssh", "some-host"], python="python3").launch(PicklableRunner("model"))
+    assert popen.call_args[0][0] == [
+        "ssh",
+        "some-host",
+        "python3",
+        "-m",
+        "movici_simulation_core.simulation.launcher",
+    ]
+    assert load_runner(popen.return_value.stdin.write.call_args[0][0]).name == "model"
+
+
+def test_command_launcher_is_local_without_command():
+    assert CommandLauncher().is_local
+    assert not CommandLauncher(["ssh", "some-host"]).is_local
+
+
+def test_command_process():
+    proc = CommandProcess(subprocess.Popen([sys.executable, "-c", "import sys; sys.exit(3)"]))
+    proc.join()
+    assert not proc.is_alive()
+    assert proc.exitcode == 3
@@ -1,7 +1,9 @@
 import json
 import logging
 import re
+import socket
 import sys
+import threading
 import typing as t
 from multiprocessing import process
 from pathlib import Path
@@ -19,6 +21,7 @@ from movici_simulation_core.core.state import TrackedState
 from movici_simulation_core.exceptions import StartupFailure
 from movici_simulation_core.messages import ErrorMessage, ModelMessage
 from movici_simulation_core.networking.stream import MessageRouterSocket, Stream
+from movici_simulation_core.services.orchestrator import Telemetry
 from movici_simulation_core.settings import Settings
 from movici_simulation_core.simulation import (
     ModelFromInstanceInfo,
@@ -28,7 +31,18 @@ from movici_simulation_core.simulation import (
     ServiceTypeInfo,
     Simulation,
 )
-from movici_simulation_core.simulation.distributed import ModelRunner, ServiceRunner
+from movici_simulation_core.simulation.common import get_advertised_address
+from movici_simulation_core.simulation.distributed import (
+    DistributedSimulationRunner,
+    ModelRunner,
+    ServiceRunner,
+)
+from movici_simulation_core.simulation.launcher import (
+    CommandLauncher,
+    CommandProcess,
+    LocalLauncher,
+)
+from movici_simulation_core.simulation.pool import WorkerPool
 from movici_simulation_core.testing.dummy import DummyModel
 
 
@@ -150,6 +164,11 @@ class TestServiceRunner:
         runner.start()
         assert re.match(r"tcp://127.0.0.1:\d+", service_info.address)
 
+    def test_binds_to_service_address(self, runner, service_info, settings):
+        settings.service_address = "tcp://0.0.0.0"
+        runner.start()
+        assert service_info.address.startswith(f"tcp://{socket.getfqdn()}:")
+
     def test_raises_when_service_doesnt_start(self, runner):
         runner.TIMEOUT = 0
         with pytest.raises(StartupFailure):
@@ -169,7 +188,9 @@ class TestServiceRunnerEntryPoint:
 
     def test_entry_point_calls_for_socket(self, service_info, runner):
         runner.entry_point(Mock())
-        assert runner._get_bound_socket.call_args == call(service_info.name)
+        assert runner._get_bound_socket.call_args == call(
+            service_info.name, addr="tcp://127.0.0.1"
+        )
 
     def test_entry_point_reports_socket_port(self, service_info, runner):
         connection = Mock()
@@ -233,6 +254,13 @@ class TestModelRunner:
         runner.start()
         assert isinstance(model_info.process, process.BaseProcess)
 
+    def test_start_model_with_launcher(self, settings, model_info):
+        launcher = Mock()
+        runner = ModelRunner(model_info, settings, None)
+        runner.start(launcher)
+        assert launcher.launch.call_args == call(runner)
+        assert model_info.process is launcher.launch.return_value
+
     def test_entry_point_sets_timeline_info(self, runner):
         assert get_timeline_info() is None
         runner.entry_point()
@@ -258,6 +286,33 @@ class TestModelRunner:
         runner.entry_point()
         assert sys_exit.call_args == call(1)
 
+    @pytest.mark.parametrize(
+        "name, shards, expected",
+        [
+            ("model", 1, "tcp://127.0.0.1:8002"),
+            ("model", 2, "tcp://127.0.0.1:8002"),
+            ("other", 2, "tcp://127.0.0.1:8004"),
+            ("third", 2, "tcp://127.0.0.1:8002"),
+        ],
+    )
+    def test_update_data_address_per_shard(self, runner, settings, name, shards, expected):
+        settings.service_discovery["update_data_1"] = "tcp://127.0.0.1:8004"
+        settings.model_names = ["model", "other", "third"]
+        settings.update_data_shards = shards
+        settings.name = name
+        assert runner._get_update_data_address() == expected
+
+
+class TestDistributedSimulationRunner:
+    def test_adds_update_data_shards(self, settings):
+        settings.update_data_shards = 3
+        modules = {"update_data": ServiceInfo("update_data", cls=DummyService, daemon=True)}
+        runner = DistributedSimulationRunner(modules, settings, schema=None, strategies=[])
+        services = runner._get_services()
+        assert [svc.name for svc in services] == ["update_data", "update_data_1", "update_data_2"]
+        assert all(svc.cls is DummyService for svc in services)
+        assert set(modules.keys()) == {"update_data", "update_data_1", "update_data_2"}
+
 
 class TestSimulation:
     @pytest.fixture
@@ -385,9 +440,25 @@ class TestSimulation:
             simulation.register_attributes(attrs)
 
 
-@pytest.mark.parametrize("distributed", [False, True])
-def test_full_simulation_run(temp_output_file, tmp_path, distributed):
-    sim = Simulation(data_dir=tmp_path, debug=True, distributed=distributed)
+@pytest.mark.parametrize(
+    "distributed, settings",
+    [
+        (False, {}),
+        (False, {"in_process_workers": 2}),
+        (False, {"update_coalescing": True}),
+        (True, {}),
+        (True, {"update_data_shards": 2}),
+    ],
+    ids=[
+        "in_process",
+        "in_process_concurrent",
+        "in_process_coalescing",
+        "distributed",
+        "distributed_sharded",
+    ],
+)
+def test_full_simulation_run(temp_output_file, tmp_path, distributed, settings):
+    sim = Simulation(data_dir=tmp_path, debug=True, distributed=distributed, **settings)
 
     sim.add_model("pub", SimpleModel({"mode": "pub"}))
     sim.add_model(
@@ -407,6 +478,137 @@ def test_full_simulation_run(temp_output_file, tmp_path, distributed):
     }
 
 
+@pytest.mark.parametrize("distributed", [False, True])
+def test_simulation_writes_telemetry(tmp_path, distributed):
+    sim = Simulation(
+        data_dir=tmp_path,
+        storage_dir=tmp_path,
+        distributed=distributed,
+        telemetry_file="telemetry.jsonl",
+    )
+    sim.add_model("pub", SimpleModel({"mode": "pub"}))
+    sim.add_model("sub", SimpleModel({"mode": "sub", "output": str(tmp_path / "output.json")}))
+
+    sim.set_timeline_info(TimelineInfo(reference=0, time_scale=1, start_time=0))
+    sim.run()
+    assert sim.exit_code == 0
+
+    telemetry = Telemetry.load(tmp_path / "telemetry.jsonl")
+    assert [(rec.model, rec.timestamp) for rec in telemetry.records] == [("pub", 0), ("sub", 0)]
+    pub, sub = telemetry.records
+    assert pub.bytes_out > 0
+    assert sub.bytes_in > 0
+
+
+def test_simulation_with_local_launcher(temp_output_file, tmp_path):
+    sim = Simulation(data_dir=tmp_path)
+    sim.add_model("pub", SimpleModel, {"mode": "pub"})
+    sim.add_model("sub", SimpleModel, {"mode": "sub", "output": str(temp_output_file)})
+    sim.set_launcher(LocalLauncher(), "sub")
+
+    sim.set_timeline_info(TimelineInfo(reference=0, time_scale=1, start_time=0))
+    sim.run()
+
+    assert isinstance(sim.active_modules["sub"].process, CommandProcess)
+    assert not isinstance(sim.active_modules["pub"].process, CommandProcess)
+    assert sim.exit_code == 0
+    assert json.loads(temp_output_file.read_text()) == {
+        "dataset": {"entity": {"id": [1], "attr": [1.0]}}
+    }
+
+
+def test_shared_memory_with_remote_launcher_raises(tmp_path):
+    sim = Simulation(data_dir=tmp_path, update_shared_memory=True)
+    sim.add_model("pub", SimpleModel, {"mode": "pub"})
+    sim.add_model("sub", SimpleModel, {"mode": "sub"})
+    sim.set_launcher(CommandLauncher(["ssh", "some-host"]), "sub")
+
+    sim.set_timeline_info(TimelineInfo(reference=0, time_scale=1, start_time=0))
+    with pytest.raises(ValueError, match="'sub'"):
+        sim.run()
+
+
+def run_pooled_simulation(pool, tmp_path, output_file, pub_model=SimpleModel):
+    sim = Simulation(data_dir=tmp_path)
+    sim.add_model("pub", pub_model, {"mode": "pub"})
+    sim.add_model("sub", SimpleModel, {"mode": "sub", "output": str(output_file)})
+    sim.set_launcher(pool)
+    sim.set_timeline_info(TimelineInfo(reference=0, time_scale=1, start_time=0))
+    sim.run()
+    return sim
+
+
+class TestWorkerPool:
+    @pytest.fixture
+    def pool(self):
+        with WorkerPool() as pool:
+            yield pool
+
+    def test_reuses_workers_in_consecutive_simulations(self, pool, tmp_path):
+        for i in range(2):
+            output_file = tmp_path / f"output_{i}.json"
+            sim = run_pooled_simulation(pool, tmp_path, output_file)
+            assert sim.exit_code == 0
+            assert json.loads(output_file.read_text()) == {
+                "dataset": {"entity": {"id": [1], "attr": [1.0]}}
+            }
+            if i == 0:
+                pids = {worker.last_model: worker.process.pid for worker in pool.workers}
+        assert {worker.last_model: worker.process.pid for worker in pool.workers} == pids
+
+    def test_workers_survive_failing_models(self, pool, tmp_path):
+        sim = run_pooled_simulation(pool, tmp_path, tmp_path / "out.json", CrashingModel)
+        assert sim.exit_code == 1
+        assert len(pool.workers) == 2
+        assert all(worker.alive for worker in pool.workers)
+
+        sim = run_pooled_simulation(pool, tmp_path, tmp_path / "out.json")
+        assert sim.exit_code == 0
+        assert len(pool.workers) == 2
+
+    def test_close_stops_workers(self, pool, tmp_path):
+        run_pooled_simulation(pool, tmp_path, tmp_path / "out.json")
+        workers = pool.workers
+        pool.close()
+        assert not any(worker.alive for worker in workers)
+        with pytest.raises(RuntimeError):
+            pool.launch(Mock())
+
+
+@pytest.mark.parametrize(
+    "bind_address, expected",
+    [
+        ("tcp://127.0.0.1", "tcp://127.0.0.1"),
+        ("tcp://10.0.0.1", "tcp://10.0.0.1"),
+        ("tcp://*", f"tcp://{socket.getfqdn()}"),
+        ("tcp://0.0.0.0", f"tcp://{socket.getfqdn()}"),
+    ],
+)
+def test_get_advertised_address(bind_address, expected):
+    assert get_advertised_address(bind_address) == expected
+
+
+class BarrierModel(SimpleModel):
+    def __init__(self, config, barrier: threading.Barrier):
+        super().__init__(config)
+        self.barrier = barrier
+
+    def update(self, state: TrackedState, moment: Moment) -> t.Optional[Moment]:
+        self.barrier.wait()
+        return super().update(state, moment)
+
+
+def test_in_process_simulation_runs_independent_models_concurrently(tmp_path):
+    barrier = threading.Barrier(2, timeout=5)
+    sim = Simulation(data_dir=tmp_path, distributed=False, in_process_workers=2)
+    sim.add_model("pub_a", BarrierModel({"mode": "pub"}, barrier))
+    sim.add_model("pub_b", BarrierModel({"mode": "pub"}, barrier))
+
+    sim.set_timeline_info(TimelineInfo(reference=0, time_scale=1, start_time=0))
+    sim.run()
+    assert sim.exit_code == 0
+
+
 @pytest.mark.parametrize("distributed", [False, True])
 def test_simulation_failure(tmp_path, distributed):
     sim = Simulation(data_dir=tmp_path, debug=True, distributed=distributed)
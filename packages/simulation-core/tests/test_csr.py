@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 
+from movici_simulation_core import csr
 from movici_simulation_core.core.data_type import UNDEFINED
 from movici_simulation_core.csr import (
     compare_array,
@@ -14,6 +15,9 @@ from movici_simulation_core.csr import (
     rows_contain,
     rows_equal,
     rows_intersect,
+    select_kernel,
+    set_csr_num_threads,
+    slice_csr_array,
 )
 
 
@@ -241,3 +245,55 @@ def test_csr_binop(operator, expected):
     row_ptr = np.array([0, 1, 3, 3])
     operand = np.array([1, 2, 3])
     np.testing.assert_array_equal(csr_binop(data, row_ptr, operand, operator), expected)
+
+
+@pytest.fixture
+def parallel_csr(monkeypatch):
+    monkeypatch.setattr(csr, "PARALLEL_ROW_THRESHOLD", 0)
+    monkeypatch.setattr(csr, "_threadsafe_layer", True)
+    # uniform row lengths, so that rows are also equal to an array of the same length
+    data = np.tile(np.array([1.0, 2.0, 3.0, 2.0, 1.0, 4.0]), 3)
+    row_ptr = np.arange(0, 19, 3)
+    return data, row_ptr
+
+
+@pytest.mark.parametrize(
+    "kernel, args",
+    [
+        (rows_equal, (np.array([1.0, 2.0, 3.0]), float_compare())),
+        (rows_contain, (2.0, float_compare())),
+        (rows_intersect, (np.array([3.0, 4.0]), float_compare())),
+        (row_wise_sum, ()),
+        (row_wise_max, ()),
+        (row_wise_min, (0.0,)),
+        (slice_csr_array, (np.array([4, 1, 1]),)),
+        (
+            generate_update,
+            (np.array([1, 0, 1, 1, 0, 1], dtype=bool), np.ones(6, dtype=bool), -1.0),
+        ),
+    ],
+)
+def test_parallel_kernel_equals_serial_kernel(kernel, args, parallel_csr):
+    data, row_ptr = parallel_csr
+    parallel_kernel = select_kernel(kernel, data, row_ptr)
+    assert parallel_kernel is not kernel
+    expected = kernel(data, row_ptr, *args)
+    result = parallel_kernel(data, row_ptr, *args)
+    if isinstance(expected, tuple):
+        for res, exp in zip(result, expected):
+            np.testing.assert_array_equal(res, exp)
+    else:
+        np.testing.assert_array_equal(result, expected)
+
+
+def test_parallel_kernels_disabled_with_single_thread(parallel_csr, monkeypatch):
+    data, row_ptr = parallel_csr
+    monkeypatch.setattr(csr, "_num_threads", None)
+    set_csr_num_threads(1)
+    assert select_kernel(row_wise_sum, data, row_ptr) is row_wise_sum
+
+
+def test_no_parallel_kernels_with_workqueue_threading_layer(parallel_csr, monkeypatch):
+    data, row_ptr = parallel_csr
+    monkeypatch.setattr(csr, "_threadsafe_layer", False)
+    assert select_kernel(row_wise_sum, data, row_ptr) is row_wise_sum
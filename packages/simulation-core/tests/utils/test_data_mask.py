@@ -1,6 +1,11 @@
 import pytest
 
-from movici_simulation_core.utils.data_mask import filter_data, masks_overlap, validate_mask
+from movici_simulation_core.utils.data_mask import (
+    canonical_mask,
+    filter_data,
+    masks_overlap,
+    validate_mask,
+)
 
 pub_sub_masks = [
     (
@@ -253,3 +258,20 @@ test_cases = {
 def test_filter_data(mask, paths_match):
     result = filter_data(dataset, mask)
     assert all(has_path(result, path) == match for path, match in paths_match)
+
+
+@pytest.mark.parametrize(
+    "first, second, equal",
+    [
+        (None, None, True),
+        ({}, {}, True),
+        ({"a": {"b": ["c", "d"]}}, {"a": {"b": ["d", "c"]}}, True),
+        ({"a": {"b": ["c"]}}, {"a": {"b": ["c", "id"]}}, True),
+        ({"a": None, "b": {"c": None}}, {"b": {"c": None}, "a": None}, True),
+        ({"a": {"b": ["c"]}}, {"a": {"b": ["d"]}}, False),
+        ({"a": None}, None, False),
+        ({"a": None}, {"a": {"b": None}}, False),
+    ],
+)
+def test_canonical_mask(first, second, equal):
+    assert (canonical_mask(first) == canonical_mask(second)) is equal
@@ -0,0 +1,30 @@
+import logging
+
+import pytest
+
+from movici_simulation_core.settings import Settings
+from movici_simulation_core.utils.logging import get_logger, reset_loggers
+
+
+@pytest.fixture(autouse=True)
+def clean_loggers():
+    yield
+    reset_loggers()
+
+
+def test_get_logger_reconfigures_with_different_settings():
+    get_logger(Settings(name="some_model", loglevel="INFO"))
+    logger = get_logger(Settings(name="some_model", loglevel="DEBUG"))
+    assert logger.level == logging.DEBUG
+    assert len(logger.handlers) == 1
+
+
+def test_get_logger_keeps_configuration_with_same_settings():
+    handler = get_logger(Settings(name="some_model")).handlers[0]
+    assert get_logger(Settings(name="some_model")).handlers == [handler]
+
+
+def test_reset_loggers_removes_handlers():
+    logger = get_logger(Settings(name="some_model"))
+    reset_loggers()
+    assert logger.handlers == []
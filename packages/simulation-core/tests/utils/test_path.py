@@ -0,0 +1,77 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from movici_simulation_core.core.data_format import EntityInitDataFormat
+from movici_simulation_core.utils.path import (
+    DatasetCache,
+    DatasetPath,
+    disable_dataset_cache,
+    enable_dataset_cache,
+)
+
+
+@pytest.fixture
+def dataset_cache():
+    enable_dataset_cache()
+    yield
+    disable_dataset_cache()
+
+
+@pytest.fixture
+def dataset_file(tmp_path):
+    path = tmp_path / "dataset.json"
+    path.write_text(json.dumps({"name": "dataset", "data": {"entities": {"id": [1, 2]}}}))
+    return path
+
+
+def read(path):
+    return DatasetPath(path, strategy=EntityInitDataFormat()).read_dict()
+
+
+@pytest.mark.usefixtures("dataset_cache")
+class TestDatasetCache:
+    def test_returns_cached_data(self, dataset_file, monkeypatch):
+        read(dataset_file)
+        monkeypatch.setattr(EntityInitDataFormat, "loads", None)
+        np.testing.assert_array_equal(read(dataset_file)["data"]["entities"]["id"]["data"], [1, 2])
+
+    def test_returns_copy(self, dataset_file):
+        first = read(dataset_file)
+        first["data"]["entities"].pop("id")
+        assert "id" in read(dataset_file)["data"]["entities"]
+
+    def test_reads_changed_file(self, dataset_file):
+        read(dataset_file)
+        dataset_file.write_text(json.dumps({"name": "dataset", "data": {"other": {"id": [3]}}}))
+        stat = dataset_file.stat()
+        os.utime(dataset_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert "other" in read(dataset_file)["data"]
+
+
+def test_dataset_cache_evicts_least_recently_used():
+    cache = DatasetCache(max_bytes=10)
+    cache.put("a", 0, {"name": "a"}, nbytes=4)
+    cache.put("b", 0, {"name": "b"}, nbytes=4)
+    cache.get("a", 0)
+    cache.put("c", 0, {"name": "c"}, nbytes=4)
+    assert cache.get("a", 0) is not None
+    assert cache.get("b", 0) is None
+    assert cache.nbytes == 8
+
+
+def test_dataset_cache_replaces_changed_dataset():
+    cache = DatasetCache(max_bytes=10)
+    cache.put("a", 0, {"name": "a"}, nbytes=4)
+    assert cache.get("a", 1) is None
+    cache.put("a", 1, {"name": "a"}, nbytes=6)
+    assert len(cache) == 1
+    assert cache.nbytes == 6
+
+
+def test_dataset_cache_skips_large_datasets():
+    cache = DatasetCache(max_bytes=10)
+    cache.put("a", 0, {"name": "a"}, nbytes=11)
+    assert len(cache) == 0
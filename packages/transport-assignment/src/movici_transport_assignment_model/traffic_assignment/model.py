@@ -208,8 +208,8 @@ class ModalityStrategy:
         return changed
 
     def get_demands(self, model: Model) -> t.Tuple[np.ndarray, np.ndarray]:
-        passenger_demand = model.demand_nodes.passenger_demand.csr.as_matrix()
-        cargo_demand = model.demand_nodes.cargo_demand.csr.as_matrix()
+        passenger_demand = get_matrix(model.demand_nodes.passenger_demand.csr)
+        cargo_demand = get_matrix(model.demand_nodes.cargo_demand.csr)
         return passenger_demand, cargo_demand
 
     def publish_results(self, model: Model, results: AssignmentResultCollection):
@@ -302,8 +302,8 @@ class PassengerTrackModality(TrackModality):
     )
 
     def get_demands(self, model: Model) -> t.Tuple[np.ndarray, np.ndarray]:
-        passenger_demand = model.demand_nodes.passenger_demand.csr.as_matrix()
-        cargo_demand = np.zeros_like(passenger_demand)
+        passenger_demand = get_matrix(model.demand_nodes.passenger_demand.csr)
+        cargo_demand = zero_matrix_like(passenger_demand)
         return passenger_demand, cargo_demand
 
 
@@ -350,8 +350,8 @@ class CargoTrackModality(TrackModality):
         return capacities
 
     def get_demands(self, model: Model) -> t.Tuple[np.ndarray, np.ndarray]:
-        cargo_demand = model.demand_nodes.cargo_demand.csr.as_matrix()
-        passenger_demand = np.zeros_like(cargo_demand)
+        cargo_demand = get_matrix(model.demand_nodes.cargo_demand.csr)
+        passenger_demand = zero_matrix_like(cargo_demand)
         return passenger_demand, cargo_demand
 
 
@@ -364,7 +364,20 @@ modalities: t.Dict[str, t.Type[ModalityStrategy]] = {
 }
 
 
-def get_matrix(csr_array: TrackedCSRArray):
+def get_matrix(csr_array: TrackedCSRArray) -> np.ndarray:
+    """Return a read-only 2D view on a square demand csr-array without copying its data. The
+    demand matrices are copied into the assignment project anyway, so there is no need for an
+    intermediate dense copy
+    """
     if len(csr_array.data) != csr_array.size**2:
         raise ValueError("Array is not a valid demand matrix")
-    return csr_array.data.copy().reshape((csr_array.size, csr_array.size))
+    matrix = csr_array.matrix_view().view()
+    matrix.flags.writeable = False
+    return matrix
+
+
+def zero_matrix_like(matrix: np.ndarray) -> np.ndarray:
+    """Same as ``np.zeros_like``, but returns a read-only matrix that does not allocate memory for
+    its elements
+    """
+    return np.broadcast_to(np.zeros((), dtype=matrix.dtype), matrix.shape)
@@ -1,9 +1,15 @@
+import numpy as np
 import pytest
 
+from movici_simulation_core.core.arrays import TrackedCSRArray
 from movici_simulation_core.core.schema import AttributeSchema
 from movici_simulation_core.testing.helpers import assert_dataset_dicts_equal
 from movici_simulation_core.testing.model_tester import ModelTester
-from movici_transport_assignment_model.traffic_assignment.model import Model
+from movici_transport_assignment_model.traffic_assignment.model import (
+    Model,
+    get_matrix,
+    zero_matrix_like,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -661,3 +667,24 @@ def test_convert_legacy_model_config(legacy_model_config, model_config):
     del model_config["name"]
     del model_config["type"]
     assert Model(legacy_model_config).config == model_config
+
+
+def test_get_matrix_returns_read_only_view():
+    csr = TrackedCSRArray(np.arange(9, dtype=float), np.array([0, 3, 6, 9]))
+    matrix = get_matrix(csr)
+    np.testing.assert_array_equal(matrix, np.arange(9).reshape((3, 3)))
+    assert np.shares_memory(matrix, csr.data)
+    assert not matrix.flags.writeable
+
+
+def test_get_matrix_raises_on_non_square_array():
+    with pytest.raises(ValueError):
+        get_matrix(TrackedCSRArray(np.arange(4, dtype=float), np.array([0, 2, 4, 4])))
+
+
+def test_zero_matrix_like():
+    matrix = np.ones((3, 3))
+    zeros = zero_matrix_like(matrix)
+    np.testing.assert_array_equal(zeros, np.zeros((3, 3)))
+    assert zeros.dtype == matrix.dtype
+    assert not zeros.flags.writeable